@@ -0,0 +1,151 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# Cache ảnh dùng chung cho GUI: mỗi ảnh chỉ decode PNG một lần, lưu sẵn bản đã scale
+# và convert() theo định dạng màn hình, key = (đường dẫn, kích thước, alpha).
+# Giới hạn theo tổng số byte của các surface, vượt thì bỏ ảnh dùng lâu nhất (LRU).
+# Font được tạo một lần cho mỗi (tên, cỡ, bold); chữ đã render được giữ trong một LRU
+# riêng theo (font, nội dung, màu) nên text không đổi giữa các frame không phải render lại.
+
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+class AssetCache:
+    """
+    image(path, size=None, alpha=False): Surface đã scale về size và convert/convert_alpha.
+    preload(specs): decode trước một danh sách (path, size, alpha) trong thread nền; bản
+    preload chỉ được convert() ở thread chính khi image() lấy ra lần đầu.
+    font(name, size, bold=False): pygame Font dùng chung.
+    text(text, color, name, size, bold=False): Surface chữ đã render, tối đa max_texts entry.
+    sound(path, volume=1.0): pygame Sound dùng chung, volume đặt ở lần nạp đầu.
+    decodes đếm số lần đọc PNG từ đĩa, renders số lần render chữ, hits/misses số lần tra cache ảnh.
+    image() chỉ gọi từ thread chính (convert() cần display); warm()/preload() dùng được ở thread khác.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_texts=256):
+        self.max_bytes = max_bytes
+        self.max_texts = max_texts
+        self.decodes = 0
+        self.renders = 0
+        self.hits = 0
+        self.misses = 0
+        self._bytes = 0
+        self._surfaces = OrderedDict()  # key -> (surface, đã convert chưa)
+        self._lock = threading.Lock()
+        self._preloader = None
+        self._fonts = {}
+        self._texts = OrderedDict()
+        self._sounds = {}
+
+    def image(self, path, size=None, alpha=False):
+        key = (path, tuple(size) if size else None, alpha)
+        with self._lock:
+            entry = self._surfaces.get(key)
+            if entry is not None:
+                self._surfaces.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None and entry[1]:
+            return entry[0]
+        surface = entry[0] if entry is not None else self._decode(path, size)
+        surface = surface.convert_alpha() if alpha else surface.convert()
+        self._store(key, surface, True)
+        return surface
+
+    def font(self, name, size, bold=False):
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return font
+
+    def text(self, text, color, name, size, bold=False):
+        key = (name, size, bold, text, tuple(color))
+        surface = self._texts.get(key)
+        if surface is not None:
+            self._texts.move_to_end(key)
+            return surface
+        surface = self.font(name, size, bold).render(text, True, color)
+        self.renders += 1
+        self._texts[key] = surface
+        if len(self._texts) > self.max_texts:
+            self._texts.popitem(last=False)
+        return surface
+
+    def warm(self, path, size=None, alpha=False):
+        """Decode và scale sẵn một ảnh (chưa convert), an toàn khi gọi từ thread khác."""
+        key = (path, tuple(size) if size else None, alpha)
+        with self._lock:
+            if key in self._surfaces:
+                return
+        surface = self._decode(path, key[1])
+        with self._lock:
+            if key in self._surfaces:
+                return
+        self._store(key, surface, False)
+
+    def sound(self, path, volume=1.0):
+        sound = self._sounds.get(path)
+        if sound is None:
+            sound = self._sounds[path] = pygame.mixer.Sound(path)
+            sound.set_volume(volume)
+        return sound
+
+    def preload(self, specs):
+        """Decode trước các ảnh trong thread nền, bỏ qua ảnh đã có trong cache."""
+        specs = [(path, tuple(size) if size else None, alpha) for path, size, alpha in specs]
+
+        def work():
+            for path, size, alpha in specs:
+                try:
+                    self.warm(path, size, alpha)
+                except (pygame.error, OSError):
+                    continue
+
+        self._preloader = threading.Thread(target=work, name='asset-preload', daemon=True)
+        self._preloader.start()
+        return self._preloader
+
+    def wait(self, timeout=None):
+        if self._preloader is not None:
+            self._preloader.join(timeout)
+
+    def clear(self):
+        with self._lock:
+            self._surfaces.clear()
+            self._bytes = 0
+        self._texts.clear()
+
+    @property
+    def memory_usage(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def _decode(self, path, size):
+        surface = pygame.image.load(path)
+        with self._lock:
+            self.decodes += 1
+        if size and surface.get_size() != size:
+            surface = pygame.transform.scale(surface, size)
+        return surface
+
+    def _store(self, key, surface, converted):
+        with self._lock:
+            old = self._surfaces.pop(key, None)
+            if old is not None:
+                self._bytes -= surface_bytes(old[0])
+            self._surfaces[key] = (surface, converted)
+            self._bytes += surface_bytes(surface)
+            # luôn giữ lại ảnh vừa thêm kể cả khi một mình nó vượt giới hạn
+            while self._bytes > self.max_bytes and len(self._surfaces) > 1:
+                _, (evicted, _) = self._surfaces.popitem(last=False)
+                self._bytes -= surface_bytes(evicted)
+
+
+assets = AssetCache()
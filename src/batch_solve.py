@@ -0,0 +1,170 @@
+import argparse
+import csv
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import resource  # chỉ có trên Unix
+except ImportError:
+    resource = None
+
+from map_loader import find_maps, load_board
+from solve_worker import decode_board
+from statistics import Statistics
+from solver import ALGORITHMS
+from solver.cost_model import COST_MODELS
+from solver.search_control import SearchControl
+
+# Giải hàng loạt không cần GUI: mỗi job là một cặp (map, thuật toán), chạy song song
+# trên ProcessPoolExecutor, mỗi job bị giới hạn thời gian (SearchControl, SIGALRM dự
+# phòng cho đoạn không kiểm tra được) và bộ nhớ (RLIMIT_AS).
+# Mỗi job ghi một dòng gồm các trường của Statistics.get_summary().
+#   python src/batch_solve.py maps -a bfs,astar -o results.csv --timeout 30 --memory 1024
+
+# SIGALRM chỉ bắn khi solver không tự dừng được sau timeout + ALARM_GRACE giây
+ALARM_GRACE = 5.0
+STOP_STATUS = {'time_budget': 'timeout', 'node_budget': 'node_budget', 'cancelled': 'cancelled'}
+COMPACT_ALGORITHMS = ('bfs', 'dfs', 'ucs', 'astar')  # nhận tham số compact (solver.packed)
+FIELDS = ['map', 'algorithm_key', 'cost_model', 'status', 'wall_time',
+          *Statistics().get_summary()]
+
+
+class JobTimeout(Exception):
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise JobTimeout()
+
+
+def run_job(map_path, algorithm, cost_model=None, timeout=None, memory_mb=None,
+            trace_memory=False, node_budget=None, layout=None, keep_path=False,
+            compact=False):
+    """
+    Chạy 1 job trong process worker, trả về dict 1 dòng kết quả.
+    layout: board đã mã hóa (solve_worker.encode_board) thay cho việc đọc map_path;
+    keep_path: thêm lời giải [(id, bước), ...] vào kết quả (trường 'path').
+    compact: visited dạng packed, với các thuật toán trong COMPACT_ALGORITHMS.
+    """
+    row = {'map': map_path, 'algorithm_key': algorithm,
+           'cost_model': cost_model or 'default'}
+    stats = Statistics(trace_memory=trace_memory)
+    old_limit = None
+    if memory_mb and resource is not None:
+        old_limit = resource.getrlimit(resource.RLIMIT_AS)
+        cap = memory_mb * 1024 * 1024
+        if old_limit[1] != resource.RLIM_INFINITY:
+            cap = min(cap, old_limit[1])
+        resource.setrlimit(resource.RLIMIT_AS, (cap, old_limit[1]))
+    use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout + ALARM_GRACE)
+    start = time.perf_counter()
+    try:
+        board = decode_board(layout) if layout is not None else load_board(map_path)
+        kwargs = {'cost_model': cost_model} if cost_model else {}
+        if compact and algorithm in COMPACT_ALGORITHMS:
+            kwargs['compact'] = True
+        control = SearchControl(time_budget=timeout, node_budget=node_budget)
+        path, stats = ALGORITHMS[algorithm](board, stats=stats, control=control, **kwargs)
+        row['status'] = STOP_STATUS.get(stats.stop_reason, 'ok')
+        if keep_path:
+            row['path'] = path
+    except JobTimeout:
+        row['status'] = 'timeout'
+    except MemoryError:
+        row['status'] = 'memory'
+    except Exception as e:
+        row['status'] = f'error: {e}'
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        if old_limit is not None:
+            resource.setrlimit(resource.RLIMIT_AS, old_limit)
+    row['wall_time'] = time.perf_counter() - start
+    if stats.start_time and not stats.end_time:
+        stats.stop_tracking()  # job bị ngắt giữa chừng: giữ số liệu tới lúc dừng
+    row.update(stats.get_summary())
+    return row
+
+
+class RowWriter:
+    """Ghi kết quả theo từng dòng: CSV nếu file .csv, ngược lại JSON lines."""
+    def __init__(self, path=None):
+        self.file = open(path, 'w', newline='') if path else sys.stdout
+        self.csv = None
+        if path and path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row) + '\n')
+        self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def batch_solve(map_paths, algorithms, writer, workers=None, cost_model=None,
+                timeout=None, memory_mb=None, trace_memory=False, node_budget=None,
+                compact=False):
+    jobs = [(m, a) for m in map_paths for a in algorithms]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # chunk 1 job/lần: thời gian mỗi job chênh lệch lớn nên không gom sẵn
+        futures = [executor.submit(run_job, m, a, cost_model, timeout,
+                                   memory_mb, trace_memory, node_budget, compact=compact)
+                   for m, a in jobs]
+        for future in as_completed(futures):
+            writer.write(future.result())
+    return len(jobs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Giải hàng loạt map bằng nhiều thuật toán")
+    parser.add_argument('maps', nargs='+', help="thư mục, glob hoặc file map JSON")
+    parser.add_argument('-a', '--algorithms', default='bfs,ucs,astar',
+                        help=f"danh sách, cách nhau bởi dấu phẩy: {','.join(ALGORITHMS)}")
+    parser.add_argument('-o', '--output', help="file .csv hoặc .jsonl (mặc định stdout)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--cost-model', choices=list(COST_MODELS))
+    parser.add_argument('--timeout', type=float, help="giây cho mỗi job")
+    parser.add_argument('--memory', type=int, help="MB tối đa cho mỗi job")
+    parser.add_argument('--node-budget', type=int, help="số node mở rộng tối đa cho mỗi job")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="đo peak memory bằng tracemalloc (chậm hơn nhiều)")
+    parser.add_argument('--compact', action='store_true',
+                        help="visited dạng packed cho bfs, dfs, ucs, astar: ít RAM hơn, chậm hơn")
+    args = parser.parse_args(argv)
+
+    algorithms = [a.strip() for a in args.algorithms.split(',') if a.strip()]
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+
+    try:
+        map_paths = find_maps(args.maps)
+    except ValueError as e:
+        parser.error(str(e))
+
+    writer = RowWriter(args.output)
+    start = time.perf_counter()
+    try:
+        count = batch_solve(map_paths, algorithms, writer, args.workers,
+                            args.cost_model, args.timeout, args.memory,
+                            args.trace_memory, args.node_budget, args.compact)
+    finally:
+        writer.close()
+    print(f"{count} jobs in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
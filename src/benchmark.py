@@ -0,0 +1,331 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from functools import partial
+
+from map_loader import find_maps, load_board
+from statistics import Statistics
+from batch_solve import COMPACT_ALGORITHMS
+from solver import ALGORITHMS
+
+# Benchmark các thuật toán trên mọi map:
+#   python src/benchmark.py run -r 5 -w 1 -o benchmarks/baseline.json
+#   python src/benchmark.py compare benchmarks/baseline.json --chart compare.png
+# Mỗi cặp (map, thuật toán) chạy `warmup` lần bỏ qua rồi `reps` lần đo wall time
+# bằng perf_counter; peak memory đo trong 1 lần chạy riêng với
+# Statistics(trace_memory=True) để overhead của tracemalloc không làm lệch thời gian.
+# compare chạy lại (hoặc đọc --current) và dùng Welch t-test một phía trên wall time
+# để chỉ báo các chậm đi có ý nghĩa thống kê; các bộ đếm tất định (node, độ dài
+# lời giải) so sánh trực tiếp.
+# --compact chạy bfs/dfs/ucs/astar với visited trong bảng băm phẳng (solver.packed):
+#   python src/benchmark.py compare benchmarks/baseline.json --compact
+# dòng so sánh in cả peak memory nên thấy ngay mức tiết kiệm.
+
+FORMAT_VERSION = 1
+# theo thư mục project (cha của src/), không theo thư mục đang chạy
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             'benchmarks', 'baseline.json')
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _map_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def bench_one(map_path, algorithm, reps=5, warmup=1, compact=False):
+    """Đo một cặp (map, thuật toán), trả về dict kết quả."""
+    solver = ALGORITHMS[algorithm]
+    if compact and algorithm in COMPACT_ALGORITHMS:
+        solver = partial(solver, compact=True)
+    initial = load_board(map_path)
+
+    for _ in range(warmup):
+        solver(initial.copy())
+
+    times = []
+    for _ in range(reps):
+        board = initial.copy()
+        gc.collect()
+        start = time.perf_counter()
+        path, stats = solver(board)
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    _, traced = solver(initial.copy(), stats=Statistics(trace_memory=True))
+
+    return {
+        'map': _map_name(map_path),
+        'algorithm': algorithm,
+        'wall_time': times,
+        'expanded_nodes': stats.expanded_nodes,
+        'generated_nodes': stats.generated_nodes,
+        'peak_memory': traced.peak_memory,
+        'max_frontier': stats.max_frontier,
+        'max_visited': stats.max_visited,
+        'solution_found': stats.solution_found,
+        'solution_length': stats.solution_length,
+    }
+
+
+def run_benchmark(map_paths, algorithms, reps=5, warmup=1, log=None, compact=False):
+    results = []
+    for map_path in map_paths:
+        for algorithm in algorithms:
+            result = bench_one(map_path, algorithm, reps, warmup, compact)
+            results.append(result)
+            if log:
+                log(f"{result['map']:>8} {algorithm:<18} "
+                    f"{_mean(result['wall_time']) * 1000:10.2f}ms "
+                    f"{result['expanded_nodes']:>9} expanded "
+                    f"{result['peak_memory'] / 1024:10.1f}KB peak")
+    return {
+        'format': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'reps': reps,
+        'warmup': warmup,
+        'compact': compact,
+        'results': results,
+    }
+
+
+def save_results(data, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path}: benchmark format {data.get('format')}, "
+                         f"expected {FORMAT_VERSION}")
+    return data
+
+
+# --- Welch t-test (module statistics của stdlib bị src/statistics.py che mất,
+# và cũng không có phân phối t, nên tự tính) ---
+
+def _mean(xs):
+    return sum(xs) / len(xs)
+
+
+def _variance(xs):
+    if len(xs) < 2:
+        return 0.0
+    m = _mean(xs)
+    return sum((x - m) ** 2 for x in xs) / (len(xs) - 1)
+
+
+def _betacf(a, b, x, max_iter=200, eps=3e-14):
+    # continued fraction của hàm beta không đầy đủ (Numerical Recipes)
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = 1.0
+    d = 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+    for m in range(1, max_iter + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < eps:
+            break
+    return h
+
+
+def _betainc(a, b, x):
+    """Hàm beta không đầy đủ chuẩn hóa I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                     + a * math.log(x) + b * math.log1p(-x))
+    if x < (a + 1.0) / (a + b + 2.0):
+        return front * _betacf(a, b, x) / a
+    return 1.0 - front * _betacf(b, a, 1.0 - x) / b
+
+
+def welch_t_test(baseline, current):
+    """
+    Welch t-test một phía, giả thuyết: current chậm hơn baseline.
+    Trả về (t, bậc tự do, p-value).
+    """
+    n1, n2 = len(baseline), len(current)
+    m1, m2 = _mean(baseline), _mean(current)
+    se1, se2 = _variance(baseline) / n1, _variance(current) / n2
+    if se1 + se2 == 0.0:
+        # không có nhiễu: mọi chênh lệch đều có ý nghĩa
+        if m2 == m1:
+            return 0.0, 0.0, 1.0
+        return math.copysign(math.inf, m2 - m1), 0.0, (0.0 if m2 > m1 else 1.0)
+    t = (m2 - m1) / math.sqrt(se1 + se2)
+    df = (se1 + se2) ** 2 / ((se1 ** 2 / (n1 - 1) if n1 > 1 else 0.0)
+                             + (se2 ** 2 / (n2 - 1) if n2 > 1 else 0.0))
+    tail = 0.5 * _betainc(df / 2.0, 0.5, df / (df + t * t))
+    return t, df, (tail if t > 0 else 1.0 - tail)
+
+
+def compare_results(baseline, current, alpha=0.05, min_change=0.05, memory_tolerance=0.10):
+    """
+    So sánh 2 kết quả benchmark, trả về list các dòng so sánh. regression=True khi:
+      - wall time tăng hơn min_change và p-value < alpha
+      - peak memory tăng hơn memory_tolerance
+      - số node mở rộng/sinh ra tăng, hoặc độ dài/trạng thái lời giải thay đổi
+    """
+    base = {(r['map'], r['algorithm']): r for r in baseline['results']}
+    rows = []
+    for cur in current['results']:
+        old = base.get((cur['map'], cur['algorithm']))
+        if old is None:
+            continue
+        t, df, p = welch_t_test(old['wall_time'], cur['wall_time'])
+        old_time, new_time = _mean(old['wall_time']), _mean(cur['wall_time'])
+        change = (new_time - old_time) / old_time if old_time else 0.0
+        reasons = []
+        if p < alpha and change > min_change:
+            reasons.append(f"time +{change:.1%} (p={p:.3g})")
+        if old['peak_memory'] and \
+                cur['peak_memory'] > old['peak_memory'] * (1 + memory_tolerance):
+            reasons.append(f"memory {old['peak_memory']} -> {cur['peak_memory']}B")
+        for key in ('expanded_nodes', 'generated_nodes'):
+            if cur[key] > old[key]:
+                reasons.append(f"{key} {old[key]} -> {cur[key]}")
+        for key in ('solution_found', 'solution_length'):
+            if cur[key] != old[key]:
+                reasons.append(f"{key} {old[key]} -> {cur[key]}")
+        rows.append({
+            'map': cur['map'], 'algorithm': cur['algorithm'],
+            'baseline_time': old_time, 'current_time': new_time,
+            'baseline_memory': old['peak_memory'], 'current_memory': cur['peak_memory'],
+            'change': change, 't': t, 'df': df, 'p_value': p,
+            'regression': bool(reasons), 'reasons': reasons,
+        })
+    return rows
+
+
+def plot_comparison(baseline, current, path):
+    """Biểu đồ wall time baseline vs current theo map, mỗi thuật toán một ô."""
+    # import muộn: pandas/matplotlib/seaborn chỉ cần khi vẽ biểu đồ
+    import matplotlib
+    matplotlib.use('Agg')
+    import pandas as pd
+    import seaborn as sns
+
+    records = []
+    for label, data in (('baseline', baseline), ('current', current)):
+        if data is None:
+            continue
+        for r in data['results']:
+            for t in r['wall_time']:
+                records.append({'run': label, 'map': r['map'],
+                                'algorithm': r['algorithm'], 'wall_time_ms': t * 1000})
+    df = pd.DataFrame.from_records(records)
+    grid = sns.catplot(data=df, x='map', y='wall_time_ms', hue='run', col='algorithm',
+                       kind='bar', col_wrap=3, sharey=False, errorbar='sd')
+    grid.set_xticklabels(rotation=45)
+    grid.savefig(path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark các thuật toán giải Rush Hour")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def add_run_options(p):
+        p.add_argument('--maps', nargs='+', default=['maps'],
+                       help="thư mục, glob hoặc file map JSON")
+        p.add_argument('-a', '--algorithms', default=','.join(ALGORITHMS))
+        p.add_argument('-r', '--reps', type=int, default=5)
+        p.add_argument('-w', '--warmup', type=int, default=1)
+        p.add_argument('--chart', help="lưu biểu đồ PNG")
+        p.add_argument('--compact', action='store_true',
+                       help="visited/frontier dạng packed cho bfs, dfs, ucs, astar")
+
+    run = sub.add_parser('run', help="chạy benchmark và lưu kết quả")
+    add_run_options(run)
+    run.add_argument('-o', '--output', default=BASELINE_PATH)
+
+    compare = sub.add_parser('compare', help="so sánh với baseline đã lưu")
+    add_run_options(compare)
+    compare.add_argument('baseline', nargs='?', default=BASELINE_PATH)
+    compare.add_argument('--current', help="file kết quả có sẵn thay vì chạy lại")
+    compare.add_argument('-o', '--output', help="lưu kết quả lần chạy mới")
+    compare.add_argument('--alpha', type=float, default=0.05)
+    compare.add_argument('--min-change', type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    algorithms = [a.strip() for a in args.algorithms.split(',') if a.strip()]
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        parser.error(f"Unknown algorithm: {', '.join(unknown)}")
+    log = lambda line: print(line, file=sys.stderr)
+    try:
+        map_paths = find_maps(args.maps) if args.command == 'run' or not args.current else None
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.command == 'run':
+        data = run_benchmark(map_paths, algorithms, args.reps, args.warmup, log,
+                             args.compact)
+        save_results(data, args.output)
+        print(f"saved {len(data['results'])} results -> {args.output}")
+        if args.chart:
+            plot_comparison(None, data, args.chart)
+        return 0
+
+    baseline = load_results(args.baseline)
+    if args.current:
+        current = load_results(args.current)
+    else:
+        current = run_benchmark(map_paths, algorithms, args.reps, args.warmup, log,
+                                args.compact)
+        if args.output:
+            save_results(current, args.output)
+    rows = compare_results(baseline, current, args.alpha, args.min_change)
+    for row in rows:
+        flag = 'REGRESSION' if row['regression'] else 'ok'
+        print(f"{row['map']:>8} {row['algorithm']:<18} "
+              f"{row['baseline_time'] * 1000:10.2f}ms -> {row['current_time'] * 1000:10.2f}ms "
+              f"({row['change']:+.1%}, p={row['p_value']:.3g}) "
+              f"{row['baseline_memory'] / 1024:8.1f}KB -> {row['current_memory'] / 1024:8.1f}KB "
+              f"{flag} {'; '.join(row['reasons'])}")
+    if args.chart:
+        plot_comparison(baseline, current, args.chart)
+    regressions = sum(row['regression'] for row in rows)
+    print(f"{regressions} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
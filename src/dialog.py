@@ -1,6 +1,8 @@
 import pygame
 import math
 
+from assets import assets
+
 class StatsDialog:
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
@@ -9,7 +11,7 @@ class StatsDialog:
         self.stats_data = {}
         
         self.dialog_width = 450
-        self.dialog_height = 330
+        self.dialog_height = 470
         self.dialog_x = (screen_width - self.dialog_width) // 2
         self.dialog_y = (screen_height - self.dialog_height) // 2
         
@@ -22,9 +24,10 @@ class StatsDialog:
         self.button_color = (70, 130, 180)
         self.button_hover_color = (100, 150, 200)
         
-        self.title_font = None
-        self.header_font = None
-        self.text_font = None
+        # overlay và thân dialog (khung, tiêu đề, bảng số liệu) được vẽ sẵn một lần,
+        # mỗi frame chỉ blit lại rồi vẽ nút OK
+        self._overlay = None
+        self._body = None
         
         self.button_width = 100
         self.button_height = 40
@@ -36,14 +39,9 @@ class StatsDialog:
         self.animation_progress = 0.0
         self.animation_speed = 0.1
         
-    def _init_fonts(self):
-        if self.title_font is None:
-            self.title_font = pygame.font.SysFont("Arial", 28, bold=True)
-            self.header_font = pygame.font.SysFont("Arial", 22, bold=True)
-            self.text_font = pygame.font.SysFont("Arial", 20)
-
     def show(self, stats_data):
         self.stats_data = stats_data
+        self._body = None
         self.visible = True
         self.animation_progress = 0.0
         
@@ -78,49 +76,49 @@ class StatsDialog:
         if not self.visible:
             return
             
-        self._init_fonts()
-        
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill(self.overlay_color)
-        screen.blit(overlay, (0, 0))
+        if self._overlay is None:
+            self._overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self._overlay.fill(self.overlay_color)
+        screen.blit(self._overlay, (0, 0))
         
         ease_progress = self._ease_out_back(self.animation_progress)
         anim_dialog_y = self.dialog_y + (1 - ease_progress) * 50
         
-        dialog_rect = pygame.Rect(self.dialog_x, anim_dialog_y, self.dialog_width, self.dialog_height)
-        border_rect = pygame.Rect(self.dialog_x - 2, anim_dialog_y - 2, self.dialog_width + 4, self.dialog_height + 4)
-        
-        self._draw_rounded_rect(screen, border_rect, self.border_color, 15)
-        self._draw_rounded_rect(screen, dialog_rect, self.dialog_bg_color, 15)
-        
-        title_text = self.title_font.render("Algorithm Performance Statistics", True, self.title_color)
-        title_x = self.dialog_x + (self.dialog_width - title_text.get_width()) // 2
-        screen.blit(title_text, (title_x, anim_dialog_y + 20))
-        
-        line_y = anim_dialog_y + 60
-        pygame.draw.line(screen, self.accent_color, 
-                         (self.dialog_x + 20, line_y), 
-                         (self.dialog_x + self.dialog_width - 20, line_y), 2)
-        
-        self._draw_stats(screen, anim_dialog_y + 80)
+        if self._body is None:
+            self._body = self._render_body()
+        screen.blit(self._body, (self.dialog_x - 2, anim_dialog_y - 2))
         
         button_color = self.button_hover_color if self.button_hovered else self.button_color
         button_rect = pygame.Rect(self.button_x, anim_dialog_y + self.dialog_height - 55, 
                                   self.button_width, self.button_height)
         self._draw_rounded_rect(screen, button_rect, button_color, 8)
         
-        button_text = self.header_font.render("OK", True, self.title_color)
+        button_text = assets.text("OK", self.title_color, "Arial", 22, bold=True)
         text_x = button_rect.x + (button_rect.width - button_text.get_width()) // 2
         text_y = button_rect.y + (button_rect.height - button_text.get_height()) // 2
         screen.blit(button_text, (text_x, text_y))
         
         self.button_rect = button_rect
         
-    def _draw_stats(self, screen, start_y):
+    def _render_body(self):
+        body = pygame.Surface((self.dialog_width + 4, self.dialog_height + 4), pygame.SRCALPHA)
+        self._draw_rounded_rect(body, body.get_rect(), self.border_color, 15)
+        self._draw_rounded_rect(body, pygame.Rect(2, 2, self.dialog_width, self.dialog_height),
+                                self.dialog_bg_color, 15)
+        
+        title_text = assets.text("Algorithm Performance Statistics", self.title_color, "Arial", 28, bold=True)
+        body.blit(title_text, (2 + (self.dialog_width - title_text.get_width()) // 2, 22))
+        
+        pygame.draw.line(body, self.accent_color, (22, 62), (self.dialog_width - 18, 62), 2)
+        
+        self._draw_stats(body, 82)
+        return body
+        
+    def _draw_stats(self, surface, start_y):
         if not self.stats_data:
             return
             
-        col_x = self.dialog_x + 40
+        col_x = 42
         row_height = 28
         
         rows = [
@@ -129,15 +127,21 @@ class StatsDialog:
             ("Search Time:", self.stats_data.get('time', 'N/A')),
             ("Memory Usage:", self.stats_data.get('memory', 'N/A')),
             ("Expanded Nodes:", self.stats_data.get('expanded_nodes', 'N/A')),
+            ("Generated / Stale:", f"{self.stats_data.get('generated_nodes', 'N/A')} / "
+                                   f"{self.stats_data.get('stale_nodes', 'N/A')}"),
+            ("Max Frontier:", self.stats_data.get('max_frontier', 'N/A')),
+            ("Max Visited:", self.stats_data.get('max_visited', 'N/A')),
+            ("Throughput:", self.stats_data.get('nodes_per_second', 'N/A')),
             ("Solution Length:", self.stats_data.get('solution_length', 'N/A')),
+            ("Cache:", self.stats_data.get('cache', 'N/A')),
         ]
         
         for i, (label, value) in enumerate(rows):
             y = start_y + i * row_height
-            label_text = self.text_font.render(label, True, self.text_color)
-            value_text = self.text_font.render(str(value), True, self.title_color)
-            screen.blit(label_text, (col_x, y))
-            screen.blit(value_text, (col_x + 180, y))
+            label_text = assets.font("Arial", 20).render(label, True, self.text_color)
+            value_text = assets.font("Arial", 20).render(str(value), True, self.title_color)
+            surface.blit(label_text, (col_x, y))
+            surface.blit(value_text, (col_x + 180, y))
         
     def _draw_rounded_rect(self, surface, rect, color, radius):
         """Vẽ hình chữ nhật bo góc."""
@@ -165,8 +169,8 @@ class PauseDialog:
         self.button_color = (70, 130, 180)
         self.button_hover_color = (100, 150, 220)
 
-        self.title_font = None
-        self.button_font = None
+        self._overlay = None
+        self._body = None
 
         self.button_width = 120
         self.button_height = 50
@@ -175,11 +179,6 @@ class PauseDialog:
         self.button_rect = pygame.Rect(self.button_x, self.button_y, self.button_width, self.button_height)
         self.button_hovered = False
 
-    def _init_fonts(self):
-        if self.title_font is None:
-            self.title_font = pygame.font.SysFont("Arial", 36, bold=True)
-            self.button_font = pygame.font.SysFont("Arial", 28)
-
     def show(self):
         self.visible = True
 
@@ -203,24 +202,22 @@ class PauseDialog:
         if not self.visible:
             return
 
-        self._init_fonts()
-
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill(self.overlay_color)
-        screen.blit(overlay, (0, 0))
-
-        dialog_rect = pygame.Rect(self.dialog_x, self.dialog_y, self.dialog_width, self.dialog_height)
-        pygame.draw.rect(screen, self.dialog_bg_color, dialog_rect, border_radius=15)
-        pygame.draw.rect(screen, self.border_color, dialog_rect, 3, border_radius=15)
-
-        title_text = self.title_font.render("Game Paused", True, self.title_color)
-        title_x = self.dialog_x + (self.dialog_width - title_text.get_width()) // 2
-        title_y = self.dialog_y + 40
-        screen.blit(title_text, (title_x, title_y))
+        if self._overlay is None:
+            # overlay mờ + khung + tiêu đề không đổi: ghép sẵn thành một surface
+            self._overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self._overlay.fill(self.overlay_color)
+            self._body = pygame.Surface((self.dialog_width, self.dialog_height), pygame.SRCALPHA)
+            body_rect = self._body.get_rect()
+            pygame.draw.rect(self._body, self.dialog_bg_color, body_rect, border_radius=15)
+            pygame.draw.rect(self._body, self.border_color, body_rect, 3, border_radius=15)
+            title_text = assets.text("Game Paused", self.title_color, "Arial", 36, bold=True)
+            self._body.blit(title_text, ((self.dialog_width - title_text.get_width()) // 2, 40))
+        screen.blit(self._overlay, (0, 0))
+        screen.blit(self._body, (self.dialog_x, self.dialog_y))
 
         button_color = self.button_hover_color if self.button_hovered else self.button_color
         pygame.draw.rect(screen, button_color, self.button_rect, border_radius=12)
-        button_text = self.button_font.render("Resume", True, (255, 255, 255))
+        button_text = assets.text("Resume", (255, 255, 255), "Arial", 28)
         text_x = self.button_rect.x + (self.button_width - button_text.get_width()) // 2
         text_y = self.button_rect.y + (self.button_height - button_text.get_height()) // 2
         screen.blit(button_text, (text_x, text_y))
@@ -0,0 +1,193 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+from map_loader import load_board, map_digest
+from solver.bitboard import BitBoard
+
+# Bảng khoảng cách ngược (retrograde) cho một map:
+# liệt kê mọi state tới được từ Board ban đầu, BFS ngược đa nguồn từ mọi state
+# đích rồi lưu state -> số bước tối ưu còn lại vào file mapN.dist cạnh mapN.json.
+#
+# File format (little-endian):
+#   header: magic(8) | version(u32) | count(u32) | capacity(u64) | sha1 map(20)
+#   keys:   capacity x u64   (open addressing, EMPTY = ô trống)
+#   values: capacity x u8    (khoảng cách, UNSOLVABLE = không tới được đích)
+
+MAGIC = b'RHDIST\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQ20s')
+EMPTY = 0xFFFFFFFFFFFFFFFF
+UNSOLVABLE = 255
+_HASH_MUL = 0x9E3779B97F4A7C15
+
+
+def _slot(state, capacity):
+    # capacity là lũy thừa của 2
+    return ((state * _HASH_MUL) & EMPTY) >> (64 - capacity.bit_length() + 1)
+
+
+def table_path(map_path):
+    return os.path.splitext(map_path)[0] + '.dist'
+
+
+def compute_distances(bitboard, start):
+    """
+    Trả dict state -> khoảng cách tới đích gần nhất (UNSOLVABLE nếu không tới được).
+    ValueError nếu có state cách đích từ UNSOLVABLE bước trở lên: giá trị u8 của file
+    không chứa được, không cắt bớt thành một khoảng cách sai.
+    """
+    # 1. Liệt kê toàn bộ không gian trạng thái tới được
+    reachable = {start}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        for _, _, child in bitboard.successors(state):
+            if child not in reachable:
+                reachable.add(child)
+                queue.append(child)
+
+    # 2. BFS ngược đa nguồn từ mọi state đích (các bước đi đều đảo ngược được)
+    dist = {state: 0 for state in reachable if bitboard.is_goal(state)}
+    queue = deque(dist)
+    while queue:
+        state = queue.popleft()
+        d = dist[state] + 1
+        for _, _, child in bitboard.successors(state):
+            if child not in dist:
+                if d >= UNSOLVABLE:
+                    raise ValueError(f"khoảng cách tới đích vượt {UNSOLVABLE - 1} bước, "
+                                     f"giá trị u8 của bảng không chứa được")
+                dist[child] = d
+                queue.append(child)
+    for state in reachable:
+        dist.setdefault(state, UNSOLVABLE)
+    return dist
+
+
+def build_table(map_path, out_path=None):
+    """Dựng bảng cho map_path và ghi ra đĩa, trả đường dẫn file .dist."""
+    out_path = out_path or table_path(map_path)
+    board = load_board(map_path)
+    bitboard = BitBoard.from_board(board)
+    if bitboard.state_bits > 64:
+        raise ValueError(f"{map_path}: state needs {bitboard.state_bits} bits, table keys are u64")
+    try:
+        dist = compute_distances(bitboard, bitboard.encode(board.vehicles))
+    except ValueError as e:
+        raise ValueError(f"{map_path}: {e}") from None
+
+    capacity = 1
+    while capacity < 2 * len(dist):
+        capacity *= 2
+    keys = array('Q', [EMPTY]) * capacity
+    values = array('B', [UNSOLVABLE]) * capacity
+    mask = capacity - 1
+    for state, d in dist.items():
+        slot = _slot(state, capacity)
+        while keys[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        keys[slot] = state
+        values[slot] = d
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(dist), capacity, map_digest(map_path)))
+        keys.tofile(f)
+        values.tofile(f)
+    os.replace(tmp_path, out_path)
+    return out_path
+
+
+class DistanceTable:
+    """
+    Bảng khoảng cách đã memory-map: tra cứu O(1) state -> số bước còn lại.
+    Giải một vị trí bất kỳ chỉ là đi xuống theo gradient, không cần tìm kiếm.
+    """
+    def __init__(self, path, bitboard):
+        self.path = path
+        self.bitboard = bitboard
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.capacity, self.digest = HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} không phải bảng khoảng cách hợp lệ")
+        keys_end = HEADER.size + 8 * self.capacity
+        self._keys = memoryview(self._mm)[HEADER.size:keys_end].cast('Q')
+        self._values = memoryview(self._mm)[keys_end:keys_end + self.capacity]
+        self._mask = self.capacity - 1
+
+    def close(self):
+        for view in ('_keys', '_values'):
+            if hasattr(self, view):
+                getattr(self, view).release()
+        self._mm.close()
+        self._file.close()
+
+    def lookup(self, state):
+        # None nếu state không thuộc map; UNSOLVABLE nếu không tới được đích
+        slot = _slot(state, self.capacity)
+        while True:
+            key = self._keys[slot]
+            if key == state:
+                return self._values[slot]
+            if key == EMPTY:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def distance(self, board):
+        return self.lookup(self.bitboard.encode(board.vehicles))
+
+    def best_move(self, state):
+        # Trả (vid, move, state con) dẫn tới state gần đích hơn, None nếu đã ở đích
+        d = self.lookup(state)
+        if d is None or d == 0 or d == UNSOLVABLE:
+            return None
+        for i, move, child in self.bitboard.successors(state):
+            if self.lookup(child) == d - 1:
+                return self.bitboard.ids[i], move, child
+        return None
+
+    def solve(self, board):
+        """Đường đi tối ưu [(vid, move), ...] từ board, None nếu không giải được."""
+        state = self.bitboard.encode(board.vehicles)
+        d = self.lookup(state)
+        if d is None or d == UNSOLVABLE:
+            return None
+        path = []
+        while d > 0:
+            vid, move, state = self.best_move(state)
+            path.append((vid, move))
+            d -= 1
+        return path
+
+
+def load_table(map_path, build=True):
+    """
+    Mở bảng khoảng cách cạnh map_path (memory-mapped).
+    Dựng lại nếu chưa có hoặc map đã thay đổi (so sánh sha1 trong header).
+    """
+    path = table_path(map_path)
+    bitboard = BitBoard.from_board(load_board(map_path))
+    if os.path.exists(path):
+        table = DistanceTable(path, bitboard)
+        if table.digest == map_digest(map_path):
+            return table
+        table.close()
+    if not build:
+        return None
+    build_table(map_path, path)
+    return DistanceTable(path, bitboard)
+
+
+if __name__ == '__main__':
+    # python src/distance_table.py maps/map1.json maps/map2.json ...
+    for map_path in sys.argv[1:]:
+        out = build_table(map_path)
+        with open(out, 'rb') as f:
+            count = HEADER.unpack(f.read(HEADER.size))[2]
+        print(f"{map_path}: {count} states -> {out}")
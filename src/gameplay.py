@@ -2,21 +2,29 @@ import pygame
 import os
 import glob
 import time
-import threading
 import sys
 
-from map_loader import load_map
-from utils import Board, Vehicle
-from solver.bfs import bfs
-from solver.dfs import dfs
-from solver.ucs import ucs
-from solver.astar import astar
+from map_loader import load_board
+from distance_table import load_table, UNSOLVABLE
+from solver import default_options
+from solver.cost_model import COST_MODELS
 from statistics import Statistics
+from assets import assets
+from render import dirty
 from dialog import StatsDialog, PauseDialog
+from playback import Playback, SPEEDS
 
 CELL_SIZE = 80
 WIDTH, HEIGHT = 1100, 800
-stop_event = threading.Event()
+MAX_FRAME_DT = 0.25  # frame bị chặn lâu (vd. delay sau click) không làm animation nhảy cóc
+# Thuật toán anytime chỉ được tìm trong ANYTIME_BUDGET giây rồi trả lời giải tốt nhất,
+# để animation bắt đầu trong khoảng thời gian này kể cả với map khó
+ANYTIME_ALGORITHMS = ('weighted_astar', 'beam_search')
+ANYTIME_BUDGET = 1.0
+# IDA* không có lời giải tạm và có thể rất lâu trên map khó: hết giờ thì báo Out of Budget
+IDASTAR_BUDGET = 30.0
+# thời gian tìm gợi ý tối đa mỗi frame; vị trí mới chưa tìm xong thì tìm tiếp ở frame sau
+HINT_FRAME_BUDGET = 0.005
 
 STATE = "main_menu"
 previous_state = None
@@ -29,7 +37,10 @@ LEVELS = sorted([
 selected_level = None
 board = None
 initial_board = None
-algo_func = bfs
+current_map_path = None
+distance_table = None
+optimal_moves = None
+algo_name = 'bfs'  # key trong solver.ALGORITHMS, giải trong process riêng
 is_paused = False
 resume_button_pressed = False
 
@@ -37,21 +48,59 @@ pause_dialog = PauseDialog(WIDTH, HEIGHT)
 stats_dialog = StatsDialog(WIDTH, HEIGHT)
 current_stats = Statistics()
 current_algorithm = "BFS"
+# None: mỗi thuật toán dùng cost model mặc định của nó
+cost_model = None
+# Cache lời giải (SQLite) và process giải chỉ được tạo ở lần dùng đầu tiên,
+# qua get_solution_cache()/get_solve_worker(), không phải lúc import module này.
+# Process giải chạy suốt phiên; current_job là job đang chờ kết quả
+solution_cache = None
+solve_worker = None
+current_job = None
+search_progress = None
+# Lời giải đang được diễn lại (None nếu không có), cập nhật mỗi frame bởi update_playback()
+playback = None
+playback_stats = None
+playback_speed = 1
+win_played = False
+last_frame_time = None
+# Gợi ý bước tối ưu tiếp theo cho board đang hiển thị (phím H bật/tắt)
+hint_service = None
+show_hint = False
+speed_button = pygame.Rect(380, 735, 80, 48)
+
 
 car_images = {}
 current_map_folder = None
-background_img = None
 tick_img = None
+click_sound = None
+win_sound = None
 
 GRID_OFFSET_X = 400
 GRID_OFFSET_Y = 200
-
-pygame.mixer.init()
-click_sound = pygame.mixer.Sound('./sound/click.wav')
-click_sound.set_volume(0.3)
-
-win_sound = pygame.mixer.Sound('./sound/win.wav')
-win_sound.set_volume(0.5)
+GRID_AREA = 6 * CELL_SIZE  # vùng vẽ board trên ảnh nền (vừa board 6x6 cổ điển)
+# ô và góc trên-trái của board đang chơi, board khác 6x6 được thu nhỏ cho vừa GRID_AREA
+cell_size = CELL_SIZE
+grid_x, grid_y = GRID_OFFSET_X, GRID_OFFSET_Y
+
+def get_solution_cache():
+    global solution_cache
+    if solution_cache is None:
+        from solution_cache import SolutionCache
+        solution_cache = SolutionCache()
+    return solution_cache
+
+def get_solve_worker():
+    global solve_worker
+    if solve_worker is None:
+        from solve_worker import SolveWorker
+        solve_worker = SolveWorker()
+    return solve_worker
+
+def load_sounds():
+    global click_sound, win_sound
+    if click_sound is None:
+        click_sound = assets.sound('./sound/click.wav', 0.3)
+        win_sound = assets.sound('./sound/win.wav', 0.5)
 
 def set_state(value):
     global STATE, previous_state
@@ -66,7 +115,7 @@ def go_back():
     global previous_state
     if previous_state:
         if previous_state == "gameplay":
-            go_to_gameplay(selected_level)
+            enter_gameplay()
         else:
             set_state(previous_state)
     else:
@@ -75,8 +124,26 @@ def go_back():
 def load_tick_image():
     global tick_img
     if tick_img is None:
-        tick_img = pygame.image.load('./images/src_images/tick.png').convert_alpha()
-        tick_img = pygame.transform.scale(tick_img, (40, 40))
+        tick_img = assets.image('./images/src_images/tick.png', (40, 40), alpha=True)
+
+def car_sprites(map_number, cell=CELL_SIZE):
+    # [(key, path, size)] cho các ảnh xe của map, tên file dạng <id>_<h|v>_<length>.png
+    folder = os.path.join('.', 'images', f'map{map_number}')
+    if not os.path.exists(folder):
+        return []
+    sprites = []
+    for img_file in os.listdir(folder):
+        if img_file.endswith('.png'):
+            name, _ = os.path.splitext(img_file)
+            parts = name.split('_')
+            if len(parts) != 3:
+                continue
+            car_id, orientation, length_str = parts
+            key = (car_id.lower(), orientation.lower(), int(length_str))
+            w = cell if orientation == 'v' else cell * int(length_str)
+            h = cell * int(length_str) if orientation == 'v' else cell
+            sprites.append((key, os.path.join(folder, img_file), (w, h)))
+    return sprites
 
 def load_car_images(map_number):
     global car_images, current_map_folder
@@ -85,19 +152,13 @@ def load_car_images(map_number):
     if not os.path.exists(current_map_folder):
         print(f"Folder images {current_map_folder} không tồn tại!")
         return
-    for img_file in os.listdir(current_map_folder):
-        if img_file.endswith('.png'):
-            name, _ = os.path.splitext(img_file)
-            parts = name.split('_')
-            if len(parts) != 3:
-                continue
-            car_id, orientation, length_str = parts
-            key = (car_id.lower(), orientation.lower(), int(length_str))
-            path = os.path.join(current_map_folder, img_file)
-            img = pygame.image.load(path).convert_alpha()
-            w = CELL_SIZE if orientation == 'v' else CELL_SIZE * int(length_str)
-            h = CELL_SIZE * int(length_str) if orientation == 'v' else CELL_SIZE
-            car_images[key] = pygame.transform.scale(img, (w, h))
+    for key, path, size in car_sprites(map_number, cell_size):
+        car_images[key] = assets.image(path, size, alpha=True)
+
+def preload_level(level):
+    # decode trước ảnh xe của level kế tiếp trong thread nền
+    if level in LEVELS:
+        assets.preload([(path, size, True) for _, path, size in car_sprites(level)])
 
 def go_to_level_select():
     global STATE
@@ -112,51 +173,136 @@ def go_to_settings():
     previous_state = STATE
     STATE = "settings"
 
-def go_to_gameplay(level):
-    global selected_level, board, initial_board, STATE, current_stats, current_algorithm
+def load_distance_table(path):
+    # Mở (hoặc dựng lần đầu) bảng khoảng cách mapN.dist, memory-mapped
+    global distance_table, optimal_moves, hint_service
+    if distance_table is not None:
+        distance_table.close()
+    distance_table = None
+    optimal_moves = None
+    try:
+        # board lớn có thể có không gian trạng thái rất lớn: chỉ dùng bảng đã dựng sẵn
+        # bằng CLI (python src/distance_table.py), không dựng trong GUI
+        distance_table = load_table(path, build=initial_board.is_classic)
+    except ValueError:
+        pass
+    # không có bảng thì gợi ý tự tìm kiếm (và nhớ các lời giải tối ưu đã có)
+    from hints import HintService
+    hint_service = HintService(initial_board, distance_table)
+    if distance_table is not None:
+        optimal_moves = distance_table.distance(initial_board)
+
+def set_grid(board):
+    global cell_size, grid_x, grid_y
+    cell_size = min(CELL_SIZE, GRID_AREA // max(board.width, board.height))
+    grid_x = GRID_OFFSET_X + (GRID_AREA - board.width * cell_size) // 2
+    grid_y = GRID_OFFSET_Y + (GRID_AREA - board.height * cell_size) // 2
+
+def load_level(level):
+    # Đọc map và dựng các thứ dùng suốt lúc chơi map này (bảng khoảng cách, dịch vụ gợi ý
+    # cùng những gì nó đã học), chỉ khi chọn level, không phải mỗi lần Reset
+    global selected_level, initial_board, current_map_path
     path = os.path.join("maps", f"map{level}.json")
-    vehicles = load_map(path)
-    board = Board(vehicles)
-    initial_board = Board({vid: v for vid, v in vehicles.items()})
+    initial_board = load_board(path)
+    set_grid(initial_board)
+    current_map_path = path
+    load_distance_table(path)
+    get_solution_cache().invalidate_map(path)
+    get_solve_worker().start()  # khởi động sẵn để lần bấm Solve đầu tiên không phải chờ
     selected_level = level
+    load_car_images(level)
+    preload_level(level + 1)
+
+def enter_gameplay():
+    # Về màn chơi với board ban đầu của level đã nạp
+    global board, STATE, current_stats, current_algorithm
+    board = initial_board.copy()
     STATE = "gameplay"
     current_stats = Statistics()
-    current_algorithm = algo_func.__name__.upper()
-    load_car_images(level)
+    current_algorithm = algo_name.upper()
+
+def go_to_gameplay(level):
+    load_level(level)
+    enter_gameplay()
 
 def quit_game():
+    if solve_worker is not None:
+        solve_worker.close()
     pygame.quit()
     sys.exit()
 
 def select_bfs():
-    global algo_func, current_algorithm
-    algo_func = bfs
+    global algo_name, current_algorithm
+    algo_name = 'bfs'
     current_algorithm = 'BFS'
 
 def select_dfs():
-    global algo_func, current_algorithm
-    algo_func = dfs
+    global algo_name, current_algorithm
+    algo_name = 'dfs'
     current_algorithm = 'DFS'
 
 def select_ucs():
-    global algo_func, current_algorithm
-    algo_func = ucs
+    global algo_name, current_algorithm
+    algo_name = 'ucs'
     current_algorithm = 'UCS'
 
 def select_astar():
-    global algo_func, current_algorithm
-    algo_func = astar
+    global algo_name, current_algorithm
+    algo_name = 'astar'
     current_algorithm = 'ASTAR'
 
+def select_bidirectional_bfs():
+    global algo_name, current_algorithm
+    algo_name = 'bidirectional_bfs'
+    current_algorithm = 'BIDIRECTIONAL_BFS'
+
+def select_idastar():
+    global algo_name, current_algorithm
+    algo_name = 'idastar'
+    current_algorithm = 'IDASTAR'
+
+def select_weighted_astar():
+    global algo_name, current_algorithm
+    algo_name = 'weighted_astar'
+    current_algorithm = 'WEIGHTED_ASTAR'
+
+def select_beam_search():
+    global algo_name, current_algorithm
+    algo_name = 'beam_search'
+    current_algorithm = 'BEAM_SEARCH'
+
+# Các thuật toán không có nút vẽ sẵn trên ảnh nền: (tên, nhãn, hàm chọn),
+# vẽ thành hàng nút nhỏ dưới START/RESET
+EXTRA_ALGORITHMS = [
+    ('BIDIRECTIONAL_BFS', 'Bi-BFS', select_bidirectional_bfs),
+    ('IDASTAR', 'IDA*', select_idastar),
+    ('WEIGHTED_ASTAR', 'AWA*', select_weighted_astar),
+    ('BEAM_SEARCH', 'Beam', select_beam_search),
+]
+
+def extra_algorithm_buttons():
+    return [(pygame.Rect(20 + i * 90, 735, 80, 48), name, label, action)
+            for i, (name, label, action) in enumerate(EXTRA_ALGORITHMS)]
+
+COST_MODEL_OPTIONS = [None, *COST_MODELS]
+cost_model_button = pygame.Rect(560, 60, 180, 44)
+
+def cycle_cost_model():
+    global cost_model
+    k = COST_MODEL_OPTIONS.index(cost_model)
+    cost_model = COST_MODEL_OPTIONS[(k + 1) % len(COST_MODEL_OPTIONS)]
+
 def reset_game():
-    global board, current_stats, current_algorithm
-    stop_event.set()
-    if initial_board:
-        board = Board({vid: v for vid, v in initial_board.vehicles.items()})
-        current_stats = Statistics()
-        current_algorithm = algo_func.__name__.upper()
-        stats_dialog.hide()
-    go_to_gameplay(selected_level)
+    # chỉ đưa board về ban đầu: hint_service giữ nguyên những gì đã học của map
+    global current_job, is_solving, search_progress, playback
+    if current_job is not None:
+        get_solve_worker().cancel(current_job)
+        current_job = None
+    playback = None
+    is_solving = False
+    search_progress = None
+    stats_dialog.hide()
+    enter_gameplay()
 
 def format_time(seconds):
     if seconds < 0.001:
@@ -167,105 +313,244 @@ def format_time(seconds):
         return f"{seconds:.3f}s"
 
 def solve():
-    def worker():
-        global board, current_stats, stats_dialog, is_solving, is_paused
-        stop_event.clear()
-        is_solving = True
-
-        current_stats = Statistics()
-        try:
-            result, stats = algo_func(initial_board)
-            if not result:
-                stats_data = stats.get_formatted_stats()
-                stats_dialog.show(stats_data)
-                is_solving = False
-                return
-                
-            final_stats = stats.get_formatted_stats()
-            path = result
-            board = Board({vid: v for vid, v in initial_board.vehicles.items()})
-
-            def sleep_with_stop_check(total_ms, check_interval_ms=50):
-                for _ in range(0, total_ms, check_interval_ms):
-                    if stop_event.is_set():
-                        break
-                    time.sleep(check_interval_ms / 1000)
-
-            animation_completed = True
-            for vid, move in path:
-                if stop_event.is_set():
-                    animation_completed = False
-                    break
-                
-                while is_paused:
-                    if stop_event.is_set():
-                        animation_completed = False
-                        break
-                    time.sleep(0.05)
-                
-                if not animation_completed:
-                    break
-                
-                sleep_with_stop_check(300)
-                
-                if stop_event.is_set():
-                    animation_completed = False
-                    break
-                
-                v = board.vehicles[vid]
-                new_r, new_c = (v.row + move, v.col) if v.orientation == 'V' else (v.row, v.col + move)
-                board.vehicles[vid] = Vehicle(v.id, v.orientation, new_r, new_c, v.length)
-            
-            if animation_completed:
-                win_sound.play()
-                time.sleep(0.5)
-                stats_dialog.show(final_stats)
-
-        except Exception as e:
+    # Tra cache ngay trong UI thread (rất nhanh), nếu không có thì gửi cho process giải;
+    # kết quả được đọc lại mỗi frame bởi poll_solve_worker()
+    global current_stats, is_solving, current_job
+    is_solving = True
+    current_stats = Statistics()
+    # heuristic/giới hạn độ sâu mà process giải sẽ dùng là một phần của key cache
+    heuristic, limit = default_options(algo_name)
+    cached = get_solution_cache().get(initial_board, current_algorithm, cost_model or "default",
+                                      heuristic, limit)
+    if cached is not None:
+        result, summary = cached
+        finish_solve(result, Statistics.from_summary(summary, result), True)
+    else:
+        budget = (ANYTIME_BUDGET if algo_name in ANYTIME_ALGORITHMS
+                  else IDASTAR_BUDGET if algo_name == 'idastar' else None)
+        current_job = get_solve_worker().submit(initial_board, algo_name, cost_model, budget)
+
+def poll_solve_worker():
+    global current_job, search_progress, is_solving
+    if solve_worker is None:
+        return  # chưa gửi yêu cầu giải nào
+    for message in solve_worker.poll():
+        kind, job_id = message[0], message[1]
+        if job_id != current_job:
+            continue  # kết quả của lần giải đã bị Reset
+        if kind == 'progress':
+            progress = message[2]
+            search_progress = (f"{current_stats.format_rate(progress['nodes_per_second'])}, "
+                               f"{progress['expanded_nodes']} nodes")
+            continue
+        if kind == 'solution':
+            # lời giải tạm của thuật toán anytime; lời giải cuối về cùng message 'done'
+            best = Statistics.from_summary(message[3], message[2])
+            search_progress = f"best {best.format_solution_length()}"
+            continue
+        current_job = None
+        search_progress = None
+        if kind == 'done':
+            _, _, path, summary = message
+            if summary.get('stop_reason') is None:
+                heuristic, limit = default_options(algo_name)
+                get_solution_cache().put(initial_board, current_algorithm, cost_model or "default",
+                                         path, summary, current_map_path, heuristic, limit)
+            finish_solve(path, Statistics.from_summary(summary, path), False)
+        elif kind == 'error':
             error_stats = {
                 'algorithm': current_algorithm,
-                'status': f'Error: {str(e)}',
+                'status': f'Error: {message[2]}',
                 'time': '0ms',
                 'memory': '0KB',
                 'expanded_nodes': '0',
                 'solution_length': '0'
             }
             stats_dialog.show(error_stats)
-            print(f"Error during solving: {e}")
-        finally:
+            print(f"Error during solving: {message[2]}")
             is_solving = False
+        else:
+            is_solving = False
+
+def finish_solve(result, stats, from_cache):
+    global is_solving
+    from hints import optimal_cost_model
+    cache_status = get_solution_cache().describe(from_cache)
+    learned_model = optimal_cost_model(algo_name, cost_model, stats.get_summary())
+    if result and learned_model is not None:
+        hint_service.learn(initial_board, result, learned_model)
+    if not result:
+        stats_data = stats.get_formatted_stats()
+        stats_data['cache'] = cache_status
+        stats_dialog.show(stats_data)
+        is_solving = False
+        return
+
+    final_stats = stats.get_formatted_stats()
+    final_stats['cache'] = cache_status
+    animate_solution(result, final_stats)
+
+def animate_solution(path, final_stats):
+    global playback, playback_stats, win_played
+    playback = Playback(initial_board.copy(), path, speed=playback_speed)
+    playback_stats = final_stats
+    win_played = False
+
+def update_playback():
+    # gọi mỗi frame: tiến animation theo thời gian thực giữa hai frame
+    global board, playback, is_solving, win_played, last_frame_time
+    now = time.perf_counter()
+    dt = 0.0 if last_frame_time is None else min(now - last_frame_time, MAX_FRAME_DT)
+    last_frame_time = now
+    if playback is None:
+        return
+    if not is_paused:
+        playback.update(dt)
+    board = playback.board
+    if playback.finished and not win_played:
+        win_sound.play()
+        win_played = True
+    if playback.done:
+        playback = None
+        is_solving = False
+        stats_dialog.show(playback_stats)
+
+def set_speed(speed):
+    global playback_speed
+    playback_speed = speed
+    if playback is not None:
+        playback.speed = speed
+
+def cycle_speed():
+    set_speed(SPEEDS[(SPEEDS.index(playback_speed) + 1) % len(SPEEDS)])
+
+def handle_event(event):
+    # H bật/tắt gợi ý; phím điều khiển animation: Space dừng/chạy, trái/phải từng bước,
+    # lên/xuống đổi tốc độ, Home/End về đầu/nhảy tới cuối
+    global show_hint
+    if event.type == pygame.KEYDOWN and event.key == pygame.K_h and not is_paused:
+        show_hint = not show_hint
+        return
+    if event.type != pygame.KEYDOWN or playback is None or is_paused:
+        return
+    if event.key == pygame.K_SPACE:
+        playback.paused = not playback.paused
+    elif event.key == pygame.K_RIGHT:
+        playback.step(1)
+    elif event.key == pygame.K_LEFT:
+        playback.step(-1)
+    elif event.key == pygame.K_HOME:
+        playback.seek(0)
+        playback.paused = True
+    elif event.key == pygame.K_END:
+        playback.skip_to_end()
+    elif event.key in (pygame.K_UP, pygame.K_DOWN):
+        k = SPEEDS.index(playback_speed) + (1 if event.key == pygame.K_UP else -1)
+        if 0 <= k < len(SPEEDS):
+            set_speed(SPEEDS[k])
+
+def hint_text():
+    hint = hint_service.hint(board, HINT_FRAME_BUDGET)
+    if hint is None:
+        return "Hint: thinking..."
+    move, remaining = hint
+    if move is None:
+        return "Hint: solved" if remaining == 0 else "Hint: no solution"
+    vid, step = move
+    if board.vehicles[vid].orientation == 'H':
+        direction = 'right' if step > 0 else 'left'
+    else:
+        direction = 'down' if step > 0 else 'up'
+    return f"Hint: {vid} {direction}, {remaining} moves left"
 
-    threading.Thread(target=worker, daemon=True).start()
+def draw_board(screen):
+    # ảnh nền đã vẽ sẵn bãi đỗ 6x6 cổ điển; board khác thì vẽ lưới, tường và lối ra
+    if initial_board.is_classic:
+        return
+    width, height = initial_board.width, initial_board.height
+    area = pygame.Rect(grid_x, grid_y, width * cell_size, height * cell_size)
+    pygame.draw.rect(screen, (70, 70, 75), area)
+    for r in range(height):
+        for c in range(width):
+            cell = (grid_x + c * cell_size, grid_y + r * cell_size, cell_size, cell_size)
+            if (r, c) in initial_board.walls:
+                pygame.draw.rect(screen, (30, 30, 30), cell)
+            else:
+                pygame.draw.rect(screen, (95, 95, 100), cell, 1)
+    side, index = initial_board.exit_position()
+    if side in ('left', 'right'):
+        x = area.right if side == 'right' else area.left - 8
+        exit_rect = (x, grid_y + index * cell_size, 8, cell_size)
+    else:
+        y = area.bottom if side == 'bottom' else area.top - 8
+        exit_rect = (grid_x + index * cell_size, y, cell_size, 8)
+    pygame.draw.rect(screen, (90, 200, 90), exit_rect)
+    dirty.region('board', area.inflate(16, 16), current_map_path)
 
 def draw_vehicles(screen):
-    for v in board.vehicles.values():
-        x = GRID_OFFSET_X + v.col * CELL_SIZE
-        y = GRID_OFFSET_Y + v.row * CELL_SIZE
+    # trong lúc diễn lại, xe đang di chuyển nằm giữa hai ô (row/col là số thực)
+    placed = playback.vehicles() if playback is not None else \
+        [(v, v.row, v.col) for v in board.vehicles.values()]
+    for v, row, col in placed:
+        x = grid_x + round(col * cell_size)
+        y = grid_y + round(row * cell_size)
         key = (v.id.lower(), v.orientation.lower(), v.length)
+        w = (v.length if v.orientation == 'H' else 1) * cell_size
+        h = (v.length if v.orientation == 'V' else 1) * cell_size
         if key in car_images:
             screen.blit(car_images[key], (x, y))
         else:
-            w = (v.length if v.orientation == 'H' else 1) * CELL_SIZE
-            h = (v.length if v.orientation == 'V' else 1) * CELL_SIZE
             color = (255, 0, 0) if v.id == 'X' else (0, 102, 204)
             pygame.draw.rect(screen, color, (x, y, w, h))
+        dirty.region(('car', v.id), (x, y, w, h), (x, y, key))
+
+def draw_algorithm_button(screen, button, label, selected):
+    pygame.draw.rect(screen, (215, 215, 210), button, border_radius=12)
+    if selected:
+        pygame.draw.rect(screen, (100, 175, 250), button, 3, border_radius=12)
+    text = assets.text(label, (40, 40, 40), "Comic Sans MS", 18, bold=True)
+    screen.blit(text, (button.x + (button.width - text.get_width()) // 2,
+                       button.y + (button.height - text.get_height()) // 2))
+    dirty.region(('button', button.topleft), button, (label, selected))
 
 def gameplay(screen):
-    global background_img, is_paused, resume_button_pressed
+    global is_paused, resume_button_pressed
+    poll_solve_worker()
+    load_sounds()
+    update_playback()
     if not is_solving:
-        background_img = pygame.image.load('./images/gui/gameplaybg.png').convert()
+        background_img = assets.image('./images/gui/gameplaybg.png')
     else:
-        background_img = pygame.image.load('./images/gui/pause.png').convert()
+        background_img = assets.image('./images/gui/pause.png')
 
     screen.blit(background_img, (0, 0))
+    dirty.region('background', screen.get_rect(), is_solving)
+    draw_board(screen)
     draw_vehicles(screen)
 
     load_tick_image()
 
-    font = pygame.font.SysFont("Comic Sans MS", 45)
     percent_text = f"{selected_level}"
-    text_surface = font.render(percent_text, True, (255, 255, 255))
+    text_surface = assets.text(percent_text, (255, 255, 255), "Comic Sans MS", 45)
     screen.blit(text_surface, (470, 105))
+    dirty.region('level', text_surface.get_rect(topleft=(470, 105)), percent_text)
+
+    if optimal_moves is not None:
+        info_text = "No solution" if optimal_moves == UNSOLVABLE else f"Optimal: {optimal_moves} moves"
+        info_surface = assets.text(info_text, (255, 255, 255), "Comic Sans MS", 24)
+        screen.blit(info_surface, (560, 125))
+        dirty.region('optimal', info_surface.get_rect(topleft=(560, 125)), info_text)
+
+    if is_solving and search_progress:
+        progress_surface = assets.text(f"Searching: {search_progress}", (255, 255, 255),
+                                       "Comic Sans MS", 18)
+        screen.blit(progress_surface, (560, 155))
+        dirty.region('progress', progress_surface.get_rect(topleft=(560, 155)), search_progress)
+    elif show_hint and hint_service is not None:
+        text = hint_text()
+        hint_surface = assets.text(text, (255, 255, 255), "Comic Sans MS", 18)
+        screen.blit(hint_surface, (560, 155))
+        dirty.region('hint', hint_surface.get_rect(topleft=(560, 155)), text)
 
     mouse = pygame.mouse.get_pos()
     click = pygame.mouse.get_pressed()
@@ -288,6 +573,7 @@ def gameplay(screen):
     def draw_tick_on_button(button):
         tick_pos = (button.x + button.width - 30, button.y + button.height - 30)
         screen.blit(tick_img, tick_pos)
+        dirty.region('tick', tick_img.get_rect(topleft=tick_pos), tick_pos)
 
     if current_algorithm == 'BFS':
         draw_tick_on_button(bfs_button)
@@ -298,6 +584,12 @@ def gameplay(screen):
     elif current_algorithm == 'ASTAR':
         draw_tick_on_button(astar_button)
 
+    for button, name, label, _ in extra_algorithm_buttons():
+        draw_algorithm_button(screen, button, label, current_algorithm == name)
+    draw_algorithm_button(screen, cost_model_button,
+                          f"Cost: {cost_model or 'default'}", cost_model is not None)
+    draw_algorithm_button(screen, speed_button, f"{playback_speed:g}x", playback_speed != 1)
+
     if is_solving:
         if pause_button.collidepoint(mouse) and click[0] == 1:
             if not is_paused:
@@ -321,6 +613,7 @@ def gameplay(screen):
                 resume_button_pressed = False
 
             pause_dialog.draw(screen)
+            dirty.region('pause_dialog', screen.get_rect(), pause_dialog.button_hovered)
             return
 
     if not stats_dialog.visible:
@@ -336,6 +629,8 @@ def gameplay(screen):
                 (dfs_button, select_dfs),
                 (ucs_button, select_ucs),
                 (astar_button, select_astar),
+                *[(button, action) for button, _, _, action in extra_algorithm_buttons()],
+                (cost_model_button, cycle_cost_model),
                 (solve_button, solve),
                 (level_select_button, go_to_level_select),
                 (home_button, go_to_main_menu),
@@ -351,4 +646,13 @@ def gameplay(screen):
             pygame.time.delay(150)
             reset_game()
 
+        if speed_button.collidepoint(mouse) and click[0] == 1:
+            click_sound.play()
+            pygame.time.delay(150)
+            cycle_speed()
+
     stats_dialog.draw(screen)
+    if stats_dialog.visible:
+        dirty.region('stats_dialog', screen.get_rect(),
+                     (stats_dialog.animation_progress, stats_dialog.button_hovered,
+                      id(stats_dialog.stats_data)))
@@ -0,0 +1,282 @@
+import argparse
+import glob
+import heapq
+import os
+import re
+import string
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from map_loader import save_board
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from utils import Vehicle
+
+# Sinh map khó nhất bằng cách duyệt toàn bộ không gian trạng thái:
+#   1. layout = cách xếp các xe lên đường đi (hàng cho xe ngang, cột cho xe dọc) cùng
+#      thứ tự các xe trên mỗi đường. Xe không đổi đường và không vượt nhau được nên
+#      mỗi layout là một phần rời của đồ thị nước đi -> chia việc cho các process theo layout.
+#   2. trong mỗi layout: liệt kê các state đích (X sát lối ra), BFS ngược đa nguồn từ đó
+#      (các bước đi đều đảo ngược được) -> khoảng cách tới đích của mọi state giải được.
+#      Thành phần liên thông không chứa state đích thì không giải được nên bỏ qua luôn.
+#   3. gom các state giải được thành thành phần liên thông, lấy state xa đích nhất
+#      của mỗi thành phần; giữ lại --count puzzle khó nhất và ghi ra mapN.json.
+#   python src/generate_maps.py --cars 4 --trucks 2 -n 10 -o maps/generated
+
+IDS = [c for c in string.ascii_uppercase if c != 'X']
+TARGET_LENGTH = 2
+BATCH = 16  # số layout mỗi job gửi sang process con
+
+
+def tracks(width, height, target_row):
+    # (hướng, hàng/cột, số ô): mọi cột và mọi hàng trừ hàng của X
+    # (xe ngang trên hàng của X hoặc chặn X mãi mãi, hoặc không bao giờ cản X)
+    return ([('H', r, width) for r in range(height) if r != target_row] +
+            [('V', c, height) for c in range(width)])
+
+
+def _sequences(remaining, capacity):
+    # mọi dãy độ dài xe (theo thứ tự trên đường) lấy từ multiset remaining, tổng <= capacity
+    yield ()
+    for length in sorted(remaining):
+        if remaining[length] and length <= capacity:
+            remaining[length] -= 1
+            for rest in _sequences(remaining, capacity - length):
+                yield (length,) + rest
+            remaining[length] += 1
+
+
+def enumerate_layouts(width, height, target_row, lengths):
+    """Sinh mọi layout dùng hết các xe trong lengths: tuple các (hướng, hàng/cột, dãy độ dài)."""
+    lines = tracks(width, height, target_row)
+    remaining = Counter(lengths)
+    chosen = []
+
+    def place(t):
+        if not +remaining:
+            yield tuple(chosen)
+            return
+        if t == len(lines):
+            return
+        orientation, line, capacity = lines[t]
+        for seq in list(_sequences(remaining, capacity)):
+            remaining.subtract(seq)
+            if seq:
+                chosen.append((orientation, line, seq))
+            yield from place(t + 1)
+            if seq:
+                chosen.pop()
+            remaining.update(seq)
+
+    return place(0)
+
+
+def layout_bitboard(layout, width, height, target_row, walls=()):
+    """BitBoard của layout (vị trí xe không quan trọng) và prev[i] = xe đứng trước xe i trên cùng đường."""
+    vehicles = {'X': Vehicle('X', 'H', target_row, 0, TARGET_LENGTH)}
+    prev = [None]
+    ids = iter(IDS)
+    for orientation, line, seq in layout:
+        for k, length in enumerate(seq):
+            vid = next(ids)
+            row, col = (line, 0) if orientation == 'H' else (0, line)
+            vehicles[vid] = Vehicle(vid, orientation, row, col, length)
+            prev.append(len(prev) - 1 if k else None)
+    return BitBoard(vehicles, width, height, walls), prev
+
+
+def goal_states(bitboard, prev):
+    """Mọi state có X sát lối ra và các xe khác không chồng nhau (giữ thứ tự trên từng đường)."""
+    if not bitboard.can_exit:
+        return []
+    n = len(bitboard.ids)
+    x = bitboard.target  # X luôn là xe đầu tiên
+    positions = [0] * n
+    positions[x] = bitboard.goal_pos
+    states = []
+
+    def place(i, occ, state):
+        if i == n:
+            states.append(state)
+            return
+        masks = bitboard.masks[i]
+        lo = positions[prev[i]] + bitboard.lengths[prev[i]] if prev[i] is not None else 0
+        for p in range(lo, len(masks)):
+            if not occ & masks[p]:
+                positions[i] = p
+                place(i + 1, occ | masks[p], state | p << bitboard.shifts[i])
+
+    place(1, bitboard.fixed | bitboard.masks[x][bitboard.goal_pos],
+          bitboard.goal_pos << bitboard.shifts[x])
+    return states
+
+
+def hardest_in_layout(layout, width, height, target_row, walls=(), cost_model='cell', min_length=1):
+    """[(khoảng cách, số state của thành phần, layout, state xa nhất)] cho mỗi thành phần giải được."""
+    bitboard, prev = layout_bitboard(layout, width, height, target_row, walls)
+    successors = get_cost_model(cost_model).successors(bitboard)
+    goals = goal_states(bitboard, prev)
+    dist = dict.fromkeys(goals, 0)
+    # mỗi state mang nhãn là state đích đã sinh ra nó; cạnh nối hai nhãn khác nhau thì
+    # gộp hai nhãn (union-find) -> có luôn thành phần liên thông mà không phải duyệt lại
+    label = {goal: goal for goal in goals}
+    parent = dict(label)
+
+    def find(s):
+        while parent[s] != s:
+            parent[s] = parent[parent[s]]
+            s = parent[s]
+        return s
+
+    queue = deque(goals)
+    while queue:
+        state = queue.popleft()
+        d = dist[state] + 1
+        root = find(label[state])
+        for _, _, child in successors(state):
+            if child not in dist:
+                dist[child] = d
+                label[child] = root
+                queue.append(child)
+            elif label[child] != root:
+                other = label[child] = find(label[child])
+                if other != root:
+                    parent[other] = root
+
+    # state xa nhất của mỗi thành phần; khi hòa chọn state nhỏ nhất cho ổn định
+    best = {}
+    size = Counter()
+    for state, d in dist.items():
+        component = find(label[state])
+        size[component] += 1
+        other = best.get(component)
+        if other is None or (d, -state) > (dist[other], -other):
+            best[component] = state
+    return [(dist[state], size[component], layout, state)
+            for component, state in best.items() if dist[state] >= min_length]
+
+
+def _solve_batch(layouts, options, count):
+    # chạy trong process con: chỉ gửi về count kết quả tốt nhất của cả batch
+    results = []
+    for layout in layouts:
+        results.extend(hardest_in_layout(layout, **options))
+    return len(layouts), heapq.nlargest(count, results)
+
+
+def _batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(width=6, height=6, target_row=None, lengths=(2, 2, 2, 2, 3, 3), walls=(),
+             cost_model='cell', count=10, min_length=1, workers=None, progress=None):
+    """
+    Trả về tối đa count puzzle khó nhất [(khoảng cách, Board)], khó nhất trước.
+    lengths: độ dài các xe ngoài X; progress(số layout đã xong) được gọi sau mỗi batch.
+    Số job chờ được giới hạn nên bộ nhớ không tăng theo số layout.
+    """
+    if target_row is None:
+        target_row = (height - 1) // 2
+    if len(lengths) > len(IDS):
+        raise ValueError(f"at most {len(IDS)} vehicles besides X")
+    if get_cost_model(cost_model).name == 'length':
+        raise ValueError("backward BFS needs unit step costs: use 'cell' or 'slide'")
+    options = dict(width=width, height=height, target_row=target_row, walls=tuple(walls),
+                   cost_model=cost_model, min_length=min_length)
+    workers = workers or os.cpu_count()
+    best = []  # min-heap giữ count kết quả tốt nhất
+    done = 0
+
+    def merge(future):
+        nonlocal done
+        n, results = future.result()
+        done += n
+        for result in results:
+            if len(best) < count:
+                heapq.heappush(best, result)
+            elif result > best[0]:
+                heapq.heapreplace(best, result)
+        if progress:
+            progress(done)
+
+    layouts = enumerate_layouts(width, height, target_row, lengths)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for batch in _batched(layouts, BATCH):
+            pending.add(executor.submit(_solve_batch, batch, options, count))
+            if len(pending) >= 4 * workers:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    merge(future)
+        for future in pending:
+            merge(future)
+
+    puzzles = []
+    for distance, _, layout, state in sorted(best, reverse=True):
+        bitboard, _ = layout_bitboard(layout, width, height, target_row, walls)
+        puzzles.append((distance, bitboard.to_board(state)))
+    return puzzles
+
+
+def next_map_number(directory):
+    numbers = [int(m.group(1)) for path in glob.glob(os.path.join(directory, 'map*.json'))
+               if (m := re.fullmatch(r'map(\d+)\.json', os.path.basename(path)))]
+    return max(numbers, default=0) + 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh map khó nhất bằng cách duyệt toàn bộ không gian trạng thái")
+    parser.add_argument('--width', type=int, default=6)
+    parser.add_argument('--height', type=int, default=6)
+    parser.add_argument('--target-row', type=int, help="hàng của X (mặc định ở giữa)")
+    parser.add_argument('--cars', type=int, default=4, help="số xe dài 2 ngoài X")
+    parser.add_argument('--trucks', type=int, default=2, help="số xe dài 3")
+    parser.add_argument('--wall', action='append', default=[], metavar='ROW,COL',
+                        help="ô tường cố định, lặp lại cho nhiều ô")
+    parser.add_argument('--cost-model', choices=['cell', 'slide'], default='cell',
+                        help="đơn vị của độ dài lời giải")
+    parser.add_argument('-n', '--count', type=int, default=10, help="số map ghi ra")
+    parser.add_argument('--min-length', type=int, default=1)
+    parser.add_argument('-o', '--output', default=os.path.join('maps', 'generated'))
+    parser.add_argument('--start', type=int, help="số thứ tự map đầu tiên (mặc định số kế tiếp trong thư mục)")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    try:
+        walls = [tuple(int(x) for x in wall.split(',')) for wall in args.wall]
+    except ValueError:
+        parser.error("--wall expects ROW,COL")
+    lengths = [2] * args.cars + [3] * args.trucks
+
+    start = time.perf_counter()
+
+    def progress(done):
+        print(f"\r{done} layouts, {time.perf_counter() - start:.1f}s", end='', file=sys.stderr)
+
+    try:
+        puzzles = generate(args.width, args.height, args.target_row, lengths, walls,
+                           args.cost_model, args.count, args.min_length, args.workers, progress)
+    except ValueError as e:
+        parser.error(str(e))
+    print(file=sys.stderr)
+
+    os.makedirs(args.output, exist_ok=True)
+    number = args.start or next_map_number(args.output)
+    for distance, board in puzzles:
+        path = os.path.join(args.output, f'map{number}.json')
+        save_board(path, board, optimal_length=distance, cost_model=args.cost_model)
+        print(f"{path}: {distance} moves")
+        number += 1
+
+
+if __name__ == '__main__':
+    main()
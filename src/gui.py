@@ -1,20 +1,18 @@
 import pygame
 from pygame.locals import *
-from gameplay import go_to_level_select, go_to_main_menu, go_to_gameplay, go_to_settings, quit_game, go_back, set_state
-
-pygame.mixer.init()
+from gameplay import go_to_level_select, go_to_main_menu, go_to_gameplay, go_to_settings, quit_game, go_back, set_state, preload_level
+from assets import assets
+from render import dirty
 
 WHITE = (255, 255, 255)
 
 main_menu_img = None
 level_select_img = None
 settings_img = None
+hovered_level = None
 
-pygame.mixer.music.load("./sound/sound.mp3")
-pygame.mixer.music.play(-1)
-
-click_sound = pygame.mixer.Sound('./sound/click.wav')
-click_sound.set_volume(0.3)
+MUSIC_PATH = "./sound/sound.mp3"
+click_sound = None
 
 volume = 0.5
 volume_dragging = False
@@ -38,10 +36,22 @@ level_rects = [
 ]
 
 
+def start_music():
+    pygame.mixer.music.load(MUSIC_PATH)
+    pygame.mixer.music.play(-1)
+
+
+def load_sounds():
+    global click_sound
+    if click_sound is None:
+        click_sound = assets.sound('./sound/click.wav', 0.3)
+
+
 def main_menu(screen):
     global main_menu_img
+    load_sounds()
     if main_menu_img is None and pygame.display.get_init():
-        main_menu_img = pygame.image.load('./images/gui/mainmenu.png').convert()
+        main_menu_img = assets.image('./images/gui/mainmenu.png')
 
     if main_menu_img:
         screen.blit(main_menu_img, (0, 0))
@@ -66,9 +76,10 @@ def main_menu(screen):
 
 
 def level_select(screen):
-    global level_select_img
+    global level_select_img, hovered_level
+    load_sounds()
     if level_select_img is None and pygame.display.get_init():
-        level_select_img = pygame.image.load('./images/gui/levelselect.png').convert()
+        level_select_img = assets.image('./images/gui/levelselect.png')
 
     if level_select_img:
         screen.blit(level_select_img, (0, 0))
@@ -84,6 +95,10 @@ def level_select(screen):
         go_to_main_menu()
 
     for i, rect in enumerate(level_rects):
+        if rect.collidepoint(mouse) and hovered_level != i + 1:
+            # level đang trỏ chuột là level có khả năng được chọn tiếp
+            hovered_level = i + 1
+            preload_level(hovered_level)
         if rect.collidepoint(mouse) and click[0] == 1:
             click_sound.play()
             pygame.time.delay(150)
@@ -92,8 +107,9 @@ def level_select(screen):
 
 def settings(screen):
     global settings_img, volume, volume_dragging
+    load_sounds()
     if settings_img is None and pygame.display.get_init():
-        settings_img = pygame.image.load('./images/gui/settings.png').convert()
+        settings_img = assets.image('./images/gui/settings.png')
 
     if settings_img:
         screen.blit(settings_img, (0, 0))
@@ -122,17 +138,20 @@ def settings(screen):
         volume = max(0.0, min(1.0, volume))
         pygame.mixer.music.set_volume(volume)
 
-    font = pygame.font.SysFont("Comic Sans MS", 50)
     percent_text = f"{int(volume * 100)}%"
-    text_surface = font.render(percent_text, True, (255, 255, 255))
+    text_surface = assets.text(percent_text, (255, 255, 255), "Comic Sans MS", 50)
     screen.blit(text_surface, (320, 350))
+    bar_rect = pygame.Rect(bar_x - handle_radius, handle_y - handle_radius,
+                           bar_width + 2 * handle_radius, 2 * handle_radius)
+    dirty.region('volume', bar_rect.union(text_surface.get_rect(topleft=(320, 350))),
+                 (handle_x, percent_text))
 
     if HELP_BUTTON.collidepoint(mouse) and click[0] == 1:
         click_sound.play()
         pygame.time.delay(150)
         settings_img_help = None
         if settings_img_help is None and pygame.display.get_init():
-            settings_img_help = pygame.image.load('./images/gui/help.png').convert()
+            settings_img_help = assets.image('./images/gui/help.png')
 
         if settings_img_help:
             screen.blit(settings_img_help, (0, 0))
@@ -155,13 +174,14 @@ def settings(screen):
                         click_sound.play()
                         pygame.time.delay(150)
                         running = False
+        dirty.invalidate()  # vòng lặp con đã tự vẽ đè lên màn hình
 
     if ABOUT_US_BUTTON.collidepoint(mouse) and click[0] == 1:
         click_sound.play()
         pygame.time.delay(150)
         settings_img_about_us = None
         if settings_img_about_us is None and pygame.display.get_init():
-            settings_img_about_us = pygame.image.load('./images/gui/aboutus.png').convert()
+            settings_img_about_us = assets.image('./images/gui/aboutus.png')
 
         if settings_img_about_us:
             screen.blit(settings_img_about_us, (0, 0))
@@ -184,6 +204,7 @@ def settings(screen):
                         click_sound.play()
                         pygame.time.delay(150)
                         running = False
+        dirty.invalidate()
 
     if LEAVE_BUTTON.collidepoint(mouse) and click[0] == 1:
         click_sound.play()
@@ -0,0 +1,224 @@
+import argparse
+import time
+
+from distance_table import UNSOLVABLE, load_table
+from map_loader import load_board
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.heuristics import get_heuristic
+from solver.node_store import NodeStore
+from solver.packed import BucketQueue, COST_BITS, COST_MASK
+
+# Gợi ý nước đi: bước tối ưu tiếp theo và cost còn lại cho một Board bất kỳ của map.
+# Tra theo thứ tự, dừng ở nguồn đầu tiên trả lời được:
+#   1. bảng khoảng cách .dist (chỉ với cost model 'cell', đơn vị của bảng): O(1)
+#   2. memo state -> (bước, cost còn lại) của mọi state đã biết cost tối ưu: các state
+#      trên lời giải tối ưu của những lần tìm trước và của lời giải đưa vào learn()
+#   3. A* từ vị trí mới, dùng memo làm heuristic chính xác: gặp một state đã biết là
+#      dừng được, nên vị trí lệch vài bước khỏi lời giải đã biết chỉ tốn vài node.
+#      Tìm kiếm chạy theo từng lát thời gian (time_budget) và được tiếp tục ở lần gọi
+#      sau, nên GUI hỏi mỗi frame mà không bị khựng.
+#   python src/hints.py maps/map7.json
+
+CHECK_INTERVAL = 256  # số node mở rộng giữa hai lần xem đồng hồ
+# cost model mặc định của các thuật toán luôn cho lời giải tối ưu (xem chữ ký trong solver)
+EXACT_ALGORITHMS = {'bfs': 'cell', 'bidirectional_bfs': 'cell',
+                    'ucs': 'length', 'astar': 'length', 'idastar': 'length'}
+ANYTIME_ALGORITHMS = {'weighted_astar': 'length', 'beam_search': 'length'}
+
+
+def optimal_cost_model(algorithm, cost_model=None, summary=None):
+    """
+    Cost model mà lời giải của (algorithm, cost_model) chắc chắn tối ưu theo, None nếu
+    không chắc (dfs, anytime chưa chứng minh được tối ưu).
+    """
+    if algorithm in ('bfs', 'bidirectional_bfs'):
+        # BFS bỏ qua chi phí: tối ưu theo số bước (1 ô, hoặc 1 cú trượt với 'slide')
+        return 'slide' if cost_model == 'slide' else 'cell'
+    if algorithm in EXACT_ALGORITHMS:
+        return cost_model or EXACT_ALGORITHMS[algorithm]
+    if algorithm in ANYTIME_ALGORITHMS and summary and summary.get('suboptimality_bound') == 1.0:
+        return cost_model or ANYTIME_ALGORITHMS[algorithm]
+    return None
+
+
+class HintService:
+    """
+    Gợi ý cho một map (mọi Board có cùng các xe, tường và lối ra với board).
+      - hint(board, time_budget): (bước (vid, move), cost còn lại); (None, 0) nếu đã
+        tới đích, (None, None) nếu không giải được, None nếu chưa tìm xong trong
+        time_budget giây (gọi lại để tìm tiếp)
+      - learn(board, path, cost_model): ghi nhớ một lời giải tối ưu đã có
+    table: DistanceTable của map (tùy chọn), chỉ dùng khi cost_model là 'cell'.
+    """
+    def __init__(self, board, table=None, cost_model='cell', heuristic='pattern_db'):
+        self.bitboard = BitBoard.from_board(board)
+        self.model = get_cost_model(cost_model)
+        self.table = table if self.model.name == 'cell' else None
+        self._successors = self.model.successors(self.bitboard)
+        self._step_costs = self.model.step_costs(self.bitboard)
+        self.heuristic = heuristic
+        self._h = None  # dựng ở lần tìm kiếm đầu tiên (pattern_db tốn vài chục ms)
+        self.memo = {}  # state -> ((vid, move) hoặc None, cost còn lại hoặc None)
+        self._search_state = None  # state gốc của lần tìm đang dở
+        self._search = None
+
+    @property
+    def cost_model(self):
+        return self.model.name
+
+    def hint(self, board, time_budget=None):
+        state = self.bitboard.encode(board.vehicles)
+        known = self._lookup(state)
+        if known is not None:
+            return known
+        if self._search_state != state:
+            # vị trí khác: bỏ lần tìm dở (các kết quả đã xong vẫn nằm trong memo)
+            self._search_state = state
+            self._search = self._astar(state)
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        for _ in self._search:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+        self._search_state = self._search = None
+        return self.memo[state]
+
+    def _lookup(self, state):
+        known = self.memo.get(state)
+        if known is not None or self.table is None:
+            return known
+        d = self.table.lookup(state)
+        if d is None:
+            return None  # state không thuộc không gian của bảng
+        if d == UNSOLVABLE:
+            return None, None
+        if d == 0:
+            return None, 0
+        vid, move, _ = self.table.best_move(state)
+        return (vid, move), d
+
+    def _known_cost(self, state):
+        # cost còn lại chính xác nếu đã biết: 0 ở đích, None nếu không giải được
+        if self.bitboard.is_goal(state):
+            return 0
+        known = self._lookup(state)
+        return known[1] if known is not None else False
+
+    def learn(self, board, path, cost_model):
+        """
+        Ghi nhớ lời giải path từ board, phải tối ưu theo cost_model
+        (xem optimal_cost_model). Trả False nếu bỏ qua: khác cost model hoặc path
+        không hợp lệ.
+        """
+        if path is None or get_cost_model(cost_model).name != self.model.name:
+            return False
+        state = self.bitboard.encode(board.vehicles)
+        states, costs = [], []
+        for vid, move in path:
+            i = self.bitboard.index.get(vid)
+            child = next((c for j, m, c in self._successors(state) if j == i and m == move), None)
+            if child is None:
+                return False
+            states.append(state)
+            costs.append(self._step_costs(i, move))
+            state = child
+        if not self.bitboard.is_goal(state):
+            return False
+        self.memo[state] = (None, 0)
+        remaining = 0
+        for state, step, cost in zip(reversed(states), reversed(path), reversed(costs)):
+            remaining += cost
+            self.memo[state] = (tuple(step), remaining)
+        return True
+
+    def _astar(self, start):
+        """
+        Generator: A* từ start, yield sau mỗi CHECK_INTERVAL node mở rộng.
+        Khi kết thúc, memo có start và mọi state trên lời giải tìm được
+        (hoặc mọi state đã duyệt nếu không giải được).
+        """
+        bitboard, memo = self.bitboard, self.memo
+        if self._h is None:
+            self._h = get_heuristic(self.heuristic, bitboard, self.model)
+        successors, step_costs, h_func = self._successors, self._step_costs, self._h
+        nodes = NodeStore(bitboard)
+        frontier = BucketQueue()
+        if bitboard.is_goal(start):
+            memo[start] = (None, 0)
+            return
+        frontier.push(h_func(start) << COST_BITS, nodes.add(start))
+        visited = {}
+        expanded = 0
+        while frontier:
+            key, node = frontier.pop()
+            g = key & COST_MASK
+            state = nodes.states[node]
+            best = visited.get(state)
+            if best is not None and best <= g:
+                continue
+            visited[state] = g
+            remaining = self._known_cost(state)
+            if remaining is not False:
+                # f = g + cost còn lại chính xác và nhỏ nhất trong frontier: tối ưu
+                self._remember_path(nodes, node, remaining)
+                return
+            expanded += 1
+            if expanded % CHECK_INTERVAL == 0:
+                yield
+            for i, move, child in successors(state):
+                # h = cost còn lại chính xác với state đã biết, còn lại dùng heuristic
+                h = self._known_cost(child)
+                if h is None:
+                    continue  # không giải được từ child
+                if h is False:
+                    h = h_func(child)
+                ng = g + step_costs(i, move)
+                seen = visited.get(child)
+                if seen is not None and seen <= ng:
+                    continue
+                frontier.push((ng + h) << COST_BITS | ng, nodes.add(child, node, i, move))
+        # duyệt hết mà không tới đích: mọi state đã gặp đều không giải được
+        for state in visited:
+            memo[state] = (None, None)
+
+    def _remember_path(self, nodes, node, remaining):
+        # mọi đoạn cuối của lời giải tối ưu đều tối ưu: cộng dồn cost từ node cuối về gốc
+        ids = self.bitboard.ids
+        while nodes.parents[node] != -1:
+            parent, i, move = nodes.parents[node], nodes.vehicles[node], nodes.moves[node]
+            remaining += self._step_costs(i, move)
+            self.memo[nodes.states[parent]] = ((ids[i], move), remaining)
+            node = parent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gợi ý bước đi tối ưu tiếp theo của một map")
+    parser.add_argument('map', help="file map JSON")
+    parser.add_argument('--cost-model', default='cell', help="cost model của cost còn lại")
+    parser.add_argument('--no-table', action='store_true', help="không dùng bảng .dist, luôn tìm kiếm")
+    parser.add_argument('--follow', action='store_true',
+                        help="đi theo gợi ý tới đích, in từng bước và thời gian trả lời")
+    args = parser.parse_args(argv)
+
+    board = load_board(args.map)
+    table = None if args.no_table else load_table(args.map, build=False)
+    service = HintService(board, table, args.cost_model)
+    bitboard = service.bitboard
+    state = bitboard.encode(board.vehicles)
+    while True:
+        start = time.perf_counter()
+        move, remaining = service.hint(bitboard.to_board(state))
+        elapsed = (time.perf_counter() - start) * 1000
+        if move is None:
+            print("solved" if remaining == 0 else "no solution", f"({elapsed:.2f}ms)")
+            break
+        print(f"{move[0]} {move[1]:+d}, {remaining} left ({elapsed:.2f}ms)")
+        if not args.follow:
+            break
+        state += move[1] << bitboard.shifts[bitboard.index[move[0]]]
+    if table is not None:
+        table.close()
+
+
+if __name__ == '__main__':
+    main()
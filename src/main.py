@@ -1,52 +1,139 @@
+import time
+
+START_TIME = time.perf_counter()
+
+import argparse
+import os
+import sys
+from functools import partial
+
 import pygame
 from pygame.locals import *
-from gui import main_menu, level_select, settings
-from gameplay import gameplay, quit_game, get_state
-
-pygame.init()
-pygame.mixer.init()
 
 WIDTH, HEIGHT = 1100, 800
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Rush Hour")
-clock = pygame.time.Clock()
-
-def show_loading_screen():
-    loading_bg = pygame.image.load('./images/gui/intro.png').convert()
-    screen.blit(loading_bg, (0, 0))
-    
+
+# font và ảnh nền dùng trong GUI, nạp sẵn lúc khởi động
+GUI_FONTS = [
+    ("Comic Sans MS", 18, False), ("Comic Sans MS", 18, True), ("Comic Sans MS", 24, False),
+    ("Comic Sans MS", 45, False), ("Comic Sans MS", 50, False),
+    ("Arial", 20, False), ("Arial", 22, True), ("Arial", 28, False), ("Arial", 28, True),
+    ("Arial", 36, True),
+]
+GUI_IMAGES = ['mainmenu', 'levelselect', 'settings', 'help', 'aboutus', 'gameplaybg', 'pause']
+
+# Process giải (solve_worker) dùng 'spawn' nên import lại module này trong process con:
+# mọi khởi tạo pygame/GUI phải nằm trong main()
+
+def startup_tasks():
+    # (tên, hàm) cho Preloader: font, ảnh nền GUI, âm thanh, map + bảng khoảng cách, ảnh xe
+    import gameplay
+    import gui
+    from assets import assets
+    from distance_table import load_table
+    from map_loader import load_board
+
+    def load_level(level):
+        path = os.path.join('maps', f'map{level}.json')
+        # dựng .dist nếu chưa có (chỉ với board 6x6 cổ điển, như trong gameplay)
+        table = load_table(path, build=load_board(path).is_classic)
+        if table is not None:
+            table.close()
+        for _, path, size in gameplay.car_sprites(level):
+            assets.warm(path, size, True)
+
+    tasks = [('music', gui.start_music),
+             ('sounds', lambda: (gui.load_sounds(), gameplay.load_sounds()))]
+    tasks += [(f'font {name} {size}', partial(assets.font, name, size, bold))
+              for name, size, bold in GUI_FONTS]
+    tasks += [(f'image {name}', partial(assets.warm, f'./images/gui/{name}.png'))
+              for name in GUI_IMAGES]
+    tasks.append(('image tick', partial(assets.warm, './images/src_images/tick.png', (40, 40), True)))
+    tasks += [(f'level {level}', partial(load_level, level)) for level in gameplay.LEVELS]
+    return tasks
+
+def show_loading_screen(screen, preloader):
+    from assets import assets
+
+    loading_bg = assets.image('./images/gui/intro.png')
+    clock = pygame.time.Clock()
+
     bar_x, bar_y = WIDTH // 2 - 200, HEIGHT // 2 + 150
     bar_width, bar_height = 400, 20
     corner_radius = bar_height // 2
 
-    for i in range(101):
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+
+        progress = preloader.progress
         screen.blit(loading_bg, (0, 0))
         pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, bar_height), border_radius=corner_radius)
-        pygame.draw.rect(screen, (100, 175, 250), (bar_x, bar_y, int(i / 100 * bar_width), bar_height), border_radius=corner_radius)
-        
-        font = pygame.font.SysFont("Comic Sans MS", 30)
-        percent_text = f"{i}%"
-        text_surface = font.render(percent_text, True, (255, 255, 255))
+        pygame.draw.rect(screen, (100, 175, 250), (bar_x, bar_y, int(progress * bar_width), bar_height), border_radius=corner_radius)
+
+        percent_text = f"{int(progress * 100)}%"
+        text_surface = assets.text(percent_text, (255, 255, 255), "Comic Sans MS", 30)
         screen.blit(text_surface, (WIDTH // 2 - 25, bar_y - 40))
-        
+
         pygame.display.flip()
-        pygame.time.delay(20)
-
-show_loading_screen()
-
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            quit_game()
-
-    if get_state() == "main_menu":
-        main_menu(screen)
-    elif get_state() == "level_select":
-        level_select(screen)
-    elif get_state() == "gameplay":
-        gameplay(screen)
-    elif get_state() == "settings":
-        settings(screen)
-
-    pygame.display.flip()
-    clock.tick(60)
+        if preloader.finished:
+            return
+        clock.tick(60)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rush Hour")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="chỉ cập nhật vùng màn hình thay đổi, giảm FPS khi đứng yên")
+    parser.add_argument('--idle-fps', type=int, default=10)
+    parser.add_argument('--exit-after-startup', action='store_true',
+                        help="thoát ngay sau khi nạp xong (đo thời gian khởi động)")
+    args = parser.parse_args(argv)
+
+    from gui import main_menu, level_select, settings
+    from gameplay import gameplay, quit_game, get_state, handle_event
+    from render import dirty
+    from preload import Preloader
+
+    dirty.enabled = args.dirty_rects
+    dirty.idle_fps = args.idle_fps
+
+    pygame.init()
+    pygame.mixer.init()
+
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Rush Hour")
+    clock = pygame.time.Clock()
+
+    preloader = Preloader(startup_tasks()).start()
+    show_loading_screen(screen, preloader)
+    print(f"Startup: {time.perf_counter() - START_TIME:.2f}s "
+          f"(preload {len(preloader.tasks)} tasks in {preloader.elapsed:.2f}s)")
+    for name, error in preloader.errors:
+        print(f"  preload failed: {name}: {error}")
+    if args.exit_after_startup:
+        quit_game()
+
+    while True:
+        events = pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                quit_game()
+            elif get_state() == "gameplay":
+                handle_event(event)
+        dirty.begin(get_state(), events)
+
+        if get_state() == "main_menu":
+            main_menu(screen)
+        elif get_state() == "level_select":
+            level_select(screen)
+        elif get_state() == "gameplay":
+            gameplay(screen)
+        elif get_state() == "settings":
+            settings(screen)
+
+        dirty.present()
+        dirty.tick(clock)
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,108 @@
+import glob
+import hashlib
 import json
-from utils import Vehicle
+import os
+from utils import Board, Vehicle, EXIT_SIDES
 
-# Hàm load_map đọc JSON trả về dict id->Vehicle
+# Hàm load_board đọc JSON trả về Board (kích thước, tường, lối ra và các xe)
 # JSON format:
-# { "vehicles": [ {id, orientation, row, col, length}, ... ] }
-def load_map(path):
-    data = json.load(open(path))
+# { "width": 6, "height": 6,                       (tùy chọn, mặc định 6x6)
+#   "walls": [[row, col], ...],                    (tùy chọn, ô cố định)
+#   "exit": {"side": "right", "index": 2},         (tùy chọn, mặc định cạnh phải, hàng của X)
+#   "vehicles": [ {id, orientation, row, col, length}, ... ] }
+def load_board(path):
+    with open(path) as f:
+        data = json.load(f)
+    return board_from_dict(data)
+
+def board_from_dict(data):
     vehicles = {}
     for v in data['vehicles']:
         vehicles[v['id']] = Vehicle(
             v['id'], v['orientation'], v['row'], v['col'], v['length'])
-    return vehicles
\ No newline at end of file
+    width = data.get('width', 6)
+    height = data.get('height', width)
+    walls = [tuple(cell) for cell in data.get('walls', [])]
+    exit = data.get('exit')
+    if exit is not None:
+        exit = (exit['side'], exit['index'])
+    board = Board(vehicles, width, height, walls, exit)
+    validate_board(board)
+    return board
+
+def board_to_dict(board):
+    data = {}
+    if not board.is_classic:
+        data['width'] = board.width
+        data['height'] = board.height
+        if board.walls:
+            data['walls'] = [list(cell) for cell in sorted(board.walls)]
+        if board.exit is not None:
+            data['exit'] = {'side': board.exit[0], 'index': board.exit[1]}
+    data['vehicles'] = [v._asdict() for v in board.vehicles.values()]
+    return data
+
+def save_board(path, board, **extra):
+    # ghi theo kiểu các file map có sẵn (mỗi xe một dòng); extra: các trường thêm như optimal_length
+    data = board_to_dict(board)
+    data.update(extra)
+    vehicles = data.pop('vehicles')
+    lines = [f'  {json.dumps(key)}: {json.dumps(value)},' for key, value in data.items()]
+    lines.append('  "vehicles": [')
+    lines.append(',\n'.join(
+        '    { ' + ', '.join(f'{json.dumps(k)}: {json.dumps(val)}' for k, val in v.items()) + ' }'
+        for v in vehicles))
+    lines.append('  ]')
+    with open(path, 'w') as f:
+        f.write('{\n' + '\n'.join(lines) + '\n}\n')
+
+def validate_board(board):
+    # xe nằm trong board, không đè lên nhau hay lên tường; lối ra nằm trên một cạnh
+    if 'X' not in board.vehicles:
+        raise ValueError("map has no target vehicle 'X'")
+    taken = set(board.walls)
+    for r, c in board.walls:
+        if not (0 <= r < board.height and 0 <= c < board.width):
+            raise ValueError(f"wall ({r}, {c}) is outside the {board.width}x{board.height} board")
+    for v in board.vehicles.values():
+        if v.orientation not in ('H', 'V'):
+            raise ValueError(f"vehicle {v.id}: orientation must be 'H' or 'V'")
+        for k in range(v.length):
+            cell = (v.row + k, v.col) if v.orientation == 'V' else (v.row, v.col + k)
+            if not (0 <= cell[0] < board.height and 0 <= cell[1] < board.width):
+                raise ValueError(f"vehicle {v.id} is outside the {board.width}x{board.height} board")
+            if cell in taken:
+                raise ValueError(f"vehicle {v.id} overlaps cell {cell}")
+            taken.add(cell)
+    if board.exit is not None:
+        side, index = board.exit
+        if side not in EXIT_SIDES:
+            raise ValueError(f"exit side must be one of {', '.join(EXIT_SIDES)}")
+        limit = board.height if side in ('left', 'right') else board.width
+        if not 0 <= index < limit:
+            raise ValueError(f"exit index {index} is outside the board")
+
+# Hàm load_map đọc JSON trả về dict id->Vehicle
+def load_map(path):
+    return load_board(path).vehicles
+
+# Danh sách file map từ các nguồn trên dòng lệnh của các CLI: thư mục (lấy mọi
+# map*.json bên trong), glob hoặc đường dẫn file. ValueError nếu có nguồn không khớp
+# file nào (thay vì mỗi thuật toán báo lỗi một lần)
+def find_maps(sources):
+    paths = []
+    unmatched = []
+    for source in sources:
+        pattern = os.path.join(source, 'map*.json') if os.path.isdir(source) else source
+        matched = sorted(p for p in glob.glob(pattern) if os.path.isfile(p))
+        if not matched:
+            unmatched.append(source)
+        paths.extend(matched)
+    if unmatched:
+        raise ValueError(f"no maps matched: {', '.join(unmatched)}")
+    return paths
+
+# sha1 nội dung file map, dùng để phát hiện map đã thay đổi
+def map_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).digest()
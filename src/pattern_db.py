@@ -0,0 +1,194 @@
+import hashlib
+import heapq
+import os
+import struct
+import sys
+from array import array
+
+from map_loader import load_board
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+
+# Pattern database cho heuristic của A*/IDA*:
+# chỉ giữ X và vài xe có thể chắn hàng của X (bỏ các xe khác khỏi bàn cờ),
+# tính chi phí tối ưu tới đích của mọi vị trí của nhóm xe này bằng Dijkstra
+# ngược từ các state đích. Bài toán được nới lỏng nên giá trị luôn admissible.
+#
+# File format (little-endian), lưu theo chữ ký layout (hướng/hàng/cột/độ dài
+# của các xe, không phụ thuộc vị trí) và cost model nên dùng được cho mọi state của map:
+#   header:  magic(8) | version(u32) | số xe trong pattern(u32) | sha1 layout+model(20)
+#   pattern: các chỉ số xe (u8)
+#   values:  prod(số vị trí của từng xe) x u8, UNREACHABLE = không tới được đích
+
+MAGIC = b'RHPDB\x00\x00\x00'
+VERSION = 2
+HEADER = struct.Struct('<8sII20s')
+UNREACHABLE = 255
+# theo thư mục project (cha của src/), không theo thư mục đang chạy
+PDB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'pdb')
+MAX_PATTERN_VEHICLES = 5
+
+
+def layout_signature(bitboard, cost_model='length'):
+    layout = (bitboard.width, bitboard.height, bitboard.ids, bitboard.orientations,
+              bitboard.lengths, bitboard.lines, sorted(bitboard.wall_cells), bitboard.exit,
+              get_cost_model(cost_model).name)
+    return hashlib.sha1(repr(layout).encode()).digest()
+
+
+def pdb_path(bitboard, cost_model='length'):
+    return os.path.join(PDB_DIR, layout_signature(bitboard, cost_model).hex() + '.pdb')
+
+
+def choose_pattern(bitboard, max_vehicles=MAX_PATTERN_VEHICLES):
+    """X cùng các xe có thể chiếm một ô trên đường ra của X, ưu tiên xe gần lối ra."""
+    target = bitboard.target
+    row_mask = bitboard.ahead[0] | bitboard.ahead[-1]
+    crossing = [i for i in range(len(bitboard.ids)) if i != target and
+                any(m & row_mask for m in bitboard.masks[i])]
+    crossing.sort(key=lambda i: (bitboard.orientations[i] != bitboard.orientations[target],
+                                 -bitboard.lines[i] if bitboard.exit_forward else bitboard.lines[i]))
+    return [target] + crossing[:max_vehicles - 1]
+
+
+class PatternDatabase:
+    def __init__(self, bitboard, pattern, values, cost_model='length'):
+        self.bitboard = bitboard
+        self.cost_model = get_cost_model(cost_model)
+        self.pattern = tuple(pattern)
+        self.values = values
+        self.radices = tuple(len(bitboard.masks[i]) for i in self.pattern)
+        self._fields = tuple((bitboard.shifts[i], radix)
+                             for i, radix in zip(self.pattern, self.radices))
+
+    def index(self, state):
+        idx = 0
+        pos_mask = self.bitboard.pos_mask
+        for shift, radix in self._fields:
+            idx = idx * radix + ((state >> shift) & pos_mask)
+        return idx
+
+    def __call__(self, state):
+        return self.values[self.index(state)]
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self.pattern),
+                                layout_signature(self.bitboard, self.cost_model)))
+            f.write(bytes(self.pattern))
+            self.values.tofile(f)
+
+    @classmethod
+    def load(cls, path, bitboard, cost_model='length'):
+        with open(path, 'rb') as f:
+            magic, version, count, signature = HEADER.unpack(f.read(HEADER.size))
+            if (magic != MAGIC or version != VERSION
+                    or signature != layout_signature(bitboard, cost_model)):
+                raise ValueError(f"{path} không khớp với map hiện tại")
+            pattern = list(f.read(count))
+            values = array('B')
+            values.frombytes(f.read())
+        return cls(bitboard, pattern, values, cost_model)
+
+
+def build_pattern_db(bitboard, pattern=None, cost_model='length'):
+    """
+    Dijkstra ngược trên không gian trừu tượng chỉ gồm các xe trong pattern,
+    bước đi và chi phí theo cost_model.
+    """
+    model = get_cost_model(cost_model)
+    pattern = pattern or choose_pattern(bitboard)
+    radices = [len(bitboard.masks[i]) for i in pattern]
+    total = 1
+    for radix in radices:
+        total *= radix
+
+    def decode(idx):
+        positions = []
+        for radix in reversed(radices):
+            idx, p = divmod(idx, radix)
+            positions.append(p)
+        return positions[::-1]
+
+    def encode(positions):
+        idx = 0
+        for p, radix in zip(positions, radices):
+            idx = idx * radix + p
+        return idx
+
+    def valid(positions):
+        occ = bitboard.walls
+        for i, p in zip(pattern, positions):
+            m = bitboard.masks[i][p]
+            if occ & m:
+                return False
+            occ |= m
+        return True
+
+    values = array('B', [UNREACHABLE]) * total
+    dist = {}
+    heap = []
+    for idx in range(total):
+        positions = decode(idx)
+        if positions[0] == bitboard.goal_pos and bitboard.can_exit and valid(positions):
+            dist[idx] = 0
+            heap.append((0, idx))
+    heapq.heapify(heap)
+    while heap:
+        d, idx = heapq.heappop(heap)
+        if d > dist[idx]:
+            continue
+        values[idx] = min(d, UNREACHABLE - 1)
+        positions = decode(idx)
+        occ = 0
+        for i, p in zip(pattern, positions):
+            occ |= bitboard.masks[i][p]
+        occ |= bitboard.fixed
+        # bước đi đảo ngược được và cùng chi phí nên duyệt xuôi cũng là duyệt ngược
+        for k, (i, p) in enumerate(zip(pattern, positions)):
+            for step, need in ((-1, bitboard.before[i]), (+1, bitboard.after[i])):
+                # model 'slide' đi tiếp tới khi bị chặn, các model khác chỉ đi 1 ô
+                q = p
+                while not occ & need[q]:
+                    q += step
+                    moved = list(positions)
+                    moved[k] = q
+                    child = encode(moved)
+                    nd = d + model.move_cost(bitboard.lengths[i], abs(q - p))
+                    if child not in dist or nd < dist[child]:
+                        dist[child] = nd
+                        heapq.heappush(heap, (nd, child))
+                    if not model.slides:
+                        break
+    return PatternDatabase(bitboard, pattern, values, model)
+
+
+def load_pattern_db(bitboard, cost_model='length', build=True):
+    """Đọc PDB của layout và cost model từ đĩa; dựng và lưu lại nếu chưa có."""
+    path = pdb_path(bitboard, cost_model)
+    if os.path.exists(path):
+        try:
+            return PatternDatabase.load(path, bitboard, cost_model)
+        except ValueError:
+            pass
+    if not build:
+        return None
+    pdb = build_pattern_db(bitboard, cost_model=cost_model)
+    pdb.save(path)
+    return pdb
+
+
+if __name__ == '__main__':
+    # python src/pattern_db.py [--cost-model cell|length|slide] maps/map1.json ...
+    args = sys.argv[1:]
+    cost_model = 'length'
+    if args[:1] == ['--cost-model']:
+        cost_model, args = args[1], args[2:]
+    for map_path in args:
+        bitboard = BitBoard.from_board(load_board(map_path))
+        pdb = build_pattern_db(bitboard, cost_model=cost_model)
+        path = pdb_path(bitboard, cost_model)
+        pdb.save(path)
+        pattern = ''.join(bitboard.ids[i] for i in pdb.pattern)
+        print(f"{map_path}: pattern {pattern}, {len(pdb.values)} entries -> {path}")
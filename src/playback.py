@@ -0,0 +1,91 @@
+from utils import Vehicle
+from solver.cost_model import expand_slides
+
+# Diễn lại lời giải theo thời gian frame thay vì thread + sleep: vòng lặp chính gọi
+# update(dt) mỗi frame, vị trí phát là số thực trong [0, len(steps)] (phần lẻ là
+# tiến độ của bước đang diễn). Mọi Board trung gian được dựng sẵn một lần và không
+# bị sửa, nên frame nào cũng vẽ từ một snapshot nhất quán.
+
+SPEEDS = [0.5, 1, 2, 4, 8]
+
+
+class Playback:
+    """
+    Phát path (các cú trượt (vid, ±k)) từ board, mỗi ô mất step_time giây ở speed 1.
+      - update(dt): tiến vị trí phát theo dt giây (không chạy khi paused)
+      - step(±1): lùi/tiến một bước và dừng lại; seek(i), skip_to_end()
+      - vehicles(): [(Vehicle, row, col)] với row/col là số thực đã nội suy
+    finished = đã phát tới cuối; done = đã giữ thêm end_delay giây sau đó.
+    """
+    def __init__(self, board, path, step_time=0.3, speed=1, end_delay=0.5):
+        self.steps = expand_slides(path)
+        self.step_time = step_time
+        self.speed = speed
+        self.end_delay = end_delay
+        self.paused = False
+        self.position = 0.0
+        self._hold = 0.0
+        self.boards = [board]
+        for vid, move in self.steps:
+            v = board.vehicles[vid]
+            new_r, new_c = (v.row + move, v.col) if v.orientation == 'V' else (v.row, v.col + move)
+            vehicles = dict(board.vehicles)
+            vehicles[vid] = Vehicle(v.id, v.orientation, new_r, new_c, v.length)
+            board = board.copy(vehicles)
+            self.boards.append(board)
+
+    @property
+    def index(self):
+        return int(self.position)
+
+    @property
+    def finished(self):
+        return self.position >= len(self.steps)
+
+    @property
+    def done(self):
+        return self.finished and self._hold >= self.end_delay
+
+    @property
+    def board(self):
+        # snapshot ở bước hiện tại (chưa tính phần nội suy)
+        return self.boards[self.index]
+
+    def update(self, dt):
+        if self.paused:
+            return
+        if self.finished:
+            self._hold += dt
+            return
+        self.position = min(len(self.steps), self.position + dt * self.speed / self.step_time)
+
+    def seek(self, index):
+        self.position = float(max(0, min(len(self.steps), index)))
+        self._hold = 0.0
+
+    def step(self, delta):
+        # nhảy tới ranh giới bước kế tiếp/trước đó rồi dừng để xem từng bước
+        self.paused = True
+        if delta < 0 and self.position > self.index:
+            self.seek(self.index)
+        else:
+            self.seek(self.index + delta)
+
+    def skip_to_end(self):
+        self.seek(len(self.steps))
+        self._hold = self.end_delay
+
+    def vehicles(self):
+        board = self.board
+        fraction = self.position - self.index
+        moving = self.steps[self.index] if fraction and not self.finished else None
+        result = []
+        for v in board.vehicles.values():
+            row, col = v.row, v.col
+            if moving is not None and v.id == moving[0]:
+                if v.orientation == 'V':
+                    row += moving[1] * fraction
+                else:
+                    col += moving[1] * fraction
+            result.append((v, row, col))
+        return result
@@ -0,0 +1,57 @@
+import threading
+import time
+
+# Nạp tài nguyên lúc khởi động trong thread nền để màn hình loading vẫn vẽ được:
+# mỗi task là một cặp (tên, hàm không tham số), tiến độ = số task đã xong / tổng số.
+# Task lỗi không dừng cả quá trình, chỉ được ghi lại trong errors.
+
+
+class Preloader:
+    """
+    start() chạy các task theo thứ tự trong một thread daemon.
+    progress (0..1), current (tên task đang chạy), finished, elapsed (giây),
+    errors: [(tên task, thông báo lỗi)].
+    """
+    def __init__(self, tasks):
+        self.tasks = list(tasks)
+        self.done = 0
+        self.current = None
+        self.errors = []
+        self.start_time = None
+        self.end_time = None
+        self._thread = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='preloader', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for name, task in self.tasks:
+            self.current = name
+            try:
+                task()
+            except Exception as e:
+                self.errors.append((name, str(e)))
+            self.done += 1
+        self.current = None
+        self.end_time = time.perf_counter()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def progress(self):
+        return self.done / len(self.tasks) if self.tasks else 1.0
+
+    @property
+    def finished(self):
+        return self.end_time is not None or not self.tasks
+
+    @property
+    def elapsed(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.perf_counter()) - self.start_time
@@ -0,0 +1,337 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+
+from map_loader import find_maps, load_board
+from utils import Board, Vehicle, EXIT_SIDES
+
+# Puzzle pack: một file chứa hàng nghìn tới hàng triệu puzzle cùng kích thước board.
+# Mỗi puzzle là một bản ghi cố định độ dài nên bản ghi thứ i nằm ở
+# HEADER.size + i * record_size -> truy cập ngẫu nhiên O(1) qua mmap, không cần parse.
+#
+# File format (little-endian):
+#   header: magic(8) | version(u32) | width(u16) | height(u16) | exit side(u8) | exit index(u8)
+#           | count(u64) | record_size(u32)        (exit side: chỉ số trong EXIT_SIDES, 255 = mặc định)
+#   record: grid(width*height byte) | optimal(u16)  (OPTIMAL_UNKNOWN = chưa biết)
+#
+# grid là chuỗi ASCII theo hàng (row-major) như các database Rush Hour đã công bố
+# (vd. "IBBxooIooLDDJAALooJoKEEMFFKooMGGHHHM" cho 6x6): 'o' = ô trống, 'x' = tường,
+# mỗi xe một chữ in hoa, xe mục tiêu là 'X'.
+#   python src/puzzle_pack.py from-json maps -o maps/levels.rhp
+#   python src/puzzle_pack.py from-grids rush.txt -o rush.rhp --target A
+#   python src/puzzle_pack.py info rush.rhp 0 1000
+
+MAGIC = b'RHPACK\x00\x00'
+VERSION = 1
+HEADER = struct.Struct('<8sIHHBBQI')
+OPTIMAL = struct.Struct('<H')
+OPTIMAL_UNKNOWN = 0xFFFF
+DEFAULT_EXIT = 255
+EMPTY_CELL = 'o'
+WALL_CELL = 'x'
+
+
+def board_to_grid(board):
+    """Chuỗi grid row-major của board; id xe phải là một chữ in hoa."""
+    cells = []
+    for row in board.get_occupied():
+        for cell in row:
+            if cell is None:
+                cells.append(EMPTY_CELL)
+            elif cell == '#':
+                cells.append(WALL_CELL)
+            elif len(cell) == 1 and cell.isupper():
+                cells.append(cell)
+            else:
+                raise ValueError(f"vehicle id {cell!r} is not a single uppercase letter")
+    return ''.join(cells)
+
+
+def grid_to_board(grid, width=6, height=None, exit=None):
+    """Board từ chuỗi grid; xe X đứng đầu dict, các xe khác theo thứ tự xuất hiện."""
+    height = width if height is None else height
+    if len(grid) != width * height:
+        raise ValueError(f"grid has {len(grid)} cells, expected {width}x{height}")
+    cells = {}
+    walls = []
+    for k, ch in enumerate(grid):
+        r, c = divmod(k, width)
+        if ch in (EMPTY_CELL, '.'):
+            continue
+        if ch == WALL_CELL:
+            walls.append((r, c))
+        else:
+            cells.setdefault(ch, []).append((r, c))
+    vehicles = {}
+    for vid in sorted(cells, key=lambda vid: (vid != 'X', cells[vid][0])):
+        (row, col), length = cells[vid][0], len(cells[vid])
+        if length < 2:
+            raise ValueError(f"vehicle {vid} is a single cell, orientation is ambiguous")
+        orientation = 'H' if cells[vid][1][0] == row else 'V'
+        expected = [(row, col + k) if orientation == 'H' else (row + k, col) for k in range(length)]
+        if cells[vid] != expected:
+            raise ValueError(f"vehicle {vid} is not a straight {length}-cell block")
+        vehicles[vid] = Vehicle(vid, orientation, row, col, length)
+    if 'X' not in vehicles:
+        raise ValueError("grid has no target vehicle 'X'")
+    return Board(vehicles, width, height, walls, exit)
+
+
+class PackWriter:
+    """
+    Ghi pack theo luồng: add() từng board, count trong header được ghi lại khi close().
+    Mọi board phải cùng kích thước và lối ra (tường thì có thể khác, nằm trong grid).
+    """
+    def __init__(self, path, width=6, height=None, exit=None):
+        self.path = path
+        self.width = width
+        self.height = width if height is None else height
+        self.exit = tuple(exit) if exit is not None else None
+        self.record_size = self.width * self.height + OPTIMAL.size
+        self.count = 0
+        self._tmp_path = path + '.tmp'
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(self._header())
+
+    def _header(self):
+        side, index = (EXIT_SIDES.index(self.exit[0]), self.exit[1]) if self.exit else (DEFAULT_EXIT, 0)
+        return HEADER.pack(MAGIC, VERSION, self.width, self.height, side, index,
+                           self.count, self.record_size)
+
+    def add(self, board, optimal_length=None):
+        if (board.width, board.height, board.exit) != (self.width, self.height, self.exit):
+            raise ValueError(f"pack holds {self.width}x{self.height} boards with exit {self.exit}, "
+                             f"got {board.width}x{board.height} with exit {board.exit}")
+        self.add_grid(board_to_grid(board), optimal_length)
+
+    def add_grid(self, grid, optimal_length=None):
+        # grid đã đúng định dạng (importer kiểm tra bằng grid_to_board trước khi ghi)
+        if len(grid) != self.width * self.height:
+            raise ValueError(f"grid has {len(grid)} cells, expected {self.width}x{self.height}")
+        self._file.write(grid.encode('ascii'))
+        self._file.write(OPTIMAL.pack(OPTIMAL_UNKNOWN if optimal_length is None
+                                      else min(optimal_length, OPTIMAL_UNKNOWN - 1)))
+        self.count += 1
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(self._header())
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._file.close()
+        os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _read_header(data, path):
+    # ValueError (không phải struct.error/IndexError) với mọi header hỏng hoặc bị cắt
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path} không phải puzzle pack hợp lệ")
+    magic, version, width, height, side, index, count, record_size = HEADER.unpack_from(data)
+    if (magic != MAGIC or version != VERSION or record_size != width * height + OPTIMAL.size
+            or (side != DEFAULT_EXIT and side >= len(EXIT_SIDES))):
+        raise ValueError(f"{path} không phải puzzle pack hợp lệ")
+    exit = (EXIT_SIDES[side], index) if side != DEFAULT_EXIT else None
+    return width, height, exit, count, record_size
+
+
+class PuzzlePack:
+    """
+    Pack đã memory-map: len(pack), pack[i] -> Board, pack.optimal_length(i) -> int hoặc None.
+    Chỉ trang chứa bản ghi được đọc tới mới được nạp vào bộ nhớ.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = None
+        try:
+            # file rỗng không mmap được: kiểm tra kích thước trước khi map
+            size = os.fstat(self._file.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} không phải puzzle pack hợp lệ")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.width, self.height, self.exit, self.count, self.record_size = \
+                _read_header(self._mm, path)
+            if size < HEADER.size + self.count * self.record_size:
+                raise ValueError(f"{path} không phải puzzle pack hợp lệ")
+        except BaseException:
+            self.close()
+            raise
+        self._cells = self.width * self.height
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _offset(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(f"puzzle {i} out of range (pack has {self.count})")
+        return HEADER.size + i * self.record_size
+
+    def grid(self, i):
+        offset = self._offset(i)
+        return self._mm[offset:offset + self._cells].decode('ascii')
+
+    def optimal_length(self, i):
+        value = OPTIMAL.unpack_from(self._mm, self._offset(i) + self._cells)[0]
+        return None if value == OPTIMAL_UNKNOWN else value
+
+    def __getitem__(self, i):
+        return grid_to_board(self.grid(i), self.width, self.height, self.exit)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+
+def iter_pack(path, start=0, stop=None):
+    """
+    Đọc tuần tự (index, Board, optimal_length) của bản ghi start..stop-1 mà không mmap
+    cả file: bộ nhớ cố định dù pack lớn đến đâu, dùng cho các job chạy hàng loạt.
+    """
+    with open(path, 'rb') as f:
+        width, height, exit, count, record_size = _read_header(f.read(HEADER.size), path)
+        stop = count if stop is None else min(stop, count)
+        f.seek(HEADER.size + start * record_size)
+        cells = width * height
+        for i in range(start, stop):
+            record = f.read(record_size)
+            if len(record) < record_size:
+                raise ValueError(f"{path}: truncated at record {i}")
+            optimal = OPTIMAL.unpack_from(record, cells)[0]
+            yield (i, grid_to_board(record[:cells].decode('ascii'), width, height, exit),
+                   None if optimal == OPTIMAL_UNKNOWN else optimal)
+
+
+def import_json(map_paths, out_path):
+    """Gom các file map JSON (cùng kích thước/lối ra) vào một pack, trả số puzzle đã ghi."""
+    writer = None
+    try:
+        for map_path in map_paths:
+            board = load_board(map_path)
+            if writer is None:
+                writer = PackWriter(out_path, board.width, board.height, board.exit)
+            with open(map_path) as f:
+                optimal = json.load(f).get('optimal_length')
+            writer.add(board, optimal)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is None:
+        raise ValueError("no maps to import")
+    writer.close()
+    return writer.count
+
+
+def parse_grid_line(line, cells, target='X'):
+    """
+    (grid, optimal_length) từ một dòng text, None nếu dòng trống/chú thích.
+    Dòng có dạng "[số bước] grid [...]" như database đã công bố; xe mục tiêu target
+    được đổi tên thành X (và X, nếu có, nhận tên cũ của target).
+    """
+    tokens = line.split()
+    if not tokens or tokens[0].startswith('#'):
+        return None
+    grid = next((t for t in tokens if len(t) == cells and not t.isdigit()), None)
+    if grid is None:
+        raise ValueError(f"no {cells}-cell grid in line {line.strip()!r}")
+    if target != 'X':
+        grid = grid.translate(str.maketrans({target: 'X', 'X': target}))
+    grid = grid.replace('.', EMPTY_CELL)
+    optimal = int(tokens[0]) if tokens[0].isdigit() else None
+    return grid, optimal
+
+
+def import_grids(lines, out_path, width=6, height=None, exit=None, target='X'):
+    """Pack từ các dòng grid (file text hoặc stdin), trả số puzzle đã ghi."""
+    height = width if height is None else height
+    with PackWriter(out_path, width, height, exit) as writer:
+        for number, line in enumerate(lines, 1):
+            try:
+                parsed = parse_grid_line(line, width * height, target)
+                if parsed is None:
+                    continue
+                grid, optimal = parsed
+                grid_to_board(grid, width, height, exit)  # kiểm tra trước khi ghi
+            except ValueError as e:
+                raise ValueError(f"line {number}: {e}") from None
+            writer.add_grid(grid, optimal)
+    return writer.count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tạo và đọc puzzle pack (.rhp)")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    from_json = commands.add_parser('from-json', help="gom các map JSON vào một pack")
+    from_json.add_argument('maps', nargs='+', help="thư mục, glob hoặc file map JSON")
+    from_json.add_argument('-o', '--output', required=True)
+
+    from_grids = commands.add_parser('from-grids', help="pack từ file text mỗi dòng một grid")
+    from_grids.add_argument('input', help="file text ('-' = stdin)")
+    from_grids.add_argument('-o', '--output', required=True)
+    from_grids.add_argument('--width', type=int, default=6)
+    from_grids.add_argument('--height', type=int)
+    from_grids.add_argument('--exit', metavar='SIDE,INDEX', help="lối ra (mặc định cạnh phải, hàng của X)")
+    from_grids.add_argument('--target', default='X', help="chữ của xe mục tiêu trong file (vd. A)")
+
+    info = commands.add_parser('info', help="in header và vài puzzle của pack")
+    info.add_argument('pack')
+    info.add_argument('indices', nargs='*', type=int, help="in grid của các puzzle này")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'from-json':
+            count = import_json(find_maps(args.maps), args.output)
+            print(f"{count} puzzles -> {args.output}")
+        elif args.command == 'from-grids':
+            exit = None
+            if args.exit:
+                side, index = args.exit.split(',')
+                exit = (side, int(index))
+            if args.input == '-':
+                count = import_grids(sys.stdin, args.output, args.width, args.height, exit, args.target)
+            else:
+                with open(args.input) as f:
+                    count = import_grids(f, args.output, args.width, args.height, exit, args.target)
+            print(f"{count} puzzles -> {args.output}")
+        else:
+            with PuzzlePack(args.pack) as pack:
+                print(f"{args.pack}: {len(pack)} puzzles, {pack.width}x{pack.height}, "
+                      f"exit {pack.exit or 'default'}, {pack.record_size} bytes/record")
+                for i in args.indices:
+                    print(f"{i}: {pack.grid(i)} optimal={pack.optimal_length(i)}")
+    except (ValueError, IndexError) as e:
+        parser.error(str(e))
+
+
+if __name__ == '__main__':
+    main()
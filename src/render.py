@@ -0,0 +1,92 @@
+import time
+
+import pygame
+
+# Chế độ dirty-rect (tùy chọn) cho vòng lặp chính. Các màn hình vẫn vẽ lên screen như
+# cũ, nhưng khai báo những vùng có thể thay đổi bằng region(key, rect, signature). Vùng
+# nào có signature khác frame trước (hoặc không còn được vẽ) thì cả rect cũ lẫn rect mới
+# được đánh dấu, và present() chỉ đẩy các vùng đó lên màn hình bằng display.update(rects).
+# Phần còn lại của màn hình coi như tĩnh; đổi màn hình hay invalidate() thì flip cả màn.
+
+
+class DirtyRects:
+    """
+    begin(screen_name, events): gọi đầu mỗi frame
+    region(key, rect, signature): khai báo một vùng động của frame hiện tại
+    present(): đẩy frame lên màn hình; tick(clock): chờ tới frame sau
+    Khi không có vùng nào thay đổi và không có input trong idle_after giây, tick() chỉ
+    chạy idle_fps frame/giây nhưng thức dậy ngay khi có event.
+    Tắt (mặc định): present() = display.flip(), tick() = clock.tick(fps) như trước.
+    """
+    def __init__(self, enabled=False, fps=60, idle_fps=10, idle_after=0.5):
+        self.enabled = enabled
+        self.fps = fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.frames = 0
+        self.updates = 0  # số frame thực sự đẩy pixel lên màn hình
+        self._screen = None
+        self._full = True
+        self._rects = []
+        self._regions = {}  # key -> (rect, signature) của frame trước
+        self._seen = set()
+        self._last_activity = time.monotonic()
+
+    def begin(self, screen_name, events=()):
+        if screen_name != self._screen:
+            self._screen = screen_name
+            self.invalidate()
+        if events:
+            self._last_activity = time.monotonic()
+
+    def invalidate(self):
+        # vẽ lại toàn màn hình ở frame này (vd. sau khi một vòng lặp con tự update màn hình)
+        self._full = True
+        self._regions.clear()
+
+    def region(self, key, rect, signature):
+        if not self.enabled:
+            return
+        rect = pygame.Rect(rect)
+        self._seen.add(key)
+        old = self._regions.get(key)
+        if old is None or old[1] != signature:
+            self._rects.append(rect)
+            if old is not None and old[0] != rect:
+                self._rects.append(old[0])
+        self._regions[key] = (rect, signature)
+
+    @property
+    def idle(self):
+        return time.monotonic() - self._last_activity >= self.idle_after
+
+    def present(self):
+        self.frames += 1
+        if not self.enabled:
+            pygame.display.flip()
+            self.updates += 1
+            return
+        # vùng frame trước có mà frame này không vẽ nữa: phần nền bên dưới đã lộ ra
+        for key in [k for k in self._regions if k not in self._seen]:
+            self._rects.append(self._regions.pop(key)[0])
+        if self._full:
+            pygame.display.flip()
+        elif self._rects:
+            pygame.display.update(self._rects)
+        if self._full or self._rects:
+            self.updates += 1
+            self._last_activity = time.monotonic()
+        self._full = False
+        self._rects = []
+        self._seen = set()
+
+    def tick(self, clock):
+        if not self.enabled or not self.idle:
+            return clock.tick(self.fps)
+        event = pygame.event.wait(int(1000 / self.idle_fps))
+        if event.type != pygame.NOEVENT:
+            pygame.event.post(event)  # để vòng lặp chính xử lý ngay ở frame tiếp theo
+        return clock.tick()
+
+
+dirty = DirtyRects()
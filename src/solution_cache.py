@@ -0,0 +1,156 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from map_loader import map_digest
+
+# Cache lời giải 2 tầng: LRU trong bộ nhớ phía trước một file SQLite trên đĩa.
+# Key = (state chuẩn hoá, thuật toán, cost model, heuristic, giới hạn độ sâu của DFS);
+# value = path + Statistics summary.
+
+# theo thư mục project (cha của src/), không theo thư mục đang chạy
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            '.cache', 'solutions.sqlite3')
+SCHEMA_VERSION = 2  # PRAGMA user_version; file cũ hơn được xoá bảng và dựng lại
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    state TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    cost_model TEXT NOT NULL,
+    heuristic TEXT NOT NULL,
+    depth_limit INTEGER NOT NULL,
+    map_path TEXT,
+    map_digest TEXT,
+    path TEXT,
+    summary TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (state, algorithm, cost_model, heuristic, depth_limit)
+);
+CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used);
+CREATE INDEX IF NOT EXISTS solutions_map ON solutions (map_path);
+"""
+
+
+def canonical_state(board):
+    # Không phụ thuộc thứ tự xe trong file map: sắp xếp theo id.
+    # Board không phải 6x6 cổ điển có thêm tiền tố kích thước/tường/lối ra
+    state = ';'.join(f"{v.id}.{v.orientation}.{v.row}.{v.col}.{v.length}"
+                     for v in sorted(board.vehicles.values(), key=lambda x: x.id))
+    if board.is_classic:
+        return state
+    walls = ','.join(f"{r}.{c}" for r, c in sorted(board.walls))
+    exit = '.'.join(map(str, board.exit)) if board.exit else ''
+    return f"{board.width}x{board.height}|{walls}|{exit}|{state}"
+
+
+class SolutionCache:
+    """
+    get()/put() tra và lưu lời giải theo (board, thuật toán, cost model, heuristic,
+    limit); heuristic/limit là giá trị thuật toán thực sự dùng (None nếu thuật toán
+    không có tham số đó, xem solver.default_options).
+      - memory_size: số entry giữ trong LRU bộ nhớ
+      - max_entries: giới hạn số dòng trên đĩa, xoá entry dùng lâu nhất khi vượt
+      - invalidate_map(): xoá entry của map khi file map thay đổi
+    hits/misses đếm số lần tra trúng/trượt.
+    """
+    def __init__(self, db_path=DEFAULT_PATH, memory_size=64, max_entries=2000):
+        self.db_path = db_path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            # key cũ thiếu heuristic/giới hạn độ sâu: không biết entry được giải thế nào
+            self._db.execute("DROP TABLE IF EXISTS solutions")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _key(board, algorithm, cost_model, heuristic, limit):
+        # SQLite coi NULL trong PRIMARY KEY là khác nhau: lưu '' / -1 thay cho None
+        return (canonical_state(board), algorithm, cost_model,
+                heuristic or '', -1 if limit is None else limit)
+
+    def get(self, board, algorithm, cost_model, heuristic=None, limit=None):
+        """Trả (path, summary) nếu đã có, ngược lại None."""
+        key = self._key(board, algorithm, cost_model, heuristic, limit)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            row = self._db.execute(
+                "SELECT path, summary FROM solutions "
+                "WHERE state = ? AND algorithm = ? AND cost_model = ? "
+                "AND heuristic = ? AND depth_limit = ?", key).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE solutions SET last_used = ? "
+                "WHERE state = ? AND algorithm = ? AND cost_model = ? "
+                "AND heuristic = ? AND depth_limit = ?", (time.time(), *key))
+            self._db.commit()
+            path = json.loads(row[0])
+            value = ([tuple(step) for step in path] if path is not None else None,
+                     json.loads(row[1]))
+            self._remember(key, value)
+            self.hits += 1
+            return value
+
+    def put(self, board, algorithm, cost_model, path, summary, map_path=None,
+            heuristic=None, limit=None):
+        key = self._key(board, algorithm, cost_model, heuristic, limit)
+        digest = map_digest(map_path).hex() if map_path else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (*key, map_path, digest,
+                 json.dumps([list(step) for step in path] if path is not None else None),
+                 json.dumps(summary), time.time()))
+            self._evict()
+            self._db.commit()
+            self._remember(key, (list(path) if path is not None else None, summary))
+
+    def _evict(self):
+        count = self._db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute(
+                "DELETE FROM solutions WHERE rowid IN ("
+                "SELECT rowid FROM solutions ORDER BY last_used LIMIT ?)",
+                (count - self.max_entries,))
+
+    def invalidate_map(self, map_path):
+        """Xoá các entry của map_path được lưu với nội dung map cũ."""
+        digest = map_digest(map_path).hex()
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM solutions WHERE map_path = ? AND map_digest != ?",
+                (map_path, digest)).rowcount
+            self._db.commit()
+            if removed:
+                # không biết key nào thuộc map này trong LRU, xoá hết cho chắc
+                self._memory.clear()
+        return removed
+
+    def describe(self, hit):
+        return f"{'Hit' if hit else 'Miss'} ({self.hits} hits / {self.misses} misses)"
@@ -0,0 +1,158 @@
+import multiprocessing
+import queue
+import time
+
+from utils import Board, Vehicle
+
+# Process giải riêng cho GUI: thuật toán chạy ngoài interpreter của vòng lặp pygame
+# nên không tranh GIL với render. Process được giữ suốt phiên chơi (không tốn chi phí
+# khởi động mỗi lần bấm Solve), nhận yêu cầu qua một queue và trả kết quả qua queue khác.
+#
+# Yêu cầu:  (job_id, tên thuật toán, cost_model, layout, time_budget)
+#           layout = (width, height, walls, exit, tuple các (id, orientation, row, col, length))
+#           time_budget: giây tối đa (None = không giới hạn), dùng cho thuật toán anytime
+# Kết quả: ('progress', job_id, {'expanded_nodes': ..., 'nodes_per_second': ...})
+#          ('solution', job_id, path, summary) lời giải tốt hơn của thuật toán anytime
+#          ('done', job_id, path, summary)      summary = Statistics.get_summary()
+#          ('error', job_id, message)
+#          ('cancelled', job_id)
+
+
+def encode_board(board):
+    return (board.width, board.height, tuple(sorted(board.walls)), board.exit,
+            tuple(tuple(v) for v in board.vehicles.values()))
+
+
+def decode_board(layout):
+    width, height, walls, exit, vehicles = layout
+    return Board({v[0]: Vehicle(*v) for v in vehicles}, width, height, walls, exit)
+
+
+class _JobCancel:
+    # token hủy cho SearchControl: job bị hủy khi job_id <= giá trị dùng chung
+    def __init__(self, cancelled, job_id):
+        self.cancelled = cancelled
+        self.job_id = job_id
+
+    def is_set(self):
+        return self.cancelled.value >= self.job_id
+
+    def set(self):
+        self.cancelled.value = max(self.cancelled.value, self.job_id)
+
+
+def _serve(requests, results, cancelled, progress_interval):
+    # chạy trong process con
+    from solver import ALGORITHMS
+    from solver.search_control import SearchControl
+
+    while True:
+        request = requests.get()
+        if request is None:
+            return
+        job_id, algorithm, cost_model, layout, time_budget = request
+        token = _JobCancel(cancelled, job_id)
+        if token.is_set():
+            results.put(('cancelled', job_id))
+            continue
+
+        last_report = [0.0]
+
+        def on_progress(stats):
+            now = time.perf_counter()
+            if now - last_report[0] >= progress_interval:
+                last_report[0] = now
+                results.put(('progress', job_id, {
+                    'expanded_nodes': stats.expanded_nodes,
+                    'nodes_per_second': stats.nodes_per_second,
+                }))
+
+        def on_solution(stats):
+            results.put(('solution', job_id, list(stats.solution_path), stats.get_summary()))
+
+        try:
+            kwargs = {'cost_model': cost_model} if cost_model else {}
+            control = SearchControl(time_budget=time_budget, progress=on_progress,
+                                    cancel_event=token, on_solution=on_solution)
+            path, stats = ALGORITHMS[algorithm](decode_board(layout), control=control, **kwargs)
+            if stats.stop_reason == 'cancelled':
+                results.put(('cancelled', job_id))
+            else:
+                results.put(('done', job_id, path, stats.get_summary()))
+        except Exception as e:
+            results.put(('error', job_id, str(e)))
+
+
+class SolveWorker:
+    """
+    Phía GUI của process giải: submit() gửi yêu cầu, cancel() hủy, poll() lấy
+    các message đã về mà không chặn (gọi mỗi frame).
+    Dùng context 'spawn' để process con không kế thừa trạng thái SDL/pygame.
+    """
+    def __init__(self, progress_interval=0.1):
+        self.progress_interval = progress_interval
+        self._ctx = multiprocessing.get_context('spawn')
+        self._process = None
+        self._requests = None
+        self._results = None
+        self._cancelled = None
+        self._next_job = 0
+        self._pending = set()
+
+    def start(self):
+        if self._process is not None and self._process.is_alive():
+            return
+        self._requests = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._cancelled = self._ctx.Value('q', 0)
+        self._process = self._ctx.Process(
+            target=_serve, name='rush-hour-solver', daemon=True,
+            args=(self._requests, self._results, self._cancelled, self.progress_interval))
+        self._process.start()
+
+    def submit(self, board, algorithm, cost_model=None, time_budget=None):
+        """Gửi yêu cầu giải, trả về job_id."""
+        self.start()
+        self._next_job += 1
+        job_id = self._next_job
+        self._pending.add(job_id)
+        self._requests.put((job_id, algorithm, cost_model, encode_board(board), time_budget))
+        return job_id
+
+    def cancel(self, job_id=None):
+        """Hủy job_id và mọi job gửi trước nó (mặc định: tất cả)."""
+        if self._cancelled is None:
+            return
+        job_id = self._next_job if job_id is None else job_id
+        with self._cancelled.get_lock():
+            self._cancelled.value = max(self._cancelled.value, job_id)
+
+    def poll(self):
+        messages = []
+        if self._results is None:
+            return messages
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] not in ('progress', 'solution'):
+                self._pending.discard(message[1])
+            messages.append(message)
+        if self._pending and not self._process.is_alive():
+            # process con chết giữa chừng (vd. hết bộ nhớ): báo lỗi, lần sau tự khởi động lại
+            messages.extend(('error', job_id, 'solver process exited')
+                            for job_id in sorted(self._pending))
+            self._pending.clear()
+        return messages
+
+    def close(self):
+        if self._process is None:
+            return
+        self.cancel()
+        if self._process.is_alive():
+            self._requests.put(None)
+            self._process.join(timeout=1.0)
+            if self._process.is_alive():
+                self._process.terminate()
+        self._process = None
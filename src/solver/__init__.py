@@ -0,0 +1,34 @@
+import importlib
+import inspect
+
+# Tên hàm -> thuật toán, dùng chung cho CLI và process giải của GUI.
+# ALGORITHMS chỉ được dựng (import mọi thuật toán) khi dùng lần đầu, để các module
+# chỉ cần solver.bitboard/solver.cost_model (vd. GUI) không phải import hết solver.
+_MODULES = {
+    'bfs': 'solver.bfs',
+    'dfs': 'solver.dfs',
+    'ucs': 'solver.ucs',
+    'astar': 'solver.astar',
+    'bidirectional_bfs': 'solver.bidirectional_bfs',
+    'idastar': 'solver.idastar',
+    'weighted_astar': 'solver.weighted_astar',
+    'beam_search': 'solver.beam_search',
+}
+
+
+def default_options(name):
+    """
+    (heuristic, limit) mặc định của thuật toán name, None nếu thuật toán không có tham
+    số đó. Chỉ import module của thuật toán này; dùng làm một phần key của cache lời giải.
+    """
+    params = inspect.signature(getattr(importlib.import_module(_MODULES[name]), name)).parameters
+    return tuple(params[p].default if p in params else None for p in ('heuristic', 'limit'))
+
+
+def __getattr__(name):
+    if name == 'ALGORITHMS':
+        algorithms = {key: getattr(importlib.import_module(module), key)
+                      for key, module in _MODULES.items()}
+        globals()['ALGORITHMS'] = algorithms
+        return algorithms
+    raise AttributeError(f"module 'solver' has no attribute '{name}'")
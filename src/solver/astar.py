@@ -1,41 +1,61 @@
-import heapq
-from utils import Board
-from solver.heuristics import blocking_cars
-from itertools import count
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.packed import visited_map, BucketQueue, COST_BITS, COST_MASK
+from solver.search_control import SearchControl
+from solver.heuristics import get_heuristic
 from statistics import Statistics
 
 # A* Search: kết hợp g (cost thực) và h (heuristic)
-def astar(initial_board, stats=None):
+# heuristic: tên heuristic trong solver.heuristics.HEURISTICS
+# cost_model: tên trong solver.cost_model.COST_MODELS, heuristic admissible theo model này
+# control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ)
+# compact: visited là bảng băm phẳng (solver.packed), ít RAM hơn nhiều nhưng chậm hơn
+def astar(initial_board, stats=None, heuristic='blocking_cars', cost_model='length',
+          control=None, compact=False):
     if stats is None:
         stats = Statistics()
     
     stats.start_tracking("A*")
+    control = control or SearchControl()
+    control.start()
     
-    frontier = []
-    counter = count()
-    start_h = blocking_cars(initial_board)
-    # frontier element: (f = g+h, g, tie_id, board, path)
-    heapq.heappush(frontier, (start_h, 0, next(counter), initial_board, []))
-    visited = {}
+    frontier = BucketQueue()
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    nodes = NodeStore(bitboard)
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    h_func = get_heuristic(heuristic, bitboard, model)
+    start_h = h_func(start)
+    # frontier: node theo khóa f << COST_BITS | g, tức thứ tự (f = g+h, g, node sinh trước)
+    frontier.push(start_h << COST_BITS, nodes.add(start))
+    visited = visited_map(bitboard, compact)
     while frontier:
+        key, node = frontier.pop()
+        g = key & COST_MASK
+        state = nodes.states[node]
+        best = visited.get(state)
+        if best is not None and best <= g:
+            stats.increment_stale_nodes()
+            continue
+        visited[state] = g
         # Update statistics
         stats.increment_expanded_nodes()
-        f, g, _, board, path = heapq.heappop(frontier)
-        key = board.state_key()
-        if key in visited and visited[key] <= g:
-            continue
-        visited[key] = g
-        if board.is_goal():
+        stats.record_sizes(len(frontier) + 1, len(visited))
+        if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+            break
+        if bitboard.is_goal(state):
+            path = nodes.path(node)
             stats.stop_tracking()
             stats.set_solution(path)
             return path, stats
-        for vid, move, nb in board.successors():
-            step = nb.vehicles[vid].length
+        for i, move, child in successors(state):
+            step = step_costs(i, move)
             ng = g + step
-            h = blocking_cars(nb)
-            heapq.heappush(
-                frontier,
-                (ng + h, ng, next(counter), nb, path + [(vid, move)])
-            )
+            h = h_func(child)
+            frontier.push((ng + h) << COST_BITS | ng, nodes.add(child, node, i, move))
+            stats.increment_generated_nodes()
     stats.stop_tracking()
     return None, stats
@@ -0,0 +1,126 @@
+import heapq
+from array import array
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.search_control import SearchControl
+from solver.heuristics import get_heuristic
+from statistics import Statistics
+
+# Beam search theo từng lớp (mỗi lớp = 1 bước đi): chỉ giữ `width` node có g + h nhỏ
+# nhất của mỗi lớp. Node con chỉ được đưa vào node store/visited khi còn lại sau khi
+# cắt beam, và mỗi lượt dùng store mới, nên bộ nhớ là width x độ sâu của lượt hiện tại
+# cộng với các ứng viên của một lớp (width x số nước đi), bỏ đi sau mỗi lớp.
+# Anytime: chạy lại với width gấp đôi tới khi có một lượt không phải bỏ node nào
+# (lượt đó duyệt đầy đủ nên lời giải là tối ưu) hoặc tới max_width / hết thời gian.
+# Cận dưới của cost tối ưu: min g + h (h admissible) của các node bị bỏ khỏi beam,
+# nên suboptimality_bound = cost tốt nhất / cận dưới đó.
+
+def beam_search(initial_board, stats=None, width=64, heuristic='blocker_of_blockers',
+                cost_model='length', control=None, max_width=None):
+    """
+    width: số node giữ lại ở mỗi lớp của lượt đầu; max_width: không mở rộng beam quá
+    giá trị này (None = tới khi duyệt đầy đủ).
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ/lời giải).
+    """
+    if stats is None:
+        stats = Statistics()
+
+    stats.start_tracking("Beam")
+    control = control or SearchControl()
+    control.start()
+
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    h_func = get_heuristic(heuristic, bitboard, model)
+
+    best_path, best_cost = None, None
+    lower_bound = h_func(start)  # cận dưới của cost tối ưu, tăng dần qua các lượt
+
+    def bound():
+        if best_cost == 0:
+            return 1.0
+        return max(1.0, best_cost / lower_bound) if lower_bound else None
+
+    def tighten_bound():
+        # cận dưới vừa tăng: chỉ báo lại khi bound thay đổi
+        if stats.suboptimality_bound != bound():
+            stats.suboptimality_bound = bound()
+            control.report_solution(stats)
+
+    if bitboard.is_goal(start):
+        best_path, best_cost = [], 0
+        stats.record_solution(best_path, bound())
+
+    stopped = best_path is not None
+    while not stopped:
+        stats.iterations += 1
+        nodes = NodeStore(bitboard)
+        g_values = array('q', [0])
+        layer = [nodes.add(start)]
+        visited = {start: 0}
+        dropped_f = None  # min g + h của các node bị bỏ khỏi beam trong lượt này
+        while layer and not stopped:
+            # ứng viên của lớp sau: state -> (g + h, thứ tự sinh, g, node cha, xe, move)
+            candidates = {}
+            for node in layer:
+                state, g = nodes.states[node], g_values[node]
+                if visited[state] < g:
+                    stats.increment_stale_nodes()  # đã gặp lại với g tốt hơn
+                    continue
+                stats.increment_expanded_nodes()
+                stats.record_sizes(len(layer), len(visited))
+                if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+                    stopped = True
+                    break
+                for i, move, child in successors(state):
+                    ng = g + step_costs(i, move)
+                    h = h_func(child)
+                    if best_cost is not None and ng + h >= best_cost:
+                        continue  # không thể cho lời giải tốt hơn
+                    seen = visited.get(child)
+                    if seen is not None and seen <= ng:
+                        continue
+                    other = candidates.get(child)
+                    if other is not None and other[2] <= ng:
+                        continue
+                    stats.increment_generated_nodes()
+                    if bitboard.is_goal(child):
+                        best_path = nodes.path(node) + [(bitboard.ids[i], move)]
+                        best_cost = ng
+                        stats.record_solution(best_path, bound())
+                        control.report_solution(stats)
+                    else:
+                        candidates[child] = (ng + h, stats.generated_nodes, ng, node, i, move)
+            ranked = [(f, order, child) for child, (f, order, *_) in candidates.items()]
+            if len(ranked) > width:
+                ranked = heapq.nsmallest(width + 1, ranked)
+                dropped = ranked.pop()[0]  # f nhỏ nhất trong các node bị bỏ
+                dropped_f = dropped if dropped_f is None else min(dropped_f, dropped)
+            # chỉ node còn lại trong beam mới được lưu
+            layer = []
+            for _, _, child in ranked:
+                _, _, ng, parent, i, move = candidates[child]
+                visited[child] = ng
+                layer.append(nodes.add(child, parent, i, move))
+                g_values.append(ng)
+        if stopped:
+            break
+        if dropped_f is None:
+            # không bỏ node nào: lượt này duyệt đầy đủ
+            if best_path is not None:
+                lower_bound = best_cost
+                tighten_bound()
+            break
+        if best_cost is not None:
+            lower_bound = max(lower_bound, min(best_cost, dropped_f))
+            tighten_bound()
+        if max_width is not None and width >= max_width:
+            break
+        width = 2 * width if max_width is None else min(2 * width, max_width)
+
+    stats.stop_tracking()
+    return best_path, stats
@@ -1,33 +1,55 @@
-from collections import deque
-from utils import Board
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.packed import visited_set
+from solver.search_control import SearchControl
 from statistics import Statistics
 
-def bfs(initial_board, stats=None):
-    """Breadth-First Search: tìm đường ngắn nhất theo số bước."""
+def bfs(initial_board, stats=None, cost_model='cell', control=None, compact=False):
+    """
+    Breadth-First Search: tìm đường ngắn nhất theo số bước.
+    cost_model chỉ quyết định bước là 1 ô ('cell', 'length') hay 1 cú trượt ('slide').
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ).
+    compact: visited là bảng băm phẳng (solver.packed), ít RAM hơn nhiều nhưng chậm hơn.
+    """
     if stats is None:
         stats = Statistics()
     
     stats.start_tracking("BFS")
+    control = control or SearchControl()
+    control.start()
     
-    start_key = initial_board.state_key()
-    frontier = deque([(initial_board, [])])
-    visited = {start_key}
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    successors = get_cost_model(cost_model).successors(bitboard)
+    nodes = NodeStore(bitboard)
+    nodes.add(start)
+    # BFS lấy node ra đúng theo thứ tự thêm vào: frontier là các node [head, len(nodes))
+    head = 0
+    visited = visited_set(bitboard, compact)
+    visited.add(start)
     
-    while frontier:
+    while head < len(nodes):
         # Update statistics
         stats.increment_expanded_nodes()
+        stats.record_sizes(len(nodes) - head, len(visited))
+        if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+            break
         
-        board, path = frontier.popleft()
+        node = head
+        head += 1
+        state = nodes.states[node]
         
-        if board.is_goal():
+        if bitboard.is_goal(state):
+            path = nodes.path(node)
             stats.stop_tracking()
             stats.set_solution(path)
             return path, stats
             
-        for vid, move, nb in board.successors():
-            key = nb.state_key()
-            if key not in visited:
-                visited.add(key)
-                frontier.append((nb, path + [(vid, move)]))
+        for i, move, child in successors(state):
+            if child not in visited:
+                visited.add(child)
+                nodes.add(child, node, i, move)
+                stats.increment_generated_nodes()
     stats.stop_tracking()
     return None, stats  # không tìm được
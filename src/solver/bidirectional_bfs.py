@@ -0,0 +1,140 @@
+from collections import deque
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.search_control import SearchControl
+from statistics import Statistics
+
+SEED_CHECK_EVERY = 4096  # số state đích liệt kê giữa hai lần gọi stop()
+
+def goal_seeds(bitboard, limit=50000, stop=None):
+    """
+    Mọi state đích: X ở đích, mỗi xe khác ở mọi vị trí trên trục của nó không đè lên
+    tường hay xe khác (quay lui theo mask các ô đã chiếm).
+    Trả (seeds, complete): complete=False nếu dừng lại khi đã có `limit` state hoặc
+    khi stop() trả True (stop được gọi mỗi SEED_CHECK_EVERY state).
+    """
+    if not bitboard.can_exit:
+        return set(), True
+    target = bitboard.target
+    goal_mask = bitboard.masks[target][bitboard.goal_pos]
+    if goal_mask & bitboard.walls:
+        return set(), True
+    order = [i for i in range(len(bitboard.ids)) if i != target]
+    seeds = set()
+
+    def place(k, occ, state):
+        # False: dừng liệt kê (đủ limit hoặc stop())
+        if k == len(order):
+            seeds.add(state)
+            if len(seeds) >= limit:
+                return False
+            return not (stop is not None and len(seeds) % SEED_CHECK_EVERY == 0 and stop())
+        i = order[k]
+        shift = bitboard.shifts[i]
+        for p, mask in enumerate(bitboard.masks[i]):
+            if not mask & occ and not place(k + 1, occ | mask, state | (p << shift)):
+                return False
+        return True
+
+    complete = place(0, bitboard.walls | goal_mask, bitboard.goal_pos << bitboard.shifts[target])
+    return seeds, complete
+
+def bidirectional_bfs(initial_board, stats=None, cost_model='cell', control=None):
+    """
+    Bidirectional BFS: BFS xuôi từ board ban đầu và BFS ngược từ mọi state đích,
+    luôn mở rộng trọn một tầng ở phía có frontier nhỏ hơn cho tới khi hai phía gặp nhau.
+    Trả về đường đi ngắn nhất theo số bước như bfs (bước là 1 ô hay 1 cú trượt
+    tùy cost_model); cú trượt cũng đảo ngược được nên phía ngược dùng chung successors.
+    Nếu map có quá nhiều state đích (goal_seeds không liệt kê hết), điểm gặp đầu tiên
+    chỉ là cận trên: tiếp tục BFS xuôi tới khi độ sâu đạt độ dài tốt nhất đã có.
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ).
+    """
+    if stats is None:
+        stats = Statistics()
+
+    stats.start_tracking("Bi-BFS")
+    control = control or SearchControl()
+    control.start()
+
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    successors = get_cost_model(cost_model).successors(bitboard)
+
+    forward_nodes = NodeStore(bitboard)
+    backward_nodes = NodeStore(bitboard)
+    # visited: state -> (node, depth) cho từng phía
+    forward_seen = {start: (forward_nodes.add(start), 0)}
+    backward_seen = {}
+    seeds, complete = goal_seeds(bitboard, stop=lambda: control.should_stop(stats))
+    for seed in seeds:
+        backward_seen[seed] = (backward_nodes.add(seed), 0)
+    forward = deque([start])
+    backward = deque(backward_seen)
+    forward_depth = 0  # độ sâu của các state trong forward
+    if complete and not seeds:
+        forward.clear()  # map không có state đích nào: không giải được
+
+    best = None  # (độ dài, node xuôi, node ngược)
+    if start in backward_seen or bitboard.is_goal(start):
+        best = (0, forward_seen[start][0], backward_seen.get(start, (None,))[0])
+
+    while forward and stats.stop_reason is None:
+        if best is not None and (complete or forward_depth + 1 >= best[0]):
+            break
+        # phía ngược cạn, hoặc đã có cận trên mà tập đích chưa đủ: chỉ còn BFS xuôi,
+        # nhận state đích khi gặp
+        expand_forward = (best is not None or not backward
+                          or len(forward) <= len(backward))
+        frontier = forward if expand_forward else backward
+        seen, other_seen = ((forward_seen, backward_seen) if expand_forward
+                            else (backward_seen, forward_seen))
+        nodes = forward_nodes if expand_forward else backward_nodes
+
+        # mở rộng trọn một tầng rồi mới chọn điểm gặp tốt nhất
+        next_frontier = deque()
+        for state in frontier:
+            # Update statistics
+            stats.increment_expanded_nodes()
+            stats.record_sizes(len(forward) + len(backward) + len(next_frontier),
+                               len(forward_seen) + len(backward_seen))
+            if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+                break
+            node, depth = seen[state]
+            for i, move, child in successors(state):
+                if child in seen:
+                    continue
+                child_node = nodes.add(child, node, i, move)
+                seen[child] = (child_node, depth + 1)
+                stats.increment_generated_nodes()
+                next_frontier.append(child)
+                if expand_forward and bitboard.is_goal(child):
+                    # state đích ngoài tập seed, hoặc phía ngược tới được nó bằng đường dài hơn
+                    if best is None or depth + 1 < best[0]:
+                        best = (depth + 1, child_node, None)
+                elif child in other_seen:
+                    other_node, other_depth = other_seen[child]
+                    length = depth + 1 + other_depth
+                    if best is None or length < best[0]:
+                        best = ((length, child_node, other_node) if expand_forward
+                                else (length, other_node, child_node))
+        if expand_forward:
+            forward = next_frontier
+            forward_depth += 1
+        else:
+            backward = next_frontier
+
+    # dừng giữa tầng thì điểm gặp chưa chắc tối ưu: coi như không tìm được
+    if best is None or stats.stop_reason is not None:
+        stats.stop_tracking()
+        return None, stats
+
+    _, forward_node, backward_node = best
+    path = forward_nodes.path(forward_node)
+    if backward_node is not None:
+        # đi ngược từ điểm gặp về state đích: đảo chiều các bước của phía ngược
+        suffix = backward_nodes.path(backward_node)
+        path += [(vid, -move) for vid, move in reversed(suffix)]
+    stats.stop_tracking()
+    stats.set_solution(path)
+    return path, stats
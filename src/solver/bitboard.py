@@ -0,0 +1,174 @@
+from utils import Board, Vehicle
+
+class BitBoard:
+    """
+    Bộ máy trạng thái gọn cho các thuật toán tìm kiếm.
+    Phần tĩnh của map (id, hướng, độ dài, hàng/cột cố định của từng xe, tường, lối ra)
+    được tính một lần; mỗi trạng thái chỉ là một số nguyên:
+      - mỗi xe giữ `bits` bit lưu vị trí thay đổi được (col nếu 'H', row nếu 'V')
+      - ô (r, c) ứng với bit r*width + c trong mask chiếm chỗ
+    Board kích thước bất kỳ (width x height), tường là các bit luôn bật trong occupied(),
+    lối ra nằm trên một cạnh bất kỳ (xem utils.Board).
+    Các phương thức:
+      - encode()/decode()/to_board(): chuyển qua lại với Board/Vehicle cho GUI
+      - occupied(): bitmask các ô đã chiếm (kể cả tường)
+      - is_goal(): kiểm tra xe X đã đến lối ra chưa
+      - successors(): liệt kê (chỉ số xe, bước, state con) sau 1 bước di chuyển
+      - slide_successors(): như successors() nhưng mỗi bước trượt xe bao nhiêu ô cũng được
+    """
+    def __init__(self, vehicles, width=6, height=None, walls=(), exit=None):
+        self.width = width
+        self.height = width if height is None else height
+        self.ids = tuple(vehicles)  # giữ thứ tự dict để thứ tự sinh con như Board
+        self.index = {vid: i for i, vid in enumerate(self.ids)}
+        self.orientations = tuple(vehicles[vid].orientation for vid in self.ids)
+        self.lengths = tuple(vehicles[vid].length for vid in self.ids)
+        # hàng (xe ngang) hoặc cột (xe dọc) cố định của từng xe
+        self.lines = tuple(v.row if v.orientation == 'H' else v.col
+                           for v in (vehicles[vid] for vid in self.ids))
+        # số ô trên đường đi của từng xe
+        self.tracks = tuple(self.width if o == 'H' else self.height for o in self.orientations)
+        self.bits = max(1, (max(self.width, self.height) - 1).bit_length())
+        self.pos_mask = (1 << self.bits) - 1
+        self.shifts = tuple(i * self.bits for i in range(len(self.ids)))
+        self.state_bits = self.bits * len(self.ids)
+        # bit nằm ngoài bàn cờ, luôn bật trong occupied(): đi ra mép = đụng bit này
+        self.border = 1 << (self.width * self.height)
+        self.wall_cells = frozenset(tuple(cell) for cell in walls)
+        self.exit_spec = tuple(exit) if exit is not None else None  # như Board.exit
+        self.walls = 0
+        for r, c in self.wall_cells:
+            self.walls |= 1 << (r * self.width + c)
+        self.fixed = self.border | self.walls
+
+        # masks[i][p]: các ô xe i chiếm khi ở vị trí p
+        # before[i][p]/after[i][p]: ô phải trống để lùi/tiến 1 bước từ p
+        self.masks = []
+        self.before = []
+        self.after = []
+        for i in range(len(self.ids)):
+            track = self.tracks[i]
+            cells = [self.cell(i, k) for k in range(track)]
+            max_pos = track - self.lengths[i]
+            masks, before, after = [], [], []
+            for p in range(max_pos + 1):
+                m = 0
+                for k in range(p, p + self.lengths[i]):
+                    m |= cells[k]
+                masks.append(m)
+                before.append(cells[p - 1] if p > 0 else self.border)
+                after.append(cells[p + self.lengths[i]] if p < max_pos else self.border)
+            self.masks.append(tuple(masks))
+            self.before.append(tuple(before))
+            self.after.append(tuple(after))
+        self.masks = tuple(self.masks)
+        self.before = tuple(self.before)
+        self.after = tuple(self.after)
+        self._moves = tuple(zip(range(len(self.ids)), self.shifts,
+                                self.masks, self.before, self.after))
+
+        # Mục tiêu: xe X chạm cạnh có lối ra, trên đúng hàng/cột của lối ra.
+        # Mặc định (exit=None): cạnh phải, trên hàng của X
+        self.target = self.index['X']
+        target_length = self.lengths[self.target]
+        target_track = self.tracks[self.target]
+        self.target_line = self.lines[self.target]
+        horizontal = self.orientations[self.target] == 'H'
+        if exit is None:
+            exit = ('right' if horizontal else 'bottom', self.target_line)
+        self.exit = tuple(exit)
+        side, line = self.exit
+        # X chỉ ra được nếu nằm dọc theo lối ra; nếu không thì không có state đích
+        self.can_exit = (horizontal == (side in ('left', 'right')) and line == self.target_line)
+        self.exit_forward = side in ('right', 'bottom')
+        self.goal_pos = target_track - target_length if self.exit_forward else 0
+        # ahead[p]: các ô trên đường của X nằm giữa X (ở vị trí p) và lối ra
+        self.ahead = tuple(
+            sum(self.cell(self.target, k) for k in self.ahead_range(p))
+            for p in range(target_track - target_length + 1)
+        )
+
+    @classmethod
+    def from_board(cls, board):
+        return cls(board.vehicles, board.width, board.height, board.walls, board.exit)
+
+    def ahead_range(self, p):
+        # các vị trí trên đường của X giữa X (ở p) và lối ra
+        if self.exit_forward:
+            return range(p + self.lengths[self.target], self.tracks[self.target])
+        return range(0, p)
+
+    def cell(self, i, k):
+        # bit của ô thứ k trên đường đi của xe i
+        if self.orientations[i] == 'H':
+            return 1 << (self.lines[i] * self.width + k)
+        return 1 << (k * self.width + self.lines[i])
+
+    def encode(self, vehicles):
+        state = 0
+        for i, vid in enumerate(self.ids):
+            v = vehicles[vid]
+            pos = v.col if v.orientation == 'H' else v.row
+            state |= pos << self.shifts[i]
+        return state
+
+    def position(self, state, i):
+        return (state >> self.shifts[i]) & self.pos_mask
+
+    def decode(self, state):
+        vehicles = {}
+        for i, vid in enumerate(self.ids):
+            pos = self.position(state, i)
+            if self.orientations[i] == 'H':
+                row, col = self.lines[i], pos
+            else:
+                row, col = pos, self.lines[i]
+            vehicles[vid] = Vehicle(vid, self.orientations[i], row, col, self.lengths[i])
+        return vehicles
+
+    def to_board(self, state):
+        return Board(self.decode(state), self.width, self.height, self.wall_cells, self.exit_spec)
+
+    def occupied(self, state):
+        occ = self.fixed
+        pos_mask = self.pos_mask
+        for i, shift, masks, _, _ in self._moves:
+            occ |= masks[(state >> shift) & pos_mask]
+        return occ
+
+    def is_goal(self, state):
+        return (self.can_exit and
+                self.position(state, self.target) == self.goal_pos)
+
+    def successors(self, state):
+        # Sinh tất cả state con bằng cách di chuyển từng xe 1 bước
+        occ = self.occupied(state)
+        pos_mask = self.pos_mask
+        succs = []
+        for i, shift, _, before, after in self._moves:
+            p = (state >> shift) & pos_mask
+            # lùi: trái (xe ngang) hoặc lên (xe dọc)
+            if not occ & before[p]:
+                succs.append((i, -1, state - (1 << shift)))
+            # tiến: phải hoặc xuống
+            if not occ & after[p]:
+                succs.append((i, +1, state + (1 << shift)))
+        return succs
+
+    def slide_successors(self, state):
+        # Sinh mọi cú trượt trong 1 lượt: đi tiếp theo mỗi hướng tới khi bị chặn
+        occ = self.occupied(state)
+        pos_mask = self.pos_mask
+        succs = []
+        for i, shift, _, before, after in self._moves:
+            p = (state >> shift) & pos_mask
+            unit = 1 << shift
+            q = p
+            while not occ & before[q]:
+                q -= 1
+                succs.append((i, q - p, state - (p - q) * unit))
+            q = p
+            while not occ & after[q]:
+                q += 1
+                succs.append((i, q - p, state + (q - p) * unit))
+        return succs
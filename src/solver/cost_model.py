@@ -0,0 +1,46 @@
+class CostModel:
+    """
+    Cách tính chi phí một bước đi, dùng chung cho mọi thuật toán:
+      - slides: True nếu một bước là trượt xe bao nhiêu ô cũng được,
+        False nếu mỗi bước chỉ đi 1 ô
+      - move_cost(length, cells): chi phí khi xe dài `length` đi `cells` ô
+    BFS/DFS chỉ dùng `slides` (độ mịn của bước đi), UCS/A*/IDA* dùng cả chi phí.
+    """
+    def __init__(self, name, slides, move_cost):
+        self.name = name
+        self.slides = slides
+        self.move_cost = move_cost
+
+    def successors(self, bitboard):
+        # hàm sinh state con phù hợp với độ mịn của bước đi
+        return bitboard.slide_successors if self.slides else bitboard.successors
+
+    def step_costs(self, bitboard):
+        # chi phí theo (chỉ số xe, move) để dùng trong vòng lặp tìm kiếm
+        lengths = bitboard.lengths
+        move_cost = self.move_cost
+        return lambda i, move: move_cost(lengths[i], abs(move))
+
+COST_MODELS = {
+    # mỗi ô đi được tính 1
+    'cell': CostModel('cell', False, lambda length, cells: cells),
+    # mỗi ô đi được tính bằng độ dài xe (cách tính cũ của UCS/A*)
+    'length': CostModel('length', False, lambda length, cells: cells * length),
+    # mỗi lần trượt xe tính 1, bất kể bao nhiêu ô
+    'slide': CostModel('slide', True, lambda length, cells: 1),
+}
+
+def get_cost_model(name):
+    if isinstance(name, CostModel):
+        return name
+    if name not in COST_MODELS:
+        raise ValueError(f"Unknown cost model: {name}")
+    return COST_MODELS[name]
+
+def expand_slides(path):
+    """Tách mỗi cú trượt (vid, ±k) thành k bước 1 ô, dùng cho animation."""
+    steps = []
+    for vid, move in path:
+        step = 1 if move > 0 else -1
+        steps.extend([(vid, step)] * abs(move))
+    return steps
@@ -1,40 +1,64 @@
-from utils import Board
+from array import array
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.packed import visited_set
+from solver.search_control import SearchControl
 from statistics import Statistics
 
 # Sử dụng stack thay vì recursion để tránh RecursionError
-def dfs(initial_board, limit=50, stats=None):
-    """Depth-First Search (tham lam, không đảm bảo ngắn nhất)."""
+def dfs(initial_board, limit=50, stats=None, cost_model='cell', control=None, compact=False):
+    """
+    Depth-First Search (tham lam, không đảm bảo ngắn nhất).
+    cost_model chỉ quyết định bước là 1 ô ('cell', 'length') hay 1 cú trượt ('slide').
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ).
+    compact: visited là bảng băm phẳng (solver.packed), ít RAM hơn nhiều nhưng chậm hơn.
+    """
     if stats is None:
         stats = Statistics()
     
     stats.start_tracking("DFS")
+    control = control or SearchControl()
+    control.start()
     
-    visited = {initial_board.state_key()}
-    stack = [(initial_board, [])]
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    successors = get_cost_model(cost_model).successors(bitboard)
+    nodes = NodeStore(bitboard)
+    visited = visited_set(bitboard, compact)
+    visited.add(start)
+    # stack: node và độ sâu của nó, hai array song song
+    stack = array('q', [nodes.add(start)])
+    depths = array('I', [0])
     paths_rejected_by_limit = 0
     max_depth_reached = 0
     while stack:
         # Update statistics
         stats.increment_expanded_nodes()
+        stats.record_sizes(len(stack), len(visited))
+        if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+            break
         
-        board, path = stack.pop()
-        current_depth = len(path)
+        node, current_depth = stack.pop(), depths.pop()
+        state = nodes.states[node]
         max_depth_reached = max(max_depth_reached, current_depth)
-        if board.is_goal():
+        if bitboard.is_goal(state):
+            path = nodes.path(node)
             stats.stop_tracking()
             stats.set_solution(path)
             return path, stats
-        if len(path) >= limit:
+        if current_depth >= limit:
             paths_rejected_by_limit += 1 # path bị từ chối bởi limit
             continue  # đạt limit độ sâu
-        for vid, move, nb in board.successors():
-            key = nb.state_key()
-            if key not in visited:
-                visited.add(key)
+        for i, move, child in successors(state):
+            if child not in visited:
+                visited.add(child)
                 # đẩy vào stack theo LIFO
-                stack.append((nb, path + [(vid, move)]))
+                stack.append(nodes.add(child, node, i, move))
+                depths.append(current_depth + 1)
+                stats.increment_generated_nodes()
     # Check if we hit the limit (paths were rejected)
-    if paths_rejected_by_limit > 0 or (stats.expanded_nodes > 500 and max_depth_reached >= limit * 0.8):
+    if stats.stop_reason is None and (paths_rejected_by_limit > 0 or (stats.expanded_nodes > 500 and max_depth_reached >= limit * 0.8)):
         stats.set_limit_reached()
     stats.stop_tracking()
     return None, stats
@@ -1,16 +1,113 @@
-from utils import Board
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
 
-def blocking_cars(board: Board) -> int:
+# Registry heuristic: tên -> factory(bitboard, cost_model) trả về hàm h(state).
+# Factory cho phép heuristic chuẩn bị dữ liệu theo map một lần (vd. pattern database);
+# giá trị h phải admissible theo cost model được truyền vào.
+HEURISTICS = {}
+
+def register_heuristic(name):
+    def decorator(factory):
+        HEURISTICS[name] = factory
+        return factory
+    return decorator
+
+def get_heuristic(name, bitboard: BitBoard, cost_model='length'):
+    if name not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic: {name}")
+    return HEURISTICS[name](bitboard, get_cost_model(cost_model))
+
+def blocking_cars(bitboard: BitBoard, state: int) -> int:
     """
-    Heuristic: đếm số xe chắn trước đầu xe X trên cùng hàng.
-    Giúp A* định hướng nhanh hơn.
+    Heuristic: đếm số ô bị chiếm giữa xe X và lối ra.
+    Giúp A* định hướng nhanh hơn. Mỗi ô thuộc một xe phải đi ít nhất 1 bước
+    (xe ngang chiếm nhiều ô thì không bao giờ rời được) nên admissible với mọi cost model.
+    """
+    x_pos = bitboard.position(state, bitboard.target)
+    # mask các ô giữa đầu xe X và lối ra, AND với các ô đã chiếm
+    blocked = bitboard.occupied(state) & bitboard.ahead[x_pos]
+    return bin(blocked).count("1")
+
+def _owner(bitboard, state, cell):
+    # chỉ số xe đang chiếm ô `cell` (bitmask 1 ô), None nếu ô trống
+    for i in range(len(bitboard.ids)):
+        if bitboard.masks[i][bitboard.position(state, i)] & cell:
+            return i
+    return None
+
+def blocker_of_blockers(bitboard: BitBoard, state: int, cost_model='length') -> int:
     """
-    occ = board.get_occupied()
-    target = board.vehicles['X']
-    row = target.row
-    blocks = 0
-    # quét từ col cuối xe X +1 đến size-1
-    for c in range(target.col + target.length, board.size):
-        if occ[row][c] is not None:
-            blocks += 1
-    return blocks
\ No newline at end of file
+    Heuristic: chi phí tối thiểu để X tới đích và để từng xe chắn rời khỏi hàng của X,
+    cộng thêm chi phí của các xe chắn xe chắn (lower bound, vẫn admissible):
+      - X phải đi hết quãng còn lại
+      - mỗi xe chắn phải lên hoặc xuống đủ để rời hàng, chọn hướng rẻ hơn
+      - nếu mọi hướng của một xe chắn đều bị xe khác chặn thì phải di chuyển
+        ít nhất 1 xe trong số đó; chỉ cộng cho các xe chắn có tập xe chặn rời nhau
+        để không tính 1 xe 2 lần
+    Chi phí mỗi quãng đi tính theo cost_model (với 'slide' mỗi xe phải đi tốn 1).
+    """
+    move_cost = get_cost_model(cost_model).move_cost
+    target = bitboard.target
+    x_pos = bitboard.position(state, target)
+    line = bitboard.target_line  # hàng (hoặc cột) của X
+    h = 0
+    if x_pos != bitboard.goal_pos:
+        h = move_cost(bitboard.lengths[target], abs(bitboard.goal_pos - x_pos))
+
+    occ = bitboard.occupied(state)
+    ahead = occ & bitboard.ahead[x_pos]
+    counted = 0  # các xe chặn đã được cộng
+    for k in bitboard.ahead_range(x_pos):
+        cell = bitboard.cell(target, k)
+        if not ahead & cell:
+            continue
+        b = _owner(bitboard, state, cell)
+        if b is None:
+            continue  # tường chắn lối ra: không giải được, h nào cũng được
+        length = bitboard.lengths[b]
+        if bitboard.orientations[b] == bitboard.orientations[target]:
+            # xe cùng hướng trên đường của X không bao giờ rời được: chỉ cộng 1 bước
+            h += move_cost(length, 1)
+            continue
+        p = bitboard.position(state, b)
+        best = None
+        obstructors = 0  # bitmask các xe chặn mọi hướng
+        always_obstructed = True
+        for new_p in (line - length, line + 1):
+            if new_p < 0 or new_p + length > bitboard.tracks[b]:
+                continue
+            cost = move_cost(length, abs(new_p - p))
+            lo, hi = (new_p, p) if new_p < p else (p + length, new_p + length)
+            swept = 0
+            for q in range(lo, hi):
+                swept |= bitboard.cell(b, q)
+            if swept & bitboard.walls:
+                continue  # tường chặn hướng này vĩnh viễn
+            blocked = occ & swept
+            if blocked:
+                for q in range(lo, hi):
+                    if blocked & bitboard.cell(b, q):
+                        obstructors |= 1 << _owner(bitboard, state, bitboard.cell(b, q))
+            else:
+                always_obstructed = False
+            if best is None or cost < best:
+                best = cost
+        h += best if best is not None else move_cost(length, 1)
+        if best is not None and always_obstructed and not obstructors & counted:
+            counted |= obstructors
+            h += min(move_cost(bitboard.lengths[i], 1) for i in range(len(bitboard.ids))
+                     if obstructors >> i & 1)
+    return h
+
+@register_heuristic('blocking_cars')
+def _blocking_cars_factory(bitboard, cost_model):
+    return lambda state: blocking_cars(bitboard, state)
+
+@register_heuristic('blocker_of_blockers')
+def _blocker_of_blockers_factory(bitboard, cost_model):
+    return lambda state: blocker_of_blockers(bitboard, state, cost_model)
+
+@register_heuristic('pattern_db')
+def _pattern_db_factory(bitboard, cost_model):
+    from pattern_db import load_pattern_db
+    return load_pattern_db(bitboard, cost_model)
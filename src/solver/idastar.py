@@ -0,0 +1,158 @@
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.heuristics import get_heuristic
+from solver.search_control import SearchControl
+from statistics import Statistics
+
+_HASH_MUL = 0x9E3779B97F4A7C15
+
+class TranspositionTable:
+    """
+    Bảng băm kích thước cố định: state -> g nhỏ nhất đã gặp trong vòng lặp hiện tại.
+    Bộ nhớ bị giới hạn bởi capacity thay vì kích thước không gian tìm kiếm.
+    Khi 2 state tranh một ô, policy quyết định giữ entry nào:
+      - 'shallow': giữ entry có g nhỏ hơn (gần gốc, cắt được cây con lớn hơn)
+      - 'always': luôn ghi đè bằng entry mới
+    """
+    POLICIES = ('shallow', 'always')
+
+    def __init__(self, capacity, policy='shallow'):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy}")
+        self.capacity = capacity
+        self.policy = policy
+        self.keys = [None] * capacity
+        self.costs = [0] * capacity
+        self.iterations = [0] * capacity
+        self.hits = 0
+        self.losses = 0  # số state của vòng hiện tại bị mất do tranh ô
+
+    def _slot(self, state):
+        # lấy 32 bit cao của tích 64 bit để mọi bit của state đều ảnh hưởng
+        return (((state * _HASH_MUL) & 0xFFFFFFFFFFFFFFFF) >> 32) % self.capacity
+
+    def contains(self, state, iteration):
+        slot = self._slot(state)
+        return self.keys[slot] == state and self.iterations[slot] == iteration
+
+    def probe(self, state, g, iteration):
+        """True nếu state đã được duyệt trong vòng này với g không lớn hơn (cắt nhánh)."""
+        slot = self._slot(state)
+        key = self.keys[slot]
+        current = self.iterations[slot] == iteration
+        if current and key == state:
+            if self.costs[slot] <= g:
+                self.hits += 1
+                return True
+        elif current and key is not None:
+            # ô đang giữ state khác của vòng này: một trong hai bị mất
+            self.losses += 1
+            if self.policy == 'shallow' and self.costs[slot] <= g:
+                return False
+        self.keys[slot] = state
+        self.costs[slot] = g
+        self.iterations[slot] = iteration
+        return False
+
+# IDA*: DFS lặp sâu dần theo ngưỡng f = g + h, cùng cost model và heuristic như A*
+def idastar(initial_board, stats=None, heuristic='pattern_db',
+            tt_size=1 << 18, tt_policy='shallow', cost_model='length', control=None):
+    """
+    tt_size: số ô của transposition table (0/None để tắt); bộ nhớ của thuật toán
+    bị chặn bởi giá trị này cộng độ sâu lời giải.
+    heuristic: mặc định pattern_db; với blocking_cars IDA* mất hàng trăm giây trên map7.
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ).
+    """
+    if stats is None:
+        stats = Statistics()
+
+    stats.start_tracking("IDA*")
+    control = control or SearchControl()
+    control.start()
+
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    table = TranspositionTable(tt_size, tt_policy) if tt_size else None
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    h_func = get_heuristic(heuristic, bitboard, model)
+
+    bound = h_func(start)
+    previous_bound = -1
+    while True:
+        stats.iterations += 1
+        iteration = stats.iterations
+        next_bound = None
+        # state bị cắt bởi ngưỡng trong vòng này (để biết đã duyệt hết hay chưa)
+        cutoffs = set()
+        losses = table.losses if table is not None else 0
+        # stack element: (state, g, danh sách con, chỉ số con kế tiếp)
+        stack = [(start, 0, successors(start), 0)]
+        on_path = {start}
+        moves = []  # bước đi dẫn tới mỗi phần tử stack (trừ gốc)
+        if table is not None:
+            table.probe(start, 0, iteration)
+        stats.increment_expanded_nodes()
+        if bitboard.is_goal(start):
+            stats.stop_tracking()
+            stats.set_solution([])
+            return [], stats
+
+        while stack:
+            state, g, succs, k = stack[-1]
+            if k == len(succs):
+                stack.pop()
+                on_path.discard(state)
+                if moves:
+                    moves.pop()
+                continue
+            stack[-1] = (state, g, succs, k + 1)
+            i, move, child = succs[k]
+            if child in on_path:
+                continue  # chu trình trên đường đi hiện tại
+            stats.increment_generated_nodes()
+            ng = g + step_costs(i, move)
+            f = ng + h_func(child)
+            if f > bound:
+                if next_bound is None or f < next_bound:
+                    next_bound = f
+                if table is not None and len(cutoffs) < table.capacity:
+                    cutoffs.add(child)
+                continue
+            if table is not None and table.probe(child, ng, iteration):
+                stats.increment_stale_nodes()  # đã duyệt trong vòng này với g tốt hơn
+                continue
+
+            # Update statistics
+            stats.increment_expanded_nodes()
+            # frontier: độ sâu stack, visited: các node trên đường đi hiện tại
+            stats.record_sizes(len(stack) + 1, len(on_path) + 1)
+            if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+                break
+            if f <= previous_bound:
+                # node này đã được mở rộng ở vòng trước
+                stats.reexpanded_nodes += 1
+            moves.append((bitboard.ids[i], move))
+            if bitboard.is_goal(child):
+                path = list(moves)
+                stats.stop_tracking()
+                stats.set_solution(path)
+                return path, stats
+            stack.append((child, ng, successors(child), 0))
+            on_path.add(child)
+
+        if stats.stop_reason is not None:
+            stats.stop_tracking()
+            return None, stats
+
+        # Đã duyệt hết không gian mà không gặp đích khi tập state đã mở rộng đóng
+        # với phép đi: mọi state bị cắt đều đã được mở rộng ở nhánh khác
+        # (bảng không mất entry nào trong vòng này thì mới kiểm chứng được)
+        if next_bound is None or (
+                table is not None and table.losses == losses
+                and len(cutoffs) < table.capacity
+                and all(table.contains(state, iteration) for state in cutoffs)):
+            stats.stop_tracking()
+            return None, stats
+        previous_bound, bound = bound, next_bound
@@ -0,0 +1,41 @@
+from array import array
+
+from solver.packed import packable
+
+
+class NodeStore:
+    """
+    Kho node dùng chung cho các thuật toán tìm kiếm.
+    Mỗi node chỉ lưu state, chỉ số node cha và bước đi cuối cùng (xe, move);
+    đường đi chỉ được dựng lại bằng path() khi đã tới đích, thay vì copy
+    cả list path cho mỗi node con.
+    Các cột nằm trong array phẳng (18 byte/node); state rộng hơn 63 bit
+    (board lớn) vẫn giữ trong list.
+    """
+    def __init__(self, bitboard):
+        self.bitboard = bitboard
+        self.states = array('Q') if packable(bitboard) else []
+        self.parents = array('q')
+        self.vehicles = array('b')  # chỉ số xe trong bitboard.ids, -1 với node gốc
+        self.moves = array('b')
+
+    def __len__(self):
+        return len(self.states)
+
+    def add(self, state, parent=-1, vehicle=-1, move=0):
+        # Thêm node mới, trả về chỉ số của nó
+        self.states.append(state)
+        self.parents.append(parent)
+        self.vehicles.append(vehicle)
+        self.moves.append(move)
+        return len(self.states) - 1
+
+    def path(self, node):
+        # Lần ngược theo con trỏ cha, trả [(vid, move), ...] từ gốc tới node
+        ids = self.bitboard.ids
+        path = []
+        while self.parents[node] != -1:
+            path.append((ids[self.vehicles[node]], self.moves[node]))
+            node = self.parents[node]
+        path.reverse()
+        return path
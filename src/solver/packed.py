@@ -0,0 +1,156 @@
+import heapq
+from array import array
+
+# Lưu trữ gọn cho các thuật toán tìm kiếm: state là số nguyên (BitBoard) nên có thể
+# nằm trong buffer phẳng array('Q') thay vì mỗi state một object int của Python.
+#   - StateSet / StateMap: bảng băm open addressing (linear probing) trên array,
+#     ~16-24 byte/state so với ~70-100 byte của set/dict + object int
+#   - BucketQueue: frontier theo khóa nguyên, mỗi khóa một array node (8 byte/entry)
+#     thay cho heap các tuple (f, g, tie_id, node)
+# Chỉ dùng được khi state vừa 63 bit (xem packable()); board lớn hơn dùng set/dict.
+
+EMPTY = 0xFFFFFFFFFFFFFFFF
+_HASH_MUL = 0x9E3779B97F4A7C15
+MIN_CAPACITY = 64
+COST_BITS = 24  # g trong khóa của A*: f << COST_BITS | g
+COST_MASK = (1 << COST_BITS) - 1
+
+
+def packable(bitboard):
+    # EMPTY đánh dấu ô trống nên state phải nhỏ hơn 2^64 - 1
+    return bitboard.state_bits <= 63
+
+
+def visited_set(bitboard, compact=False):
+    return StateSet() if compact and packable(bitboard) else set()
+
+
+def visited_map(bitboard, compact=False):
+    return StateMap() if compact and packable(bitboard) else {}
+
+
+class BucketQueue:
+    """
+    Hàng đợi ưu tiên cho khóa nguyên (cost, hoặc f << COST_BITS | g của A*): mỗi khóa
+    một array('q') node, lấy ra FIFO. Node được thêm theo chỉ số tăng dần nên thứ tự
+    lấy ra giống hệt heapq trên (khóa, tie_id, node).
+    Heap chỉ chứa các khóa khác nhau đang có node, bucket rỗng bị xoá ngay.
+    """
+    def __init__(self):
+        self._buckets = {}  # khóa -> [array node, vị trí đầu]
+        self._keys = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def push(self, key, node):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [array('q'), 0]
+            heapq.heappush(self._keys, key)
+        bucket[0].append(node)
+        self._len += 1
+
+    def pop(self):
+        """(khóa, node) nhỏ nhất."""
+        key = self._keys[0]
+        bucket = self._buckets[key]
+        nodes, head = bucket
+        node = nodes[head]
+        if head + 1 == len(nodes):
+            del self._buckets[key]
+            heapq.heappop(self._keys)
+        else:
+            bucket[1] = head + 1
+        self._len -= 1
+        return key, node
+
+
+class StateSet:
+    """Tập state (int < 2^64 - 1) trên array('Q'), giãn gấp đôi khi đầy quá 2/3."""
+    def __init__(self, capacity=MIN_CAPACITY):
+        self._resize(capacity)
+        self._len = 0
+
+    def _resize(self, capacity):
+        self._keys = array('Q', [EMPTY]) * capacity
+        self._mask = capacity - 1
+        self._shift = 65 - capacity.bit_length()  # capacity là lũy thừa của 2
+        self._limit = capacity * 2 // 3
+
+    def _find(self, state):
+        # ô chứa state, hoặc ô trống đầu tiên trên dãy dò
+        keys, mask = self._keys, self._mask
+        slot = ((state * _HASH_MUL) & EMPTY) >> self._shift
+        while True:
+            key = keys[slot]
+            if key == state or key == EMPTY:
+                return slot
+            slot = (slot + 1) & mask
+
+    def _grow(self):
+        old = self._keys
+        self._resize(2 * len(old))
+        for key in old:
+            if key != EMPTY:
+                self._keys[self._find(key)] = key
+        return old
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, state):
+        return self._keys[self._find(state)] == state
+
+    def add(self, state):
+        slot = self._find(state)
+        if self._keys[slot] == state:
+            return
+        self._keys[slot] = state
+        self._len += 1
+        if self._len > self._limit:
+            self._grow()
+
+    @property
+    def nbytes(self):
+        return len(self._keys) * self._keys.itemsize
+
+
+class StateMap(StateSet):
+    """state -> số nguyên (vd. g tốt nhất), giá trị nằm trong array('q') song song với key."""
+    def _resize(self, capacity):
+        super()._resize(capacity)
+        self._values = array('q', bytes(8 * capacity))
+
+    def _grow(self):
+        old_values = self._values
+        old = super()._grow()
+        for key, value in zip(old, old_values):
+            if key != EMPTY:
+                self._values[self._find(key)] = value
+
+    def get(self, state, default=None):
+        slot = self._find(state)
+        return self._values[slot] if self._keys[slot] == state else default
+
+    def __getitem__(self, state):
+        slot = self._find(state)
+        if self._keys[slot] != state:
+            raise KeyError(state)
+        return self._values[slot]
+
+    def __setitem__(self, state, value):
+        slot = self._find(state)
+        if self._keys[slot] != state:
+            self._keys[slot] = state
+            self._values[slot] = value
+            self._len += 1
+            if self._len > self._limit:
+                self._grow()
+            return
+        self._values[slot] = value
+
+    @property
+    def nbytes(self):
+        return super().nbytes + len(self._values) * self._values.itemsize
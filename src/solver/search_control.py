@@ -0,0 +1,61 @@
+import threading
+import time
+
+class SearchControl:
+    """
+    Điều khiển một lần tìm kiếm từ bên ngoài:
+      - cancel(): token hủy, an toàn khi gọi từ thread khác
+      - time_budget: số giây tối đa, node_budget: số node mở rộng tối đa
+      - progress(stats): callback nhận Statistics với số liệu đang chạy
+      - on_solution(stats): thuật toán anytime vừa tìm được lời giải tốt hơn
+        (stats.solution_path, stats.suboptimality_bound), gọi ngay, không theo nhịp check
+    Thuật toán chỉ gọi should_stop() khi stats.expanded_nodes >= next_check, tức
+    mỗi check_every node một lần, nên chi phí kiểm tra gần như bằng 0.
+    Khi dừng sớm, stats.stop_reason là 'cancelled', 'time_budget' hoặc 'node_budget'.
+    """
+    def __init__(self, time_budget=None, node_budget=None, progress=None,
+                 check_every=1024, cancel_event=None, on_solution=None):
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.progress = progress
+        self.on_solution = on_solution
+        self.check_every = check_every
+        self.cancel_event = cancel_event or threading.Event()
+        self.start()
+
+    def start(self):
+        # gọi khi bắt đầu tìm kiếm (control có thể dùng lại cho nhiều lần tìm)
+        self.next_check = self.check_every
+        if self.node_budget is not None:
+            self.next_check = min(self.next_check, self.node_budget)
+
+    def report_solution(self, stats):
+        if self.on_solution is not None:
+            self.on_solution(stats)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def should_stop(self, stats):
+        self.next_check = stats.expanded_nodes + self.check_every
+        if self.node_budget is not None:
+            # không kiểm tra thưa hơn ngân sách node
+            self.next_check = min(self.next_check, self.node_budget)
+        # cập nhật thời gian đang chạy để progress đọc được nodes/sec
+        stats.search_time_ns = time.perf_counter_ns() - stats.start_time
+        stats.search_time = stats.search_time_ns / 1e9
+        stats.sample_memory()
+        if self.progress is not None:
+            self.progress(stats)
+
+        if self.cancelled:
+            stats.stop_reason = 'cancelled'
+        elif self.node_budget is not None and stats.expanded_nodes >= self.node_budget:
+            stats.stop_reason = 'node_budget'
+        elif self.time_budget is not None and stats.search_time >= self.time_budget:
+            stats.stop_reason = 'time_budget'
+        return stats.stop_reason is not None
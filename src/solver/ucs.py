@@ -1,37 +1,53 @@
-import heapq
-from utils import Board
-from itertools import count
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.packed import visited_map, BucketQueue
+from solver.search_control import SearchControl
 from statistics import Statistics
 
-# Uniform-Cost Search: tìm đường chi phí nhỏ nhất (cost = length của xe)
-def ucs(initial_board, stats=None):
+# Uniform-Cost Search: tìm đường chi phí nhỏ nhất theo cost_model
+# (mặc định 'length': mỗi ô đi được tốn length của xe)
+# control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ)
+# compact: visited là bảng băm phẳng (solver.packed), ít RAM hơn nhiều nhưng chậm hơn
+def ucs(initial_board, stats=None, cost_model='length', control=None, compact=False):
     if stats is None:
         stats = Statistics()
     
     stats.start_tracking("UCS")
+    control = control or SearchControl()
+    control.start()
     
-    frontier = []
-    counter = count()  # để tie-breaker nếu cost bằng nhau
-    # frontier element: (total_cost, tie_id, board, path)
-    heapq.heappush(frontier, (0, next(counter), initial_board, []))
-    visited = {}
+    frontier = BucketQueue()
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    nodes = NodeStore(bitboard)
+    # frontier: node theo total_cost, cùng cost thì node sinh trước ra trước
+    frontier.push(0, nodes.add(start))
+    visited = visited_map(bitboard, compact)
     while frontier:
+        cost, node = frontier.pop()
+        state = nodes.states[node]
+        best = visited.get(state)
+        if best is not None and best <= cost:
+            stats.increment_stale_nodes()
+            continue
+        visited[state] = cost
         # Update statistics
         stats.increment_expanded_nodes()
-        cost, _, board, path = heapq.heappop(frontier)
-        key = board.state_key()
-        if key in visited and visited[key] <= cost:
-            continue
-        visited[key] = cost
-        if board.is_goal():
+        stats.record_sizes(len(frontier) + 1, len(visited))
+        if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+            break
+        if bitboard.is_goal(state):
+            path = nodes.path(node)
             stats.stop_tracking()
             stats.set_solution(path)
             return path, stats
-        for vid, move, nb in board.successors():
-            step_cost = nb.vehicles[vid].length
-            heapq.heappush(
-                frontier,
-                (cost + step_cost, next(counter), nb, path + [(vid, move)])
-            )
+        for i, move, child in successors(state):
+            step_cost = step_costs(i, move)
+            frontier.push(cost + step_cost, nodes.add(child, node, i, move))
+            stats.increment_generated_nodes()
     stats.stop_tracking()
     return None, stats
@@ -0,0 +1,91 @@
+import heapq
+from array import array
+from solver.bitboard import BitBoard
+from solver.cost_model import get_cost_model
+from solver.node_store import NodeStore
+from solver.search_control import SearchControl
+from solver.heuristics import get_heuristic
+from statistics import Statistics
+
+# Anytime Weighted A*: chạy A* với f = g + w*h cho từng w giảm dần trong `weights`.
+# Với h admissible, lời giải của vòng trọng số w có cost <= w x tối ưu; mỗi vòng sau
+# cắt mọi node có g + h >= cost tốt nhất nên chỉ có thể tìm lời giải tốt hơn.
+# Vòng nào duyệt hết mà không tìm được lời giải tốt hơn thì lời giải hiện tại là tối ưu.
+# Mỗi lời giải mới được ghi vào stats (record_solution) và báo qua
+# control.report_solution() ngay lập tức; hết thời gian/node thì trả lời giải tốt nhất.
+
+WEIGHTS = (3.0, 2.0, 1.5, 1.25, 1.0)
+
+
+def weighted_astar(initial_board, stats=None, heuristic='blocker_of_blockers', cost_model='length',
+                   control=None, weights=WEIGHTS):
+    """
+    weights: dãy trọng số giảm dần, nên kết thúc bằng 1.0 để chứng minh được tối ưu.
+    control: SearchControl (hủy, giới hạn thời gian/số node, callback tiến độ/lời giải).
+    """
+    if stats is None:
+        stats = Statistics()
+
+    stats.start_tracking("Anytime WA*")
+    control = control or SearchControl()
+    control.start()
+
+    bitboard = BitBoard.from_board(initial_board)
+    start = bitboard.encode(initial_board.vehicles)
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    h_func = get_heuristic(heuristic, bitboard, model)
+
+    best_path, best_cost, bound = None, None, None
+    stopped = False
+    for weight in weights:
+        stats.iterations += 1
+        nodes = NodeStore(bitboard)
+        # frontier element: (g + w*h, -g, node): cùng f thì ưu tiên node sâu hơn
+        frontier = [(weight * h_func(start), 0, nodes.add(start))]
+        g_values = array('q', [0])  # g của từng node, song song với nodes
+        visited = {}
+        found = False
+        while frontier:
+            _, _, node = heapq.heappop(frontier)
+            state, g = nodes.states[node], g_values[node]
+            best = visited.get(state)
+            if best is not None and best <= g:
+                stats.increment_stale_nodes()
+                continue
+            visited[state] = g
+            stats.increment_expanded_nodes()
+            stats.record_sizes(len(frontier) + 1, len(visited))
+            if stats.expanded_nodes >= control.next_check and control.should_stop(stats):
+                stopped = True
+                break
+            if bitboard.is_goal(state):
+                # cắt tỉa theo best_cost nên lời giải này chắc chắn tốt hơn
+                best_path, best_cost = nodes.path(node), g
+                bound = weight if bound is None else min(bound, weight)
+                stats.record_solution(best_path, bound)
+                control.report_solution(stats)
+                found = True
+                break
+            for i, move, child in successors(state):
+                ng = g + step_costs(i, move)
+                h = h_func(child)
+                if best_cost is not None and ng + h >= best_cost:
+                    continue  # không thể cho lời giải tốt hơn
+                heapq.heappush(frontier, (ng + weight * h, -ng, nodes.add(child, node, i, move)))
+                g_values.append(ng)
+                stats.increment_generated_nodes()
+        if stopped:
+            break
+        if not found:
+            # duyệt hết mà không có lời giải tốt hơn: lời giải hiện tại (nếu có) là tối ưu
+            if best_path is not None and bound != 1.0:
+                stats.suboptimality_bound = bound = 1.0
+                control.report_solution(stats)
+            break
+        if weight <= 1.0:
+            break  # A* thường: lời giải đã tối ưu
+
+    stats.stop_tracking()
+    return best_path, stats
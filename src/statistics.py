@@ -1,11 +1,57 @@
+import ctypes
 import time
-import psutil
+import tracemalloc
 import os
+import sys
 from typing import Dict, Any, Optional
 
 
+def _make_rss_reader():
+    # Hàm đọc RSS hiện tại của process (bytes), None nếu nền tảng không đo được
+    if os.path.exists('/proc/self/statm'):
+        def read():
+            with open('/proc/self/statm', 'rb') as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE
+        return read
+    try:
+        import psutil  # macOS/Windows
+    except ImportError:
+        return None
+    process = psutil.Process(os.getpid())
+    return lambda: process.memory_info().rss
+
+
+def _make_heap_trim():
+    # glibc giữ lại vùng heap đã free (của lần giải trước) trong RSS; malloc_trim trả
+    # chúng về OS để mức tăng RSS của lần giải mới không bị che mất
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return ctypes.CDLL('libc.so.6').malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+_read_rss = _make_rss_reader()
+_trim_heap = _make_heap_trim()
+
+
 class Statistics: 
-    def __init__(self):
+    """
+    Số liệu của một lần tìm kiếm. Các bộ đếm và thời gian (perf_counter_ns) luôn bật
+    vì chi phí rất nhỏ. Peak memory:
+      - trace_memory=True: peak allocation đo bằng tracemalloc (chính xác nhưng làm
+        tìm kiếm chậm đi vài lần, dùng khi benchmark/phân tích)
+      - mặc định: RSS hiện tại lấy mẫu lúc bắt đầu, mỗi lần SearchControl kiểm tra
+        (sample_memory) và lúc kết thúc; peak = mẫu lớn nhất trừ mẫu đầu. Không dùng
+        ru_maxrss vì đó là high-water mark của cả đời process (worker chạy nhiều lần
+        giải sẽ báo 0); trên Linux heap đã free được trả về OS trước mỗi lần đo.
+        Không đo được RSS, hoặc mức tăng nhỏ hơn một page (dưới độ phân giải của
+        RSS), thì memory_usage/peak_memory là None thay vì 0.
+    """
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
         self.reset()
     
     def reset(self):
@@ -13,54 +59,164 @@ class Statistics:
         self.start_time = 0.0
         self.end_time = 0.0
         self.search_time = 0.0
+        self.search_time_ns = 0
         self.expanded_nodes = 0
+        self.generated_nodes = 0  # số node con được sinh ra và đưa vào frontier
+        self.stale_nodes = 0  # node lấy ra khỏi frontier nhưng đã được duyệt với cost tốt hơn
+        self.max_frontier = 0  # kích thước frontier lớn nhất
+        self.max_visited = 0  # kích thước tập visited lớn nhất
         self.memory_usage = 0.0  # in MB
+        self.peak_memory = 0  # in bytes
+        self.memory_source = ('tracemalloc' if self.trace_memory
+                              else 'rss' if _read_rss is not None else 'unavailable')
+        self._rss_peak = 0
         self.initial_memory = 0.0
         self.solution_length = 0
         self.solution_found = False
         self.solution_path = []
         self.hit_limit = False  # track dfs limit
+        self.iterations = 0  # IDA*: số vòng tăng ngưỡng
+        self.reexpanded_nodes = 0  # IDA*: node đã mở rộng ở vòng trước
+        self.stop_reason = None  # SearchControl: 'cancelled', 'time_budget', 'node_budget'
+        # thuật toán anytime: cost lời giải <= bound x tối ưu (1.0 = tối ưu, None = không biết)
+        self.suboptimality_bound = None
+        self.solutions_found = 0  # số lần tìm được lời giải tốt hơn
+        self.first_solution_time = 0.0  # giây từ lúc bắt đầu tới lời giải đầu tiên
+        self._started_tracing = False
         
+    @classmethod
+    def from_summary(cls, summary: Dict[str, Any], path: Optional[list] = None):
+        # Dựng lại Statistics từ get_summary() (vd. khi lấy từ cache lời giải)
+        stats = cls()
+        stats.algorithm_name = summary.get('algorithm', '')
+        stats.search_time = summary.get('search_time', 0.0)
+        stats.search_time_ns = int(stats.search_time * 1e9)
+        stats.memory_usage = summary.get('memory_usage')
+        stats.peak_memory = summary.get('peak_memory', 0)
+        stats.memory_source = summary.get('memory_source', 'rss')
+        stats.expanded_nodes = summary.get('expanded_nodes', 0)
+        stats.generated_nodes = summary.get('generated_nodes', 0)
+        stats.stale_nodes = summary.get('stale_nodes', 0)
+        stats.max_frontier = summary.get('max_frontier', 0)
+        stats.max_visited = summary.get('max_visited', 0)
+        stats.solution_found = summary.get('solution_found', False)
+        stats.solution_length = summary.get('solution_length', 0)
+        stats.hit_limit = summary.get('hit_limit', False)
+        stats.iterations = summary.get('iterations', 0)
+        stats.reexpanded_nodes = summary.get('reexpanded_nodes', 0)
+        stats.stop_reason = summary.get('stop_reason')
+        stats.suboptimality_bound = summary.get('suboptimality_bound')
+        stats.solutions_found = summary.get('solutions_found', 0)
+        stats.first_solution_time = summary.get('first_solution_time', 0.0)
+        stats.solution_path = path or []
+        return stats
+
     def start_tracking(self, algorithm_name: str):
         self.reset()
         self.algorithm_name = algorithm_name
-        self.start_time = time.time()
-        self.initial_memory = self._get_memory_usage()
+        if self.trace_memory:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._started_tracing = True
+            self.initial_memory = tracemalloc.get_traced_memory()[0]
+        elif _read_rss is not None:
+            if _trim_heap is not None:
+                _trim_heap(0)
+            self.initial_memory = self._rss_peak = _read_rss()
+        self.start_time = time.perf_counter_ns()
         
     def stop_tracking(self):
-        self.end_time = time.time()
-        self.search_time = self.end_time - self.start_time
+        self.end_time = time.perf_counter_ns()
+        self.search_time_ns = self.end_time - self.start_time
+        self.search_time = self.search_time_ns / 1e9
+        if self.trace_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+        elif _read_rss is not None:
+            self.sample_memory()
+            peak = self._rss_peak
+            if peak - self.initial_memory < _PAGE_SIZE:
+                # tăng chưa tới một page: không phân biệt được với 0, không báo 0
+                self.peak_memory = self.memory_usage = None
+                return
+        else:
+            self.peak_memory = self.memory_usage = None  # không đo được, không báo 0
+            return
         # Ensure memory usage is never negative
-        memory_diff = self._get_memory_usage() - self.initial_memory
-        self.memory_usage = max(0.0, memory_diff)
+        self.peak_memory = max(0, int(peak - self.initial_memory))
+        self.memory_usage = self.peak_memory / 1024 / 1024
+
+    def sample_memory(self):
+        # lấy mẫu RSS hiện tại (chế độ mặc định), gọi thưa: mỗi lần SearchControl kiểm tra
+        if not self.trace_memory and _read_rss is not None:
+            rss = _read_rss()
+            if rss > self._rss_peak:
+                self._rss_peak = rss
         
     def increment_expanded_nodes(self): 
         self.expanded_nodes += 1
+
+    def increment_generated_nodes(self):
+        self.generated_nodes += 1
+
+    def increment_stale_nodes(self):
+        self.stale_nodes += 1
+
+    def record_sizes(self, frontier: int, visited: int):
+        # gọi mỗi lần mở rộng node để giữ high-water mark của frontier/visited
+        if frontier > self.max_frontier:
+            self.max_frontier = frontier
+        if visited > self.max_visited:
+            self.max_visited = visited
+
+    @property
+    def nodes_per_second(self) -> float:
+        if not self.search_time_ns:
+            return 0.0
+        return self.expanded_nodes * 1e9 / self.search_time_ns
         
     def set_solution(self, path: list):
         self.solution_found = True
         self.solution_path = path
         self.solution_length = len(path)
 
+    def record_solution(self, path: list, bound: Optional[float] = None):
+        # lời giải tốt hơn của thuật toán anytime, cùng cận trên tỉ lệ cost/tối ưu
+        if not self.solution_found:
+            self.first_solution_time = (time.perf_counter_ns() - self.start_time) / 1e9
+        self.set_solution(path)
+        self.suboptimality_bound = bound
+        self.solutions_found += 1
+
     def set_limit_reached(self):
         self.hit_limit = True
         
-    def _get_memory_usage(self) -> float:
-        try:
-            process = psutil.Process(os.getpid())
-            return process.memory_info().rss / 1024 / 1024  # Convert bytes to MB
-        except:
-            return 0.0
-            
     def get_summary(self) -> Dict[str, Any]:
         return {
             'algorithm': self.algorithm_name,
             'search_time': self.search_time,
             'memory_usage': self.memory_usage,
+            'peak_memory': self.peak_memory,
+            'memory_source': self.memory_source,
             'expanded_nodes': self.expanded_nodes,
+            'generated_nodes': self.generated_nodes,
+            'stale_nodes': self.stale_nodes,
+            'max_frontier': self.max_frontier,
+            'max_visited': self.max_visited,
+            'nodes_per_second': self.nodes_per_second,
             'solution_found': self.solution_found,
             'solution_length': self.solution_length,
             'hit_limit': self.hit_limit,
+            'iterations': self.iterations,
+            'reexpanded_nodes': self.reexpanded_nodes,
+            'stop_reason': self.stop_reason,
+            'suboptimality_bound': self.suboptimality_bound,
+            'solutions_found': self.solutions_found,
+            'first_solution_time': self.first_solution_time,
         }
         
     def format_time(self, seconds: float) -> str:
@@ -71,17 +227,37 @@ class Statistics:
         else:
             return f"{seconds:.3f}s"
             
-    def format_memory(self, mb: float) -> str:
+    def format_memory(self, mb: Optional[float]) -> str:
+        if mb is None:
+            return "n/a"
         # Ensure memory value is not negative
         mb = max(0.0, mb)
         if mb < 1.0:
             return f"{mb * 1024:.1f}KB"
         else:
             return f"{mb:.2f}MB"
+
+    def format_rate(self, per_second: float) -> str:
+        if per_second >= 1_000_000:
+            return f"{per_second / 1_000_000:.2f}M nodes/s"
+        elif per_second >= 1000:
+            return f"{per_second / 1000:.1f}k nodes/s"
+        return f"{per_second:.0f} nodes/s"
             
+    def format_solution_length(self) -> str:
+        if self.suboptimality_bound is None or not self.solution_found:
+            return str(self.solution_length)
+        if self.suboptimality_bound <= 1.0:
+            return f"{self.solution_length} (optimal)"
+        return f"{self.solution_length} (<= {self.suboptimality_bound:.2f}x optimal)"
+
     def get_formatted_stats(self) -> Dict[str, str]:
         if self.solution_found:
             status = 'Solved'
+        elif self.stop_reason == 'cancelled':
+            status = 'Cancelled'
+        elif self.stop_reason is not None:
+            status = 'Out of Budget'
         elif self.hit_limit:
             status = 'Hit Limit'
         else:
@@ -92,6 +268,11 @@ class Statistics:
             'time': self.format_time(self.search_time),
             'memory': self.format_memory(self.memory_usage),
             'expanded_nodes': str(self.expanded_nodes),
-            'solution_length': str(self.solution_length),
+            'generated_nodes': str(self.generated_nodes),
+            'stale_nodes': str(self.stale_nodes),
+            'max_frontier': str(self.max_frontier),
+            'max_visited': str(self.max_visited),
+            'nodes_per_second': self.format_rate(self.nodes_per_second),
+            'solution_length': self.format_solution_length(),
             'status': status
         } 
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_solve import run_job
+from map_loader import board_from_dict
+from puzzle_pack import grid_to_board, iter_pack, parse_grid_line
+from solve_worker import encode_board
+from solver import ALGORITHMS
+from solver.cost_model import COST_MODELS
+
+# Giải một bộ puzzle rất lớn theo luồng, bộ nhớ không tăng theo số puzzle:
+#   - đọc lười từng puzzle từ pack .rhp, file text hoặc stdin (generator)
+#   - tối đa --window puzzle vừa đang giải vừa chờ ghi cùng lúc (backpressure:
+#     không đọc thêm khi cửa sổ đầy)
+#   - mỗi kết quả là một dòng JSONL, ghi theo đúng thứ tự đầu vào ngay khi nó và
+#     mọi puzzle trước nó đã xong, flush từng dòng
+#   - --resume: đọc file kết quả, bỏ dòng ghi dở lúc crash và chạy tiếp từ sau
+#     bản ghi cuối cùng đã hoàn tất
+# Dòng text đầu vào: object JSON như file map (thêm "id" tùy chọn) hoặc dòng grid
+# "[số bước] grid ..." như puzzle_pack.
+#   python src/stream_solve.py rush.rhp -a astar -o results.jsonl --timeout 10 --resume
+
+
+def read_records(source, start=0, width=6, height=None, target='X'):
+    """Sinh (index, id, Board) từ bản ghi thứ start trở đi; '-' = stdin."""
+    if source.endswith('.rhp'):
+        for index, board, _ in iter_pack(source, start):
+            yield index, index, board
+        return
+    height = width if height is None else height
+    f = sys.stdin if source == '-' else open(source)
+    try:
+        index = 0
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if index >= start:
+                try:
+                    if line.startswith('{'):
+                        data = json.loads(line)
+                        yield index, data.get('id', index), board_from_dict(data)
+                    else:
+                        grid, _ = parse_grid_line(line, width * height, target)
+                        yield index, index, grid_to_board(grid, width, height)
+                except ValueError as e:
+                    raise ValueError(f"{source}:{number}: {e}") from None
+            index += 1
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def resume_point(output_path):
+    """
+    Số bản ghi đã hoàn tất trong file kết quả (= index để chạy tiếp).
+    Dòng cuối ghi dở (crash giữa lúc ghi) bị cắt khỏi file.
+    """
+    if not os.path.exists(output_path):
+        return 0
+    done = 0
+    good = 0  # offset sau dòng hợp lệ cuối cùng
+    with open(output_path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                done = json.loads(line)['index'] + 1
+            except (ValueError, KeyError):
+                break
+            good += len(line)
+    if good != os.path.getsize(output_path):
+        with open(output_path, 'r+b') as f:
+            f.truncate(good)
+    return done
+
+
+def _result_line(index, puzzle_id, row):
+    path = row.get('path')
+    stats = {key: value for key, value in row.items()
+             if key not in ('map', 'algorithm_key', 'cost_model', 'status', 'wall_time', 'path')}
+    return json.dumps({
+        'index': index,
+        'id': puzzle_id,
+        'algorithm': row['algorithm_key'],
+        'cost_model': row['cost_model'],
+        'status': row['status'],
+        'length': len(path) if path is not None else None,
+        'path': [list(step) for step in path] if path is not None else None,
+        'wall_time': row['wall_time'],
+        'stats': stats,
+    }) + '\n'
+
+
+def stream_solve(records, algorithm, out, workers=None, window=None, cost_model=None,
+                 timeout=None, memory_mb=None, node_budget=None, progress=None, compact=False):
+    """
+    Giải records ((index, id, Board), ...) và ghi từng dòng kết quả ra out theo thứ tự.
+    Trả số puzzle đã giải; progress(số đã ghi) được gọi sau mỗi dòng.
+    """
+    workers = workers or os.cpu_count()
+    window = window or 4 * workers
+    pending = deque()  # (index, id, future) theo thứ tự đầu vào
+    written = 0
+
+    def write_head():
+        nonlocal written
+        index, puzzle_id, future = pending.popleft()
+        out.write(_result_line(index, puzzle_id, future.result()))
+        out.flush()
+        written += 1
+        if progress:
+            progress(written)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for index, puzzle_id, board in records:
+            future = executor.submit(run_job, f'#{index}', algorithm, cost_model, timeout,
+                                     memory_mb, False, node_budget,
+                                     layout=encode_board(board), keep_path=True,
+                                     compact=compact)
+            pending.append((index, puzzle_id, future))
+            if len(pending) >= window:
+                write_head()  # chờ puzzle đầu cửa sổ: không đọc thêm khi đầy
+            while pending and pending[0][2].done():
+                write_head()
+        while pending:
+            write_head()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Giải theo luồng một bộ puzzle lớn, ghi JSONL")
+    parser.add_argument('input', help="pack .rhp, file text (JSON hoặc grid mỗi dòng) hoặc '-' = stdin")
+    parser.add_argument('-a', '--algorithm', default='astar', choices=list(ALGORITHMS))
+    parser.add_argument('-o', '--output', help="file .jsonl (mặc định stdout)")
+    parser.add_argument('--resume', action='store_true',
+                        help="chạy tiếp sau bản ghi cuối cùng đã có trong --output")
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--window', type=int, help="số puzzle tối đa đang xử lý (mặc định 4 x workers)")
+    parser.add_argument('--cost-model', choices=list(COST_MODELS))
+    parser.add_argument('--timeout', type=float, help="giây cho mỗi puzzle")
+    parser.add_argument('--memory', type=int, help="MB tối đa cho mỗi puzzle")
+    parser.add_argument('--node-budget', type=int, help="số node mở rộng tối đa cho mỗi puzzle")
+    parser.add_argument('--compact', action='store_true',
+                        help="visited dạng packed cho bfs, dfs, ucs, astar: ít RAM hơn, chậm hơn")
+    parser.add_argument('--width', type=int, default=6, help="kích thước board của dòng grid")
+    parser.add_argument('--height', type=int)
+    parser.add_argument('--target', default='X', help="chữ của xe mục tiêu trong dòng grid (vd. A)")
+    args = parser.parse_args(argv)
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+
+    start_index = resume_point(args.output) if args.resume else 0
+    records = read_records(args.input, start_index, args.width, args.height, args.target)
+    out = open(args.output, 'a' if args.resume else 'w') if args.output else sys.stdout
+    start = time.perf_counter()
+
+    def progress(done):
+        if done % 100 == 0:
+            print(f"\r{start_index + done} puzzles, {time.perf_counter() - start:.1f}s",
+                  end='', file=sys.stderr)
+
+    try:
+        count = stream_solve(records, args.algorithm, out, args.workers, args.window,
+                             args.cost_model, args.timeout, args.memory, args.node_budget,
+                             progress, args.compact)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"\n{count} puzzles in {time.perf_counter() - start:.2f}s"
+          + (f" (resumed at {start_index})" if start_index else ''), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
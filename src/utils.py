@@ -4,35 +4,65 @@ from collections import namedtuple
 # id: ký hiệu (chuỗi), orientation: 'H' hoặc 'V', row/col: vị trí góc trên-trái, length: độ dài
 Vehicle = namedtuple('Vehicle', ['id', 'orientation', 'row', 'col', 'length'])
 
+# Các cạnh có thể đặt lối ra: xe X phải nằm ngang với lối ra trái/phải, dọc với trên/dưới
+EXIT_SIDES = ('right', 'left', 'top', 'bottom')
+
 class Board:
     """
     Lớp Board quản lý trạng thái của trò chơi:
       - self.vehicles: dict id->Vehicle
-      - self.size: kích thước board (6)
+      - self.width, self.height: kích thước board (mặc định 6x6)
+      - self.walls: frozenset các ô (row, col) cố định không đi qua được
+      - self.exit: (cạnh, chỉ số hàng/cột) của lối ra; None = cạnh phải, trên hàng của X
     Các phương thức:
+      - copy(): Board cùng kích thước/tường/lối ra, có thể thay dict xe
       - state_key(): trả về key để đánh dấu visited
-      - is_goal(): kiểm tra xe X đã đến đích chưa
-      - get_occupied(): tạo ma trận 6x6 đánh dấu ô đã chiếm
+      - is_goal(): kiểm tra xe X đã đến lối ra chưa
+      - get_occupied(): ma trận height x width đánh dấu ô đã chiếm (tường = '#'), để hiển thị
       - successors(): liệt kê các board có thể tới sau 1 bước di chuyển
+    Luật di chuyển và đích nằm ở solver.bitboard.BitBoard; is_goal()/successors() chỉ chuyển tiếp.
     """
-    def __init__(self, vehicles):
+    def __init__(self, vehicles, width=6, height=None, walls=(), exit=None):
         self.vehicles = vehicles  # dict id -> Vehicle
-        self.size = 6
+        self.width = width
+        self.height = width if height is None else height
+        self.walls = frozenset(tuple(cell) for cell in walls)
+        self.exit = tuple(exit) if exit is not None else None
+
+    @property
+    def is_classic(self):
+        return (self.width == self.height == 6 and not self.walls and self.exit is None)
+
+    def exit_position(self):
+        # (cạnh, chỉ số) của lối ra; mặc định: cạnh phải trên hàng của X (cạnh dưới nếu X dọc)
+        if self.exit is not None:
+            return self.exit
+        x = self.vehicles['X']
+        return ('right', x.row) if x.orientation == 'H' else ('bottom', x.col)
+
+    def copy(self, vehicles=None):
+        return Board(dict(self.vehicles if vehicles is None else vehicles),
+                     self.width, self.height, self.walls, self.exit)
 
     def state_key(self):
         # Trả tuple sắp xếp theo id, dùng để so sánh visited
         return tuple((v.id, v.row, v.col)
                      for v in sorted(self.vehicles.values(), key=lambda x: x.id))
 
+    def _bitboard(self):
+        from solver.bitboard import BitBoard
+        bitboard = BitBoard.from_board(self)
+        return bitboard, bitboard.encode(self.vehicles)
+
     def is_goal(self):
-        # Mục tiêu: xe X ngang (H) và ô cuối cùng của nó nằm ở col == size-1
-        target = self.vehicles['X']
-        return (target.orientation == 'H' and
-                target.col + target.length - 1 == self.size - 1)
+        bitboard, state = self._bitboard()
+        return bitboard.is_goal(state)
 
     def get_occupied(self):
-        # Trả danh sách 2D 6x6, mỗi ô chứa id xe hoặc None
-        occ = [[None] * self.size for _ in range(self.size)]
+        # Trả danh sách 2D height x width, mỗi ô chứa id xe, '#' nếu là tường, hoặc None
+        occ = [[None] * self.width for _ in range(self.height)]
+        for r, c in self.walls:
+            occ[r][c] = '#'
         for v in self.vehicles.values():
             for i in range(v.length):
                 r = v.row + (i if v.orientation == 'V' else 0)
@@ -41,33 +71,7 @@ class Board:
         return occ
 
     def successors(self):
-        # Sinh tất cả board con bằng cách di chuyển từng xe 1 bước
-        occ = self.get_occupied()
-        succs = []
-        # Duyệt qua từng xe
-        for vid, v in self.vehicles.items():
-            if v.orientation == 'H':
-                # Di chuyển ngang: trái và phải
-                # trái: col-1
-                if v.col > 0 and occ[v.row][v.col - 1] is None:
-                    new = dict(self.vehicles)
-                    new[vid] = Vehicle(v.id, 'H', v.row, v.col - 1, v.length)
-                    succs.append((vid, -1, Board(new)))
-                # phải: end+1
-                end = v.col + v.length - 1
-                if end < self.size - 1 and occ[v.row][end + 1] is None:
-                    new = dict(self.vehicles)
-                    new[vid] = Vehicle(v.id, 'H', v.row, v.col + 1, v.length)
-                    succs.append((vid, +1, Board(new)))
-            else:
-                # Di chuyển dọc: lên và xuống
-                if v.row > 0 and occ[v.row - 1][v.col] is None:
-                    new = dict(self.vehicles)
-                    new[vid] = Vehicle(v.id, 'V', v.row - 1, v.col, v.length)
-                    succs.append((vid, -1, Board(new)))
-                end = v.row + v.length - 1
-                if end < self.size - 1 and occ[end + 1][v.col] is None:
-                    new = dict(self.vehicles)
-                    new[vid] = Vehicle(v.id, 'V', v.row + 1, v.col, v.length)
-                    succs.append((vid, +1, Board(new)))
-        return succs
\ No newline at end of file
+        # Sinh tất cả board con bằng cách di chuyển từng xe 1 bước: (id xe, ±1, Board)
+        bitboard, state = self._bitboard()
+        return [(bitboard.ids[i], step, bitboard.to_board(child))
+                for i, step, child in bitboard.successors(state)]
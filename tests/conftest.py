@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Các module nằm phẳng trong src/ (import kiểu `from solver.bfs import bfs`).
+# src/statistics.py trùng tên module chuẩn nên phải đứng trước và bỏ bản đã import sẵn.
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+sys.path.insert(0, SRC)
+if 'statistics' in sys.modules and not hasattr(sys.modules['statistics'], 'Statistics'):
+    del sys.modules['statistics']
+
+MAPS = os.path.join(os.path.dirname(SRC), 'maps')
@@ -0,0 +1,68 @@
+import glob
+import os
+import random
+
+from conftest import MAPS
+from utils import Board, Vehicle
+
+
+def bundled_maps(solvable_only=False):
+    """Đường dẫn các map có sẵn (maps/map*.json và maps/variants)."""
+    paths = sorted(glob.glob(os.path.join(MAPS, 'map*.json'))
+                   + glob.glob(os.path.join(MAPS, 'variants', '*.json')))
+    if not solvable_only:
+        return paths
+    # map9/map10 cố ý không giải được
+    return [p for p in paths if os.path.basename(p) not in ('map9.json', 'map10.json')]
+
+
+def random_board(rng, vehicles=10, size=6):
+    """Board size x size ngẫu nhiên: X nằm ngang trên hàng 2 cộng tối đa `vehicles` xe."""
+    occupied = set()
+    placed = {}
+
+    def place(vid, orientation, row, col, length):
+        cells = [(row, col + k) if orientation == 'H' else (row + k, col) for k in range(length)]
+        if any(r >= size or c >= size or (r, c) in occupied for r, c in cells):
+            return False
+        occupied.update(cells)
+        placed[vid] = Vehicle(vid, orientation, row, col, length)
+        return True
+
+    place('X', 'H', 2, rng.randrange(size - 2), 2)
+    for vid in 'ABCDEFGHIJKLMNOPQRSTUVW'[:vehicles]:
+        for _ in range(20):
+            orientation = rng.choice('HV')
+            length = rng.choice((2, 2, 3))
+            if orientation == 'H' and rng.random() < 0.7:
+                row = rng.choice([r for r in range(size) if r != 2])
+            else:
+                row = rng.randrange(size)
+            if place(vid, orientation, row, rng.randrange(size), length):
+                break
+    return Board(placed, size)
+
+
+def random_boards(count, seed=0, vehicles=10):
+    rng = random.Random(seed)
+    return [random_board(rng, rng.randint(3, vehicles)) for _ in range(count)]
+
+
+def path_cost(board, path, cost_model='cell'):
+    """Cost của path từ board; AssertionError nếu có bước không hợp lệ hoặc không tới đích."""
+    from solver.bitboard import BitBoard
+    from solver.cost_model import get_cost_model
+    bitboard = BitBoard.from_board(board)
+    model = get_cost_model(cost_model)
+    successors = model.successors(bitboard)
+    step_costs = model.step_costs(bitboard)
+    state = bitboard.encode(board.vehicles)
+    cost = 0
+    for vid, move in path:
+        i = bitboard.index[vid]
+        children = {(j, m): child for j, m, child in successors(state)}
+        assert (i, move) in children, f"illegal move {vid}{move:+d}"
+        state = children[i, move]
+        cost += step_costs(i, move)
+    assert bitboard.is_goal(state), "path does not reach the exit"
+    return cost
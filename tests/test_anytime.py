@@ -0,0 +1,81 @@
+import pytest
+
+from helpers import bundled_maps, path_cost
+from map_loader import load_board
+from solver.beam_search import beam_search
+from solver.search_control import SearchControl
+from solver.ucs import ucs
+from solver.weighted_astar import weighted_astar
+
+ANYTIME = (weighted_astar, beam_search)
+# map7 chậm nhất và không thêm gì so với map8: bỏ cho test nhanh
+MAPS = [p for p in bundled_maps() if not p.endswith('map7.json')]
+
+
+def _name(path):
+    return path.replace('\\', '/').rsplit('/', 1)[-1]
+
+
+@pytest.mark.parametrize('map_path', MAPS, ids=_name)
+def test_unbudgeted_is_optimal(map_path):
+    board = load_board(map_path)
+    expected, _ = ucs(board)
+    for solver in ANYTIME:
+        path, stats = solver(board)
+        if expected is None:
+            assert path is None and stats.suboptimality_bound is None
+            continue
+        assert path_cost(board, path, 'length') == path_cost(board, expected, 'length')
+        assert stats.suboptimality_bound == 1.0, solver.__name__
+        assert stats.stop_reason is None
+
+
+@pytest.mark.parametrize('map_path', [p for p in MAPS if p in bundled_maps(solvable_only=True)], ids=_name)
+def test_bound_holds(map_path):
+    board = load_board(map_path)
+    optimal = path_cost(board, ucs(board)[0], 'length')
+    runs = [weighted_astar(board, weights=(3.0,)), weighted_astar(board, weights=(2.0, 1.5)),
+            beam_search(board, width=4, max_width=4), beam_search(board, width=2, max_width=8)]
+    for path, stats in runs:
+        if path is None:
+            continue  # beam hẹp có thể bỏ mất mọi lời giải
+        cost = path_cost(board, path, 'length')
+        assert stats.suboptimality_bound >= 1.0
+        assert cost <= stats.suboptimality_bound * optimal + 1e-9, stats.algorithm_name
+
+
+def test_solutions_improve_and_budget_keeps_best():
+    board = load_board([p for p in bundled_maps() if _name(p) == 'map8.json'][0])
+    for solver in ANYTIME:
+        reported = []
+
+        def on_solution(stats):
+            reported.append((path_cost(board, stats.solution_path, 'length'), stats.suboptimality_bound))
+
+        path, stats = solver(board, control=SearchControl(on_solution=on_solution))
+        # mỗi lần báo: lời giải rẻ hơn (solutions_found), hoặc cùng lời giải với cận chặt hơn
+        assert len({cost for cost, _ in reported}) == stats.solutions_found >= 1
+        for (cost, bound), (prev_cost, prev_bound) in zip(reported[1:], reported):
+            assert cost < prev_cost or (cost == prev_cost and bound < prev_bound)
+        assert reported[-1] == (path_cost(board, path, 'length'), 1.0)
+
+        # hết ngân sách sau lời giải đầu tiên: vẫn trả lời giải tốt nhất cùng cận của nó
+        first = []
+        control = SearchControl(on_solution=lambda s: first.append(list(s.solution_path)),
+                                node_budget=stats.expanded_nodes - 1, check_every=64)
+        path, budgeted = solver(board, control=control)
+        assert budgeted.stop_reason == 'node_budget'
+        if first:
+            assert path == first[-1]
+            assert budgeted.suboptimality_bound is None or budgeted.suboptimality_bound >= 1.0
+
+
+def test_beam_stores_only_kept_nodes():
+    board = load_board([p for p in bundled_maps() if _name(p) == 'map8.json'][0])
+    for width in (4, 16):
+        _, stats = beam_search(board, width=width, max_width=width)
+        assert stats.iterations == 1
+        # node bị cắt khỏi beam không nằm trong visited: mọi state đã lưu đều được mở rộng
+        # (trừ gốc và tối đa width node của lớp cuối)
+        assert stats.max_visited <= stats.expanded_nodes + stats.stale_nodes + width + 1
+        assert stats.max_visited < stats.generated_nodes
@@ -0,0 +1,20 @@
+import pytest
+
+from batch_solve import main, run_job
+from helpers import bundled_maps
+
+
+def test_main_exits_once_when_no_maps(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        main([str(tmp_path), '-a', 'bfs,ucs,astar'])
+    assert exc.value.code != 0
+    out, err = capsys.readouterr()
+    assert out == ''
+    assert err.count("no maps matched") == 1
+
+
+def test_run_job_row():
+    map_path = [p for p in bundled_maps() if p.endswith('map1.json')][0]
+    row = run_job(map_path, 'bfs', keep_path=True)
+    assert row['status'] == 'ok'
+    assert row['solution_length'] == len(row['path'])
@@ -0,0 +1,102 @@
+import math
+import os
+
+import pytest
+
+from benchmark import BASELINE_PATH, _betainc, compare_results, welch_t_test
+from conftest import SRC
+
+
+# giá trị tham chiếu tính bằng scipy.special.betainc
+BETAINC_CASES = [
+    ((0.5, 0.5, 0.3), 0.36901011956554536),
+    ((2.0, 3.0, 0.4), 0.5248),
+    ((4.0, 0.5, 0.9), 0.37337491740225975),  # nhánh 1 - I_{1-x}(b, a)
+    ((10.0, 0.5, 0.2), 1.994982493613096e-08),
+    ((1.5, 7.0, 0.05), 0.13693162173125475),
+]
+
+# (baseline, current, t, df, p) tính bằng
+# scipy.stats.ttest_ind(current, baseline, equal_var=False, alternative='greater')
+WELCH_CASES = [
+    ([1.0, 1.1, 0.9, 1.05, 0.95], [1.2, 1.3, 1.1, 1.25, 1.15],
+     4.0, 8.0, 0.001974886401722667),
+    ([10, 12, 11, 13, 9, 10], [11, 13, 12, 10, 14],
+     1.2572371141874237, 8.371080139372824, 0.12130495706569434),
+    ([5.0, 5.2, 4.9], [5.1, 4.8, 5.3, 5.0, 4.9, 5.2],
+     0.1428571428571424, 5.0, 0.4459907389952817),
+    ([2.0, 2.5, 3.0, 2.2], [1.5, 1.9, 1.7, 2.1],
+     -2.471334023696013, 4.88092319908854, 0.9711826718623512),
+    ([100, 101], [150, 99, 160, 170, 95],
+     2.174591369083596, 4.008034820532159, 0.04759120431903646),
+]
+
+
+@pytest.mark.parametrize('args, expected', BETAINC_CASES)
+def test_betainc_matches_scipy(args, expected):
+    assert _betainc(*args) == pytest.approx(expected, rel=1e-9, abs=1e-15)
+
+
+@pytest.mark.parametrize('baseline, current, t, df, p', WELCH_CASES)
+def test_welch_matches_scipy(baseline, current, t, df, p):
+    result = welch_t_test(baseline, current)
+    assert result == pytest.approx((t, df, p), rel=1e-9)
+
+
+def test_welch_without_noise():
+    assert welch_t_test([1.0] * 3, [1.0] * 3)[2] == 1.0
+    t, _, p = welch_t_test([1.0] * 3, [2.0] * 3)
+    assert t == math.inf and p == 0.0
+    assert welch_t_test([2.0] * 3, [1.0] * 3)[2] == 1.0
+
+
+def _results(wall_time, **overrides):
+    row = {'map': 'map1', 'algorithm': 'bfs', 'wall_time': wall_time,
+           'peak_memory': 1000, 'expanded_nodes': 50, 'generated_nodes': 120,
+           'solution_found': True, 'solution_length': 4}
+    row.update(overrides)
+    return {'results': [row]}
+
+
+BASE_TIMES = [0.100, 0.102, 0.098, 0.101, 0.099]
+
+
+def test_compare_flags_time_regression():
+    [row] = compare_results(_results(BASE_TIMES), _results([t * 1.3 for t in BASE_TIMES]))
+    assert row['regression'] and row['p_value'] < 0.05
+    assert row['change'] == pytest.approx(0.3)
+    assert row['reasons'][0].startswith('time +30.0%')
+
+
+def test_compare_no_change():
+    noisy = [0.101, 0.099, 0.100, 0.102, 0.098]
+    [row] = compare_results(_results(BASE_TIMES), _results(noisy))
+    assert not row['regression'] and row['reasons'] == []
+    # nhanh hơn hẳn cũng không phải regression
+    [row] = compare_results(_results(BASE_TIMES), _results([t * 0.5 for t in BASE_TIMES]))
+    assert not row['regression'] and row['p_value'] > 0.95
+
+
+def test_compare_small_or_noisy_slowdown():
+    # có ý nghĩa thống kê nhưng dưới min_change
+    [row] = compare_results(_results(BASE_TIMES), _results([t * 1.02 for t in BASE_TIMES]))
+    assert row['p_value'] < 0.05 and not row['regression']
+    # chậm hơn 30% về trung bình nhưng nhiễu quá lớn để khẳng định
+    [row] = compare_results(_results(BASE_TIMES), _results([0.05, 0.25, 0.06, 0.24, 0.05]))
+    assert row['change'] > 0.05 and row['p_value'] >= 0.05 and not row['regression']
+
+
+def test_compare_deterministic_counters():
+    rows = compare_results(
+        _results(BASE_TIMES),
+        _results(BASE_TIMES, peak_memory=1200, expanded_nodes=51, solution_length=5))
+    reasons = rows[0]['reasons']
+    assert rows[0]['regression'] and len(reasons) == 3
+    assert reasons[0] == 'memory 1000 -> 1200B'
+    assert 'expanded_nodes 50 -> 51' in reasons and 'solution_length 4 -> 5' in reasons
+    # map/thuật toán không có trong baseline bị bỏ qua
+    assert compare_results(_results(BASE_TIMES), _results(BASE_TIMES, map='map2')) == []
+
+
+def test_baseline_path_is_under_project_root():
+    assert BASELINE_PATH == os.path.join(os.path.dirname(SRC), 'benchmarks', 'baseline.json')
@@ -0,0 +1,77 @@
+import functools
+
+import pytest
+
+from helpers import bundled_maps, path_cost, random_boards
+from map_loader import load_board
+from solver import bidirectional_bfs as bidirectional_module
+from solver.bfs import bfs
+from solver.bidirectional_bfs import bidirectional_bfs, goal_seeds
+from solver.bitboard import BitBoard
+from solver.search_control import SearchControl
+from utils import Board, Vehicle
+
+
+def assert_same_length(board, cost_model='cell'):
+    expected, _ = bfs(board, cost_model=cost_model)
+    path, _ = bidirectional_bfs(board, cost_model=cost_model)
+    if expected is None:
+        assert path is None
+    else:
+        assert path is not None
+        assert len(path) == len(expected)
+        path_cost(board, path, cost_model)
+
+
+def test_meeting_point_off_shortest_path():
+    # bản cũ chỉ seed các state đích gần bố cục ban đầu và trả 7 bước
+    vehicles = [('X', 'H', 3, 1, 2), ('A', 'H', 4, 1, 2), ('B', 'H', 5, 3, 2),
+                ('C', 'H', 2, 3, 2), ('D', 'V', 0, 0, 3), ('E', 'V', 3, 4, 2),
+                ('F', 'V', 3, 5, 2), ('G', 'V', 1, 5, 2), ('H', 'V', 0, 2, 2),
+                ('I', 'H', 5, 0, 2)]
+    board = Board({v[0]: Vehicle(*v) for v in vehicles})
+    path, _ = bidirectional_bfs(board)
+    assert len(path) == 6
+    assert path_cost(board, path) == 6
+
+
+@pytest.mark.parametrize('map_path', bundled_maps())
+def test_bundled_maps_match_bfs(map_path):
+    assert_same_length(load_board(map_path))
+
+
+@pytest.mark.parametrize('cost_model', ['cell', 'slide'])
+def test_random_boards_match_bfs(cost_model):
+    for board in random_boards(150, seed=5):
+        assert_same_length(board, cost_model)
+
+
+def test_incomplete_seed_set_still_optimal(monkeypatch):
+    # quá ít state đích được liệt kê: phải BFS xuôi tiếp tới độ dài tốt nhất
+    seeds = functools.partial(goal_seeds, limit=3)
+    monkeypatch.setattr(bidirectional_module, 'goal_seeds', seeds)
+    for board in random_boards(100, seed=7):
+        assert_same_length(board)
+
+
+def test_goal_seeds_are_every_goal_state():
+    board = load_board(bundled_maps()[0])
+    bitboard = BitBoard.from_board(board)
+    seeds, complete = goal_seeds(bitboard)
+    assert complete
+    assert seeds and all(bitboard.is_goal(state) for state in seeds)
+    seeds, complete = goal_seeds(bitboard, limit=2)
+    assert not complete and len(seeds) == 2
+
+
+def test_cancel_during_seeding():
+    # map8 có hơn 10000 state đích: stop() được gọi trong lúc liệt kê
+    board = load_board([p for p in bundled_maps() if p.endswith('map8.json')][0])
+    seeds, complete = goal_seeds(BitBoard.from_board(board), stop=lambda: True)
+    assert not complete
+    control = SearchControl()
+    control.cancel()
+    path, stats = bidirectional_bfs(board, control=control)
+    assert path is None
+    assert stats.stop_reason == 'cancelled'
+    assert stats.expanded_nodes == 0
@@ -0,0 +1,93 @@
+from helpers import bundled_maps, random_boards
+from map_loader import load_board
+from solver.bitboard import BitBoard
+from solver.node_store import NodeStore
+
+
+def _boards():
+    return [load_board(p) for p in bundled_maps()] + random_boards(40, seed=11)
+
+
+def _unit_moves(board):
+    # sinh nước đi 1 ô trực tiếp trên lưới, không qua BitBoard
+    occ = board.get_occupied()
+    moves = set()
+    for v in board.vehicles.values():
+        dr, dc = (0, 1) if v.orientation == 'H' else (1, 0)
+        back = (v.row - dr, v.col - dc)
+        front = (v.row + dr * v.length, v.col + dc * v.length)
+        for step, (r, c) in ((-1, back), (+1, front)):
+            if 0 <= r < board.height and 0 <= c < board.width and occ[r][c] is None:
+                moves.add((v.id, step))
+    return moves
+
+
+def test_encode_decode_round_trip():
+    for board in _boards():
+        bitboard = BitBoard.from_board(board)
+        state = bitboard.encode(board.vehicles)
+        assert state.bit_length() <= bitboard.state_bits
+        assert bitboard.decode(state) == board.vehicles
+        restored = bitboard.to_board(state)
+        assert restored.get_occupied() == board.get_occupied()
+        assert bitboard.encode(restored.vehicles) == state
+
+
+def test_successors_match_grid_moves():
+    for board in _boards():
+        bitboard = BitBoard.from_board(board)
+        state = bitboard.encode(board.vehicles)
+        succs = bitboard.successors(state)
+        assert {(bitboard.ids[i], move) for i, move, _ in succs} == _unit_moves(board)
+        for i, move, child in succs:
+            vehicles = dict(board.vehicles)
+            v = vehicles[bitboard.ids[i]]
+            if v.orientation == 'H':
+                vehicles[v.id] = v._replace(col=v.col + move)
+            else:
+                vehicles[v.id] = v._replace(row=v.row + move)
+            assert bitboard.decode(child) == vehicles
+
+
+def test_slides_are_unit_move_runs():
+    for board in _boards():
+        bitboard = BitBoard.from_board(board)
+        state = bitboard.encode(board.vehicles)
+        expected = set()
+        for i, move, child in bitboard.successors(state):
+            # đi tiếp cùng xe, cùng hướng tới khi bị chặn
+            k = move
+            while True:
+                expected.add((i, k, child))
+                nxt = [c for j, m, c in bitboard.successors(child) if j == i and m == move]
+                if not nxt:
+                    break
+                child, k = nxt[0], k + move
+        assert set(bitboard.slide_successors(state)) == expected
+
+
+def test_goal_states():
+    for board in _boards():
+        bitboard = BitBoard.from_board(board)
+        state = bitboard.encode(board.vehicles)
+        assert bitboard.is_goal(state) == board.is_goal()
+        x = board.vehicles['X']
+        at_exit = x.col + x.length == board.width if x.orientation == 'H' else x.row + x.length == board.height
+        if board.is_classic:
+            assert bitboard.is_goal(state) == at_exit
+
+
+def test_node_store_path():
+    board = load_board([p for p in bundled_maps() if p.endswith('map1.json')][0])
+    bitboard = BitBoard.from_board(board)
+    nodes = NodeStore(bitboard)
+    node = nodes.add(bitboard.encode(board.vehicles))
+    state = nodes.states[node]
+    expected = []
+    for _ in range(5):
+        i, move, state = bitboard.successors(state)[0]
+        node = nodes.add(state, node, i, move)
+        expected.append((bitboard.ids[i], move))
+    assert nodes.path(node) == expected
+    assert nodes.path(0) == []
+    assert len(nodes) == 6
@@ -0,0 +1,43 @@
+import shutil
+
+import pytest
+
+import distance_table
+from distance_table import UNSOLVABLE, build_table, compute_distances, load_table
+from helpers import bundled_maps, path_cost, random_boards
+from map_loader import load_board
+from solver.bfs import bfs
+from solver.bitboard import BitBoard
+
+
+def test_distances_match_bfs():
+    for board in random_boards(40, seed=5, vehicles=8):
+        bitboard = BitBoard.from_board(board)
+        start = bitboard.encode(board.vehicles)
+        dist = compute_distances(bitboard, start)
+        expected, _ = bfs(board)
+        assert dist[start] == (UNSOLVABLE if expected is None else len(expected))
+
+
+def test_depth_beyond_value_type_raises(monkeypatch):
+    board = load_board([p for p in bundled_maps() if p.endswith('map8.json')][0])
+    bitboard = BitBoard.from_board(board)
+    # map8 có state cách đích hơn 3 bước: với giới hạn 3 không được cắt thành 2
+    monkeypatch.setattr(distance_table, 'UNSOLVABLE', 3)
+    with pytest.raises(ValueError, match="vượt 2 bước"):
+        compute_distances(bitboard, bitboard.encode(board.vehicles))
+
+
+def test_table_round_trip(tmp_path):
+    map_path = str(tmp_path / 'map1.json')
+    shutil.copy([p for p in bundled_maps() if p.endswith('map1.json')][0], map_path)
+    build_table(map_path)
+    board = load_board(map_path)
+    table = load_table(map_path, build=False)
+    try:
+        expected, _ = bfs(board)
+        assert table.distance(board) == len(expected)
+        path = table.solve(board)
+        assert path_cost(board, path) == len(expected)
+    finally:
+        table.close()
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SRC
+
+pytest.importorskip('pygame')
+
+
+def test_import_does_not_open_cache_or_start_worker(tmp_path):
+    # import gameplay phải nhẹ: không import hints/solution_cache/solve_worker,
+    # không mở SQLite và không tạo process giải
+    code = (
+        "import sys, gameplay\n"
+        "heavy = [m for m in ('hints', 'solution_cache', 'solve_worker') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+        "assert gameplay.solution_cache is None and gameplay.solve_worker is None\n"
+    )
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(SRC),
+                            env=dict(env, PYTHONPATH=SRC), capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_reset_keeps_hint_service(tmp_path):
+    # Reset (kể cả nút OK của bảng thống kê) chỉ đưa board về ban đầu: không dựng lại
+    # HintService, không mở lại bảng khoảng cách
+    code = (
+        "import gameplay\n"
+        "from solution_cache import SolutionCache\n"
+        "class Worker:\n"
+        "    def start(self): pass\n"
+        "    def cancel(self, job): pass\n"
+        "gameplay.get_solve_worker = lambda: Worker()\n"
+        f"gameplay.solution_cache = SolutionCache({str(tmp_path / 'cache.sqlite3')!r})\n"
+        "gameplay.load_car_images = gameplay.preload_level = lambda level: None\n"
+        "gameplay.go_to_gameplay(1)\n"
+        "service, table = gameplay.hint_service, gameplay.distance_table\n"
+        "vid, move, child = service.bitboard.successors(service.bitboard.encode(gameplay.board.vehicles))[0]\n"
+        "gameplay.board = service.bitboard.to_board(child)\n"
+        "gameplay.reset_game()\n"
+        "assert gameplay.hint_service is service and gameplay.distance_table is table\n"
+        "assert gameplay.board.vehicles == gameplay.initial_board.vehicles\n"
+        "assert gameplay.STATE == 'gameplay'\n"
+    )
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy')
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(SRC),
+                            env=dict(env, PYTHONPATH=SRC), capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
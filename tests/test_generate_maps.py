@@ -0,0 +1,116 @@
+import itertools
+import random
+from collections import deque
+
+import pytest
+
+from generate_maps import (enumerate_layouts, generate, goal_states, hardest_in_layout,
+                           layout_bitboard)
+from helpers import path_cost
+from solver.bfs import bfs
+
+WIDTH, HEIGHT, TARGET_ROW = 5, 5, 2
+LAYOUTS = list(enumerate_layouts(WIDTH, HEIGHT, TARGET_ROW, (2, 2, 3)))
+
+
+def _sample(count, seed=0):
+    layouts = random.Random(seed).sample(LAYOUTS, count)
+    # thêm các layout có nhiều thành phần giải được
+    return layouts + [layout for layout in LAYOUTS
+                      if len(hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW)) > 1][:3]
+
+
+def _cells(vehicle):
+    if vehicle.orientation == 'H':
+        return {(vehicle.row, vehicle.col + k) for k in range(vehicle.length)}
+    return {(vehicle.row + k, vehicle.col) for k in range(vehicle.length)}
+
+
+def _brute_force_goals(bitboard, walls):
+    # thử mọi tổ hợp vị trí, giữ các tổ hợp không chồng nhau, X ở lối ra và
+    # các xe cùng đường giữ thứ tự trong layout
+    lines = {}
+    for i in range(len(bitboard.ids)):
+        lines.setdefault((bitboard.orientations[i], bitboard.lines[i]), []).append(i)
+    ranges = [range(track - length + 1) for track, length in zip(bitboard.tracks, bitboard.lengths)]
+    goals = set()
+    for positions in itertools.product(*ranges):
+        if positions[bitboard.target] != bitboard.goal_pos:
+            continue
+        if any(positions[a] >= positions[b]
+               for line in lines.values() for a, b in zip(line, line[1:])):
+            continue
+        state = sum(p << shift for p, shift in zip(positions, bitboard.shifts))
+        taken = set(walls)
+        for vehicle in bitboard.decode(state).values():
+            cells = _cells(vehicle)
+            if taken & cells:
+                break
+            taken |= cells
+        else:
+            goals.add(state)
+    return goals
+
+
+@pytest.mark.parametrize('walls', [(), ((0, 4), (4, 0))])
+def test_goal_states_match_brute_force(walls):
+    for layout in _sample(20):
+        bitboard, prev = layout_bitboard(layout, WIDTH, HEIGHT, TARGET_ROW, walls)
+        goals = goal_states(bitboard, prev)
+        assert len(goals) == len(set(goals))
+        assert set(goals) == _brute_force_goals(bitboard, walls)
+
+
+def _reachable(bitboard, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for _, _, child in bitboard.successors(queue.popleft()):
+            if child not in seen:
+                seen.add(child)
+                queue.append(child)
+    return seen
+
+
+def test_hardest_matches_bfs():
+    for layout in _sample(8):
+        bitboard, prev = layout_bitboard(layout, WIDTH, HEIGHT, TARGET_ROW)
+        # min_length=0: giữ cả thành phần chỉ gồm state đích để đối chiếu đủ
+        results = hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW, min_length=0)
+        components = []
+        for dist, size, result_layout, state in results:
+            assert result_layout == layout
+            board = bitboard.to_board(state)
+            path, _ = bfs(board)
+            assert path is not None and path_cost(board, path, 'cell') == dist
+            # thành phần = mọi state đi tới được từ state trả về
+            component = _reachable(bitboard, state)
+            assert size == len(component)
+            components.append(component)
+        # các thành phần rời nhau và phủ đúng các state đi tới được từ state đích
+        solvable = set().union(*components)
+        assert sum(map(len, components)) == len(solvable)
+        assert solvable == set().union(*(_reachable(bitboard, goal)
+                                         for goal in goal_states(bitboard, prev)))
+
+
+def test_hardest_is_farthest_in_component():
+    layout = next(layout for layout in LAYOUTS
+                  if len(hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW)) > 1)
+    bitboard, _ = layout_bitboard(layout, WIDTH, HEIGHT, TARGET_ROW)
+    for dist, _, _, state in hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW):
+        component = sorted(_reachable(bitboard, state))
+        for other in random.Random(state).sample(component, min(10, len(component))):
+            board = bitboard.to_board(other)
+            path, _ = bfs(board)
+            assert path_cost(board, path, 'cell') <= dist
+
+
+def test_min_length_and_length_cost_model():
+    layout = next(layout for layout in LAYOUTS
+                  if hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW))
+    results = hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW)
+    longest = max(dist for dist, *_ in results)
+    assert hardest_in_layout(layout, WIDTH, HEIGHT, TARGET_ROW, min_length=longest + 1) == []
+    with pytest.raises(ValueError):
+        generate(WIDTH, HEIGHT, TARGET_ROW, (2, 2, 3), cost_model='length')
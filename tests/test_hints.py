@@ -0,0 +1,92 @@
+import random
+import shutil
+
+from distance_table import UNSOLVABLE, build_table, compute_distances, load_table
+from helpers import bundled_maps, path_cost
+from hints import HintService, optimal_cost_model
+from map_loader import load_board
+from solver.bitboard import BitBoard
+from solver.ucs import ucs
+
+
+def _map(name):
+    return [p for p in bundled_maps() if p.endswith(name)][0]
+
+
+def _sample(dist, count, seed=0):
+    rng = random.Random(seed)
+    return rng.sample(sorted(dist), min(count, len(dist)))
+
+
+def test_search_matches_distance_table():
+    board = load_board(_map('map6.json'))
+    bitboard = BitBoard.from_board(board)
+    dist = compute_distances(bitboard, bitboard.encode(board.vehicles))
+    service = HintService(board, cost_model='cell')
+    for state in _sample(dist, 60):
+        move, remaining = service.hint(bitboard.to_board(state))
+        if dist[state] == UNSOLVABLE:
+            assert (move, remaining) == (None, None)
+        elif dist[state] == 0:
+            assert (move, remaining) == (None, 0)
+        else:
+            assert remaining == dist[state]
+            # bước gợi ý phải giảm khoảng cách đúng 1
+            child = state + (move[1] << bitboard.shifts[bitboard.index[move[0]]])
+            assert dist[child] == dist[state] - 1
+
+
+def test_table_answers_and_follow_to_goal(tmp_path):
+    map_path = str(tmp_path / 'map5.json')
+    shutil.copy(_map('map5.json'), map_path)
+    build_table(map_path)
+    board = load_board(map_path)
+    table = load_table(map_path, build=False)
+    try:
+        service = HintService(board, table)
+        followed = []
+        current = board
+        while True:
+            move, remaining = service.hint(current)
+            if move is None:
+                assert remaining == 0
+                break
+            followed.append(move)
+            bitboard = service.bitboard
+            state = bitboard.encode(current.vehicles)
+            current = bitboard.to_board(state + (move[1] << bitboard.shifts[bitboard.index[move[0]]]))
+        assert path_cost(board, followed) == table.distance(board)
+        assert not service.memo  # mọi câu trả lời đến từ bảng
+    finally:
+        table.close()
+
+
+def test_length_cost_and_learn():
+    board = load_board(_map('map8.json'))
+    expected, _ = ucs(board)
+    optimal = path_cost(board, expected, 'length')
+    service = HintService(board, cost_model='length')
+    assert service.hint(board)[1] == optimal
+
+    # learn(): trả lời ngay từ memo cho mọi vị trí trên lời giải, không cần tìm
+    learned = HintService(board, cost_model='length')
+    assert learned.learn(board, expected, optimal_cost_model('ucs'))
+    assert not learned.learn(board, expected, 'cell')
+    assert learned.hint(board, time_budget=0) == (tuple(expected[0]), optimal)
+    assert learned._h is None
+
+
+def test_time_budget_resumes_search():
+    board = load_board(_map('map8.json'))
+    service = HintService(board, cost_model='length', heuristic='blocking_cars')
+    answers = [service.hint(board, time_budget=0) for _ in range(3)]
+    assert answers[0] is None  # chưa tìm xong trong lát thời gian đầu
+    result = answers[-1]
+    while result is None:
+        result = service.hint(board, time_budget=0.01)
+    assert result[1] == path_cost(board, ucs(board)[0], 'length')
+
+
+def test_unsolvable_map():
+    board = load_board(_map('map9.json'))
+    assert HintService(board).hint(board) == (None, None)
@@ -0,0 +1,34 @@
+import pytest
+
+from helpers import bundled_maps, path_cost, random_boards
+from map_loader import load_board
+from solver.bfs import bfs
+from solver.idastar import idastar
+from solver.search_control import SearchControl
+from solver.ucs import ucs
+
+
+@pytest.mark.parametrize('map_path', bundled_maps(solvable_only=True))
+def test_bundled_maps_match_ucs(map_path):
+    board = load_board(map_path)
+    expected, _ = ucs(board)
+    path, stats = idastar(board, control=SearchControl(time_budget=60))
+    assert stats.stop_reason is None
+    assert path_cost(board, path, 'length') == path_cost(board, expected, 'length')
+
+
+def test_random_boards_match_bfs():
+    for board in random_boards(60, seed=3, vehicles=7):
+        expected, _ = bfs(board)
+        if expected is None:
+            continue  # IDA* không chứng minh được vô nghiệm trong thời gian hợp lý
+        path, _ = idastar(board, cost_model='cell', heuristic='blocker_of_blockers')
+        assert len(path) == len(expected)
+        path_cost(board, path)
+
+
+def test_node_budget_stops_search():
+    board = load_board([p for p in bundled_maps() if p.endswith('map8.json')][0])
+    path, stats = idastar(board, heuristic='blocking_cars', control=SearchControl(node_budget=500))
+    assert path is None
+    assert stats.stop_reason == 'node_budget'
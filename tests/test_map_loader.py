@@ -0,0 +1,19 @@
+import os
+
+import pytest
+
+from conftest import MAPS
+from map_loader import find_maps
+
+
+def test_find_maps_directory_and_glob():
+    maps = find_maps([MAPS])
+    assert maps and all(os.path.basename(p).startswith('map') for p in maps)
+    assert find_maps([os.path.join(MAPS, 'map1.json')]) == [os.path.join(MAPS, 'map1.json')]
+
+
+def test_find_maps_reports_unmatched_sources(tmp_path):
+    with pytest.raises(ValueError, match="no maps matched"):
+        find_maps([str(tmp_path)])  # thư mục không có map*.json
+    with pytest.raises(ValueError, match="nothing-\\*.json"):
+        find_maps([MAPS, os.path.join(MAPS, 'nothing-*.json')])
@@ -0,0 +1,68 @@
+import heapq
+import random
+
+import pytest
+
+from helpers import bundled_maps
+from map_loader import load_board
+from solver.astar import astar
+from solver.bfs import bfs
+from solver.dfs import dfs
+from solver.packed import BucketQueue, StateMap, StateSet
+from solver.ucs import ucs
+
+
+def test_state_set_matches_set():
+    rng = random.Random(1)
+    packed, expected = StateSet(), set()
+    for _ in range(20000):
+        state = rng.getrandbits(rng.choice((8, 40, 63)))
+        assert (state in packed) == (state in expected)
+        packed.add(state)
+        expected.add(state)
+    assert len(packed) == len(expected)
+    assert all(state in packed for state in expected)
+    assert packed.nbytes > 0
+
+
+def test_state_map_matches_dict():
+    rng = random.Random(2)
+    packed, expected = StateMap(), {}
+    for _ in range(20000):
+        state = rng.getrandbits(rng.choice((8, 40, 63)))
+        value = rng.randrange(-1000, 1000)
+        assert packed.get(state) == expected.get(state)
+        packed[state] = value
+        expected[state] = value
+    assert len(packed) == len(expected)
+    assert all(packed[state] == value for state, value in expected.items())
+    missing = next(state for state in range(1 << 62, 1 << 63) if state not in expected)
+    with pytest.raises(KeyError):
+        packed[missing]
+
+
+def test_bucket_queue_matches_heapq():
+    rng = random.Random(3)
+    queue, heap = BucketQueue(), []
+    node = 0
+    for _ in range(5000):
+        if heap and rng.random() < 0.4:
+            assert queue.pop() == heapq.heappop(heap)[::2]
+        else:
+            key = rng.randrange(50)
+            queue.push(key, node)
+            heapq.heappush(heap, (key, node, node))  # (khóa, tie_id, node)
+            node += 1
+        assert len(queue) == len(heap)
+    while heap:
+        assert queue.pop() == heapq.heappop(heap)[::2]
+
+
+def test_compact_solvers_match_default():
+    # bỏ map7 (lớn nhất) cho test nhanh
+    for map_path in [p for p in bundled_maps() if not p.endswith('map7.json')]:
+        board = load_board(map_path)
+        for solver in (bfs, ucs, astar, dfs):
+            expected, _ = solver(board)
+            path, _ = solver(board, compact=True)
+            assert path == expected, (map_path, solver.__name__)
@@ -0,0 +1,123 @@
+import io
+import os
+
+import pytest
+
+from conftest import MAPS
+from helpers import random_boards
+from map_loader import load_board
+from puzzle_pack import (HEADER, PackWriter, PuzzlePack, board_to_grid, grid_to_board,
+                         import_grids, import_json, iter_pack)
+from solver.bitboard import BitBoard
+
+CLASSIC = [os.path.join(MAPS, f'map{n}.json') for n in range(1, 11)]
+
+
+def _same_board(a, b):
+    # thứ tự xe trong dict có thể khác: so sánh qua lưới
+    return (a.width, a.height, a.exit, a.get_occupied()) == (b.width, b.height, b.exit, b.get_occupied())
+
+
+def test_grid_round_trip():
+    for board in random_boards(50, seed=4) + [load_board(p) for p in CLASSIC]:
+        grid = board_to_grid(board)
+        assert len(grid) == 36
+        restored = grid_to_board(grid)
+        assert _same_board(restored, board)
+        assert board_to_grid(restored) == grid
+        assert next(iter(restored.vehicles)) == 'X'
+
+
+def test_grid_errors():
+    with pytest.raises(ValueError, match="expected 6x6"):
+        grid_to_board('o' * 35)
+    with pytest.raises(ValueError, match="no target"):
+        grid_to_board('AAoooo' + 'o' * 30)
+    with pytest.raises(ValueError, match="single cell"):
+        grid_to_board('XXoooA' + 'o' * 30)
+
+
+def test_import_json_round_trip(tmp_path):
+    out = str(tmp_path / 'levels.rhp')
+    assert import_json(CLASSIC, out) == len(CLASSIC)
+    with PuzzlePack(out) as pack:
+        assert len(pack) == len(CLASSIC)
+        for i, map_path in enumerate(CLASSIC):
+            board = load_board(map_path)
+            assert pack.grid(i) == board_to_grid(board)
+            assert _same_board(pack[i], board)
+        assert _same_board(pack[-1], load_board(CLASSIC[-1]))
+        with pytest.raises(IndexError):
+            pack[len(CLASSIC)]
+        grids = [board_to_grid(b) for b in pack]
+    streamed = list(iter_pack(out, 2, 5))
+    assert [i for i, _, _ in streamed] == [2, 3, 4]
+    assert [board_to_grid(b) for _, b, _ in streamed] == grids[2:5]
+
+
+def test_variant_with_walls_and_exit(tmp_path):
+    board = load_board(os.path.join(MAPS, 'variants', 'walls7x7.json'))
+    out = str(tmp_path / 'walls.rhp')
+    with PackWriter(out, board.width, board.height, board.exit) as writer:
+        writer.add(board, 10)
+        writer.add(board)
+        with pytest.raises(ValueError, match="pack holds"):
+            writer.add(load_board(CLASSIC[0]))
+    with PuzzlePack(out) as pack:
+        assert (pack.width, pack.height, pack.exit) == (board.width, board.height, board.exit)
+        restored = pack[0]
+        assert _same_board(restored, board)
+        assert pack.optimal_length(0) == 10
+        assert pack.optimal_length(1) is None
+        bitboard = BitBoard.from_board(board)
+        assert BitBoard.from_board(restored).walls == bitboard.walls
+
+
+def test_import_grids(tmp_path):
+    lines = io.StringIO(
+        "# comment\n"
+        "\n"
+        "51 GBBoLoGHIoLMGHIAAMCCCKoMooJKDDEEJFFo 13\n"   # xe mục tiêu là A
+        "IBBxooIooLDDJAALooJoKEEMFFKooMGGHHHM\n")
+    out = str(tmp_path / 'rush.rhp')
+    assert import_grids(lines, out, target='A') == 2
+    with PuzzlePack(out) as pack:
+        assert pack.optimal_length(0) == 51
+        assert pack.optimal_length(1) is None
+        assert pack.grid(0) == 'GBBoLoGHIoLMGHIXXMCCCKoMooJKDDEEJFFo'
+        assert pack[1].walls == {(0, 3)}
+    with pytest.raises(ValueError, match="line 1"):
+        import_grids(io.StringIO("ooo\n"), str(tmp_path / 'bad.rhp'))
+    assert not os.path.exists(str(tmp_path / 'bad.rhp'))
+
+
+def test_truncated_and_invalid_packs(tmp_path):
+    out = str(tmp_path / 'levels.rhp')
+    import_json(CLASSIC[:3], out)
+    with open(out, 'r+b') as f:
+        f.truncate(os.path.getsize(out) - 5)
+    with pytest.raises(ValueError, match="truncated at record 2"):
+        list(iter_pack(out))
+    junk = tmp_path / 'junk.rhp'
+    junk.write_bytes(b'not a pack at all, definitely not' * 2)
+    with pytest.raises(ValueError, match="không phải puzzle pack"):
+        PuzzlePack(str(junk))
+
+
+def test_empty_or_short_header(tmp_path):
+    out = str(tmp_path / 'levels.rhp')
+    import_json(CLASSIC[:3], out)
+    with open(out, 'rb') as f:
+        data = f.read()
+    for name, content in (('empty.rhp', b''), ('short.rhp', data[:HEADER.size - 1])):
+        path = tmp_path / name
+        path.write_bytes(content)
+        with pytest.raises(ValueError, match="không phải puzzle pack hợp lệ"):
+            PuzzlePack(str(path))
+        with pytest.raises(ValueError, match="không phải puzzle pack hợp lệ"):
+            list(iter_pack(str(path)))
+    # header nói 3 bản ghi nhưng file chỉ còn 2: PuzzlePack báo ngay khi mở
+    cut = tmp_path / 'cut.rhp'
+    cut.write_bytes(data[:-1])
+    with pytest.raises(ValueError, match="không phải puzzle pack hợp lệ"):
+        PuzzlePack(str(cut))
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+
+import pattern_db
+import solution_cache
+from helpers import bundled_maps
+from map_loader import load_board
+from solution_cache import SolutionCache
+from solver import default_options
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _board():
+    return load_board([p for p in bundled_maps() if p.endswith('map1.json')][0])
+
+
+def test_cache_dirs_do_not_depend_on_cwd():
+    assert solution_cache.DEFAULT_PATH == os.path.join(ROOT, '.cache', 'solutions.sqlite3')
+    assert pattern_db.PDB_DIR == os.path.join(ROOT, '.cache', 'pdb')
+
+
+def test_key_includes_heuristic_and_depth_limit(tmp_path):
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite3'))
+    board = _board()
+    cache.put(board, 'ASTAR', 'length', [('A', 1)], {'solution_length': 1},
+              heuristic='blocking_cars')
+    cache.put(board, 'DFS', 'cell', None, {'hit_limit': True}, limit=10)
+    assert cache.get(board, 'ASTAR', 'length', 'blocking_cars') == ([('A', 1)], {'solution_length': 1})
+    assert cache.get(board, 'ASTAR', 'length', 'pattern_db') is None
+    assert cache.get(board, 'DFS', 'cell', limit=10) == (None, {'hit_limit': True})
+    assert cache.get(board, 'DFS', 'cell', limit=50) is None
+    cache.close()
+
+    # đọc lại từ đĩa (không qua LRU)
+    cache = SolutionCache(str(tmp_path / 'cache.sqlite3'))
+    assert cache.get(board, 'ASTAR', 'length', 'blocking_cars') == ([('A', 1)], {'solution_length': 1})
+    assert cache.get(board, 'DFS', 'cell', limit=50) is None
+    cache.close()
+
+
+def test_old_schema_is_dropped(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE solutions (state TEXT, algorithm TEXT, cost_model TEXT, "
+               "map_path TEXT, map_digest TEXT, path TEXT, summary TEXT, last_used REAL, "
+               "PRIMARY KEY (state, algorithm, cost_model))")
+    db.execute("INSERT INTO solutions VALUES ('s', 'ASTAR', 'length', NULL, NULL, '[]', '{}', 0)")
+    db.commit()
+    db.close()
+    cache = SolutionCache(path)
+    board = _board()
+    assert cache.get(board, 'ASTAR', 'length', 'blocking_cars') is None
+    cache.put(board, 'ASTAR', 'length', [], {}, heuristic='blocking_cars')
+    assert cache.get(board, 'ASTAR', 'length', 'blocking_cars') == ([], {})
+    cache.close()
+
+
+def test_default_options():
+    assert default_options('bfs') == (None, None)
+    assert default_options('dfs') == (None, 50)
+    assert default_options('idastar') == ('pattern_db', None)
@@ -0,0 +1,102 @@
+import time
+
+import pytest
+
+from helpers import bundled_maps, path_cost
+from map_loader import load_board
+from solve_worker import SolveWorker, decode_board, encode_board
+
+
+def _board(name):
+    return load_board([p for p in bundled_maps() if p.endswith(name)][0])
+
+
+def _wait(worker, job_id, until, timeout=60):
+    """Các message của job_id cho tới message có loại thuộc `until` (gồm cả nó)."""
+    messages = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for message in worker.poll():
+            if message[1] == job_id:
+                messages.append(message)
+                if message[0] in until:
+                    return messages
+        time.sleep(0.005)
+    pytest.fail(f"no {until} for job {job_id}, got {[m[0] for m in messages]}")
+
+
+@pytest.fixture
+def worker():
+    worker = SolveWorker(progress_interval=0.0)
+    worker.start()
+    yield worker
+    worker.close()
+
+
+def test_encode_board_round_trip():
+    for name in ('map1.json', 'walls7x7.json', 'top_exit8x8.json'):
+        board = _board(name)
+        restored = decode_board(encode_board(board))
+        assert restored.vehicles == board.vehicles
+        assert (restored.width, restored.height, restored.walls, restored.exit) == \
+            (board.width, board.height, board.walls, board.exit)
+
+
+def test_progress_and_solutions_before_done(worker):
+    board = _board('map8.json')
+    job = worker.submit(board, 'weighted_astar')
+    messages = _wait(worker, job, ('done', 'error'))
+    kinds = [m[0] for m in messages]
+    assert kinds[-1] == 'done' and kinds.count('done') == 1
+    assert 'progress' in kinds and 'solution' in kinds
+    assert all(m[2]['expanded_nodes'] > 0 for m in messages if m[0] == 'progress')
+    _, _, path, summary = messages[-1]
+    assert summary['solution_found'] and summary['suboptimality_bound'] == 1.0
+    # lời giải cuối cùng đã được báo trước qua 'solution'
+    last_solution = [m for m in messages if m[0] == 'solution'][-1]
+    assert path_cost(board, last_solution[2], 'length') == path_cost(board, path, 'length')
+
+
+def test_cancel_running_job(worker):
+    board = _board('map7.json')
+    job = worker.submit(board, 'ucs')
+    _wait(worker, job, ('progress',))  # job đang chạy trong process con
+    worker.cancel(job)
+    messages = _wait(worker, job, ('cancelled', 'done', 'error'))
+    assert messages[-1] == ('cancelled', job)
+
+    # process vẫn sống và nhận job mới sau khi hủy
+    job = worker.submit(_board('map1.json'), 'bfs')
+    kind, _, path, _ = _wait(worker, job, ('done', 'error'))[-1]
+    assert kind == 'done' and len(path) == 4
+
+
+def test_cancel_queued_jobs(worker):
+    board = _board('map1.json')
+    jobs = [worker.submit(board, 'bfs') for _ in range(3)]
+    worker.cancel(jobs[1])  # hủy job 2 và mọi job trước nó
+    results = {}
+    deadline = time.monotonic() + 60
+    while len(results) < len(jobs) and time.monotonic() < deadline:
+        for message in worker.poll():
+            if message[0] in ('cancelled', 'done', 'error'):
+                results[message[1]] = message[0]
+        time.sleep(0.005)
+    assert results[jobs[2]] == 'done'
+    assert results[jobs[1]] == 'cancelled'
+    assert results[jobs[0]] in ('cancelled', 'done')  # có thể đã xong trước khi hủy
+
+
+def test_error_messages(worker):
+    job = worker.submit(_board('map1.json'), 'no_such_algorithm')
+    kind, _, message = _wait(worker, job, ('error', 'done'))[-1]
+    assert kind == 'error' and 'no_such_algorithm' in message
+
+    # process con chết giữa chừng: job đang chờ nhận 'error', lần submit sau tự khởi động lại
+    job = worker.submit(_board('map7.json'), 'ucs')
+    _wait(worker, job, ('progress',))
+    worker._process.kill()
+    worker._process.join()
+    assert _wait(worker, job, ('error', 'done'))[-1] == ('error', job, 'solver process exited')
+    job = worker.submit(_board('map1.json'), 'bfs')
+    assert _wait(worker, job, ('done', 'error'))[-1][0] == 'done'
@@ -0,0 +1,73 @@
+import pytest
+
+from helpers import bundled_maps, path_cost, random_boards
+from map_loader import load_board
+from solver.astar import astar
+from solver.bfs import bfs
+from solver.dfs import dfs
+from solver.ucs import ucs
+
+SOLVABLE = bundled_maps(solvable_only=True)
+
+
+def _name(path):
+    return path.replace('\\', '/').rsplit('/', 1)[-1]
+
+
+@pytest.mark.parametrize('map_path', SOLVABLE, ids=_name)
+def test_bundled_maps_ucs_astar_match_bfs(map_path):
+    board = load_board(map_path)
+    expected, _ = bfs(board)
+    optimal = path_cost(board, expected)
+    for solver in (ucs, astar):
+        path, _ = solver(board, cost_model='cell')
+        assert path_cost(board, path) == optimal, solver.__name__
+
+
+@pytest.mark.parametrize('map_path', SOLVABLE, ids=_name)
+def test_bundled_maps_length_cost_match_ucs(map_path):
+    board = load_board(map_path)
+    expected, _ = ucs(board, cost_model='length')
+    optimal = path_cost(board, expected, 'length')
+    for heuristic in ('blocking_cars', 'blocker_of_blockers', 'pattern_db'):
+        path, _ = astar(board, heuristic=heuristic, cost_model='length')
+        assert path_cost(board, path, 'length') == optimal, heuristic
+
+
+@pytest.mark.parametrize('map_path', SOLVABLE, ids=_name)
+def test_bundled_maps_slide_moves(map_path):
+    board = load_board(map_path)
+    expected, _ = bfs(board, cost_model='slide')
+    assert path_cost(board, expected, 'slide') <= path_cost(board, bfs(board)[0])
+    for solver in (ucs, astar):
+        path, _ = solver(board, cost_model='slide')
+        assert path_cost(board, path, 'slide') == len(expected), solver.__name__
+
+
+@pytest.mark.parametrize('map_path', [p for p in bundled_maps() if p not in SOLVABLE], ids=_name)
+def test_unsolvable_maps(map_path):
+    board = load_board(map_path)
+    for solver in (bfs, ucs, astar):
+        path, stats = solver(board)
+        assert path is None
+        assert not stats.solution_found
+
+
+def test_random_boards_agree():
+    for board in random_boards(80, seed=7, vehicles=8):
+        expected, _ = bfs(board)
+        for solver in (ucs, astar):
+            path, _ = solver(board, cost_model='cell')
+            if expected is None:
+                assert path is None
+            else:
+                assert path_cost(board, path) == len(expected)
+        # dfs không tối ưu; không giới hạn độ sâu thì tìm được khi và chỉ khi bfs tìm được
+        path, _ = dfs(board, limit=10 ** 6)
+        assert (path is None) == (expected is None)
+        if path is not None:
+            assert path_cost(board, path) >= len(expected)
+        path, _ = dfs(board, limit=12)
+        if path is not None:
+            assert len(expected) <= path_cost(board, path) <= 12
+
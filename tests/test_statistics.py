@@ -0,0 +1,45 @@
+import pytest
+
+import statistics as stats_module
+from helpers import bundled_maps
+from map_loader import load_board
+from solver.astar import astar
+from solver.bfs import bfs
+from statistics import Statistics
+
+needs_rss = pytest.mark.skipif(stats_module._read_rss is None, reason="no RSS source")
+
+
+def load(name):
+    return load_board([p for p in bundled_maps() if p.endswith(name)][0])
+
+
+@needs_rss
+def test_rss_delta_after_larger_search_in_same_process():
+    # ru_maxrss cũ: mọi lần giải nhỏ hơn lần lớn nhất trước đó đều báo 0
+    bfs(load('map7.json'))
+    _, stats = astar(load('map8.json'))
+    assert stats.memory_source == 'rss'
+    assert stats.peak_memory and stats.peak_memory > 0
+    assert stats.memory_usage == stats.peak_memory / 1024 / 1024
+
+
+@needs_rss
+def test_growth_below_one_page_is_not_reported_as_zero():
+    _, stats = bfs(load('map1.json'))
+    assert stats.peak_memory is None or stats.peak_memory >= stats_module._PAGE_SIZE
+    if stats.peak_memory is None:
+        assert stats.get_formatted_stats()['memory'] == 'n/a'
+
+
+def test_tracemalloc_measures_allocations():
+    _, stats = bfs(load('map5.json'), stats=Statistics(trace_memory=True))
+    assert stats.memory_source == 'tracemalloc'
+    assert stats.peak_memory > 0
+
+
+def test_summary_round_trip():
+    path, stats = astar(load('map5.json'))
+    restored = Statistics.from_summary(stats.get_summary(), path)
+    assert restored.get_summary() == stats.get_summary()
+    assert restored.get_formatted_stats() == stats.get_formatted_stats()
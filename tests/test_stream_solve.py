@@ -0,0 +1,81 @@
+import io
+import json
+import os
+
+from conftest import MAPS
+from helpers import path_cost
+from map_loader import board_to_dict, load_board
+from puzzle_pack import import_json
+from stream_solve import main, read_records, resume_point, stream_solve
+
+# map8 chậm hơn hẳn các map khác: kết quả sau nó xong trước nhưng vẫn phải ghi sau
+ORDER = ['map8', 'map1', 'map2', 'map9', 'map3', 'map4']
+MAP_PATHS = [os.path.join(MAPS, f'{name}.json') for name in ORDER]
+
+
+def _write_jsonl(path):
+    with open(path, 'w') as f:
+        f.write("# puzzle theo dạng object JSON của file map\n")
+        for name, map_path in zip(ORDER, MAP_PATHS):
+            f.write(json.dumps(dict(board_to_dict(load_board(map_path)), id=name)) + '\n')
+
+
+def _read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_results_in_input_order(tmp_path):
+    source = str(tmp_path / 'puzzles.jsonl')
+    _write_jsonl(source)
+    out = io.StringIO()
+    count = stream_solve(read_records(source), 'bfs', out, workers=3, window=4)
+    assert count == len(ORDER)
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [row['index'] for row in rows] == list(range(len(ORDER)))
+    assert [row['id'] for row in rows] == ORDER
+    for row, map_path in zip(rows, MAP_PATHS):
+        assert row['status'] == 'ok'
+        if row['path'] is None:
+            assert map_path.endswith('map9.json')
+        else:
+            assert path_cost(load_board(map_path), row['path']) == row['length']
+
+
+def test_read_records_start(tmp_path):
+    source = str(tmp_path / 'puzzles.jsonl')
+    _write_jsonl(source)
+    assert [(i, pid) for i, pid, _ in read_records(source, 4)] == [(4, 'map3'), (5, 'map4')]
+    pack = str(tmp_path / 'puzzles.rhp')
+    import_json(MAP_PATHS, pack)
+    assert [(i, pid) for i, pid, _ in read_records(pack, 5)] == [(5, 5)]
+
+
+def test_resume_point_truncates_partial_line(tmp_path):
+    out = str(tmp_path / 'results.jsonl')
+    assert resume_point(out) == 0
+    with open(out, 'w') as f:
+        f.write(json.dumps({'index': 0}) + '\n' + json.dumps({'index': 1}) + '\n')
+        f.write('{"index": 2, "id": "ma')  # crash giữa lúc ghi
+    complete = len(json.dumps({'index': 0})) + len(json.dumps({'index': 1})) + 2
+    assert resume_point(out) == 2
+    assert os.path.getsize(out) == complete
+    assert resume_point(out) == 2
+
+
+def test_main_resume(tmp_path):
+    source = str(tmp_path / 'puzzles.jsonl')
+    _write_jsonl(source)
+    out = str(tmp_path / 'results.jsonl')
+    main([source, '-a', 'bfs', '-o', out, '-j', '2'])
+    full = _read_lines(out)
+    # giữ 2 dòng đầu và nửa dòng thứ 3, rồi chạy tiếp
+    with open(out) as f:
+        lines = f.readlines()
+    with open(out, 'w') as f:
+        f.writelines(lines[:2])
+        f.write(lines[2][:10])
+    main([source, '-a', 'bfs', '-o', out, '-j', '2', '--resume'])
+    resumed = _read_lines(out)
+    assert [row['index'] for row in resumed] == list(range(len(ORDER)))
+    assert [(row['id'], row['path']) for row in resumed] == [(row['id'], row['path']) for row in full]